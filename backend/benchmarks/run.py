@@ -0,0 +1,214 @@
+# backend/benchmarks/run.py
+"""
+Benchmarks des chemins chauds, sur datasets synthétiques (cf. synthetic.py).
+
+Tout tourne hors ligne : pas de modèle, pas de réseau, pas de scraping. Les
+résultats sont écrits en JSON (temps min / médian / moyen / max par
+benchmark, temps par élément, commit git et versions) pour comparer deux
+commits avec --compare.
+
+Usage :
+    python backend/benchmarks/run.py --sizes 10k,100k -o bench_<commit>.json
+    python backend/benchmarks/run.py --compare bench_old.json bench_new.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# Ajoute backend/ au path pour importer les packages processor et benchmarks
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from benchmarks import synthetic
+from processor import h5_utilities
+from processor.crypto_registry import detect_cryptos
+from processor.date_parser import _parse_cached, parse_date_with_context, parse_dates
+from processor.emoji_handler import remove_emojis
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DEFAULT_SIZES = "10k"
+DEFAULT_REPEAT = 5
+SAMPLE_ROWS = 5_000
+APPEND_COUNT = 100
+
+class OfflineIngest:
+    """Remplace le client du worker d'ingestion : read_h5_and_compute n'ouvre aucune connexion."""
+    def status(self):
+        return {"running": False, "alive": False, "last_run": None}
+
+def load_api():
+    """
+    Importe main.py sans ingest ni recalcul périodique du vrai dataset, ou
+    None si l'API (fastapi...) n'est pas installée : seuls les benchmarks
+    du package processor tournent alors.
+    """
+    # Le process de l'API n'importe ni Selenium ni torch en mode worker. Le client
+    # IPC est remplacé avant tout appel : la clé n'ouvre aucune connexion
+    os.environ.setdefault("INGEST_MODE", "worker")
+    os.environ.setdefault("INGEST_AUTHKEY", "offline-benchmarks")
+    try:
+        import main
+    except ImportError as e:
+        print(f"API benchmarks skipped ({e})", file=sys.stderr)
+        return None
+    main.ingest = OfflineIngest()
+    # Le thread de rafraîchissement du cache (toutes les 10 s) ne doit pas
+    # relire le vrai dataset pendant les mesures
+    main.cache.compute = dict
+    return main
+
+def measure(fn, repeat, items=1):
+    """Exécute `fn` `repeat` fois ; retourne les statistiques de temps (s) et par élément (µs)."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    median = statistics.median(timings)
+    return {
+        "repeat": repeat,
+        "items": items,
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.fmean(timings),
+        "max_s": max(timings),
+        "per_item_us": median / items * 1e6,
+    }
+
+def bench_dataset(results, path, rows, repeat, api=None):
+    """Benchmarks qui dépendent de la taille du dataset."""
+    def record(name, stats):
+        results.append({"name": name, "rows": rows, **stats})
+        print(f"{name:<28} {rows:>9} rows  median {stats['median_s'] * 1e3:10.2f} ms", file=sys.stderr)
+
+    record("getDataset", measure(
+        lambda: h5_utilities.getDataset(path, isTrainDataset=True), repeat, items=rows))
+    if api is not None:
+        record("read_h5_and_compute", measure(
+            lambda: api.read_h5_and_compute(path + ".h5"), repeat, items=rows))
+
+    # Appends sur une copie : le dataset synthétique reste intact d'un run à l'autre
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = os.path.join(tmp, "dataset")
+        shutil.copyfile(path + ".h5", copy + ".h5")
+        sample = h5_utilities.getDatasetSlice(0, APPEND_COUNT, ("content", "link", "date"), path)
+        def append():
+            for content, link, date in zip(sample["content"], sample["link"], sample["date"]):
+                h5_utilities.appendArticleToDataset(content, link, date, ["Bitcoin"], 0.0, copy)
+        record("appendArticleToDataset", measure(append, repeat, items=len(sample["content"])))
+
+def bench_text(results, path, repeat):
+    """Benchmarks par article, sur un échantillon du dataset (indépendants de sa taille)."""
+    sample = h5_utilities.getDatasetSlice(0, SAMPLE_ROWS, ("content", "link", "date"), path)
+    contents, links, dates = sample["content"], sample["link"], sample["date"]
+    n = len(contents)
+
+    def record(name, stats):
+        results.append({"name": name, "rows": None, **stats})
+        print(f"{name:<28} {stats['items']:>9} items median {stats['per_item_us']:10.2f} µs/item", file=sys.stderr)
+
+    record("detect_cryptos", measure(lambda: [detect_cryptos(c) for c in contents], repeat, items=n))
+    record("remove_emojis", measure(lambda: [remove_emojis(c) for c in contents], repeat, items=n))
+
+    def parse_cold():
+        _parse_cached.cache_clear()
+        for date, link in zip(dates, links):
+            parse_date_with_context(date, link)
+    record("parse_date_with_context_cold", measure(parse_cold, repeat, items=n))
+    record("parse_date_with_context_warm", measure(
+        lambda: [parse_date_with_context(d, l) for d, l in zip(dates, links)], repeat, items=n))
+    record("parse_dates_vectorized", measure(lambda: parse_dates(dates, links), repeat, items=n))
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=BASE_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _versions():
+    versions = {"python": platform.python_version()}
+    for module in ("numpy", "pandas", "h5py"):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            versions[module] = None
+    return versions
+
+def run(sizes, repeat=DEFAULT_REPEAT, data_dir=DEFAULT_DATA_DIR, seed=synthetic.DEFAULT_SEED, api=True):
+    api = load_api() if api else None
+    results = []
+    paths = {}
+    for label in sizes:
+        rows = synthetic.parse_rows(label)
+        started = time.perf_counter()
+        paths[rows] = synthetic.ensure_dataset(data_dir, rows, seed)
+        print(f"dataset {rows} rows ready ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+        bench_dataset(results, paths[rows], rows, repeat, api)
+    bench_text(results, paths[min(paths)], repeat)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "versions": _versions(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+def compare(old_path, new_path):
+    """Affiche le rapport des médianes (nouveau / ancien) pour les benchmarks communs."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    key = lambda r: (r["name"], r["rows"])
+    before = {key(r): r for r in old["results"]}
+    print(f"{old['meta']['commit']} -> {new['meta']['commit']}")
+    for result in new["results"]:
+        previous = before.get(key(result))
+        if previous is None:
+            continue
+        ratio = result["median_s"] / previous["median_s"] if previous["median_s"] else float("nan")
+        rows = result["rows"] if result["rows"] is not None else "-"
+        print(f"{result['name']:<28} {rows:>9}  {previous['median_s'] * 1e3:10.2f} ms -> "
+              f"{result['median_s'] * 1e3:10.2f} ms  x{ratio:.2f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmarks on synthetic datasets")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Tailles de dataset, ex: 10k,100k,1m")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=synthetic.DEFAULT_SEED)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Dossier des datasets générés (réutilisés)")
+    parser.add_argument("-o", "--output", default=None, help="Fichier JSON de sortie (défaut : stdout)")
+    parser.add_argument("--no-api", action="store_true", help="Ne mesure pas read_h5_and_compute (n'importe pas main.py)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare deux fichiers de résultats")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run([s.strip() for s in args.sizes.split(",") if s.strip()], args.repeat, args.data_dir, args.seed,
+                 api=not args.no_api)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+# backend/benchmarks/synthetic.py
+"""
+Générateur de datasets h5 synthétiques pour les benchmarks.
+
+Même structure que le dataset réel (colonnes content, link, date, crypto,
+note et attributs), avec des données réalistes : articles de longueur
+variable (log-normale, quelques milliers de caractères) mentionnant des
+cryptos du registre, emojis occasionnels, dates aux formats bruts U.Today
+et crypto.news ou déjà normalisées en ISO, liens des deux sources, cryptos
+détectées sur le contenu et notes dans [-1, 1].
+
+La génération est déterministe (graine) et se fait par tranches : la mémoire
+reste bornée même pour 1M lignes. Seules les dates dépendent de l'instant de
+génération : elles couvrent les SPAN_DAYS jours qui précèdent, pour que les
+fenêtres 1h / 24h / 7d / 30d de l'API contiennent des articles.
+
+Usage :
+    python backend/benchmarks/synthetic.py --rows 100k -o /tmp/synthetic
+"""
+import argparse
+import os
+import sys
+import time
+
+import h5py
+import numpy as np
+
+# Ajoute backend/ au path pour importer le package processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor.crypto_registry import CRYPTO_DEFINITIONS, detect_cryptos
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+CHUNK_ROWS = 10_000
+BODY_POOL_SIZE = 5_000
+DEFAULT_SEED = 42
+SPAN_DAYS = 60
+
+WORDS = (
+    "market price traders analysts rally support resistance volume investors "
+    "exchange etf approval inflows outflows liquidity whales network upgrade "
+    "regulators sec lawsuit adoption institutional funds token staking yield "
+    "futures options leverage liquidation on-chain wallet addresses hashrate "
+    "miners halving bullish bearish correction breakout momentum week month "
+    "data report shows according to the of and in on for with as by at from"
+).split()
+ALIASES = [alias for crypto in CRYPTO_DEFINITIONS for alias in crypto["aliases"]]
+EMOJIS = ["🚀", "📈", "📉", "🔥", "💰", "⚠️", "✅", "🐋"]
+BOILERPLATE = [
+    "Disclaimer: this article is not investment advice.",
+    "Follow us on X for the latest crypto news.",
+    "Read more: Bitcoin price prediction for this week",
+]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+SOURCES = [
+    ("https://u.today/", "utoday"),
+    ("https://crypto.news/", "cryptonews"),
+]
+
+def parse_rows(value):
+    """'10k' / '1m' / '2500' -> nombre de lignes."""
+    value = str(value).lower()
+    if value in SIZES:
+        return SIZES[value]
+    if value.endswith("k"):
+        return int(float(value[:-1]) * 1_000)
+    if value.endswith("m"):
+        return int(float(value[:-1]) * 1_000_000)
+    return int(value)
+
+def _sentence(rng):
+    words = list(rng.choice(WORDS, size=rng.integers(8, 22)))
+    # ~1 phrase sur 3 mentionne une crypto
+    if rng.random() < 0.35:
+        words.insert(rng.integers(0, len(words)), rng.choice(ALIASES))
+    if rng.random() < 0.05:
+        words.append(rng.choice(EMOJIS))
+    sentence = " ".join(words)
+    return sentence[0].upper() + sentence[1:] + "."
+
+def make_content(rng):
+    # Longueur cible log-normale : médiane ~2 500 caractères, queue jusqu'à ~15 000
+    target = int(min(rng.lognormal(mean=7.8, sigma=0.5), 15_000))
+    paragraphs, length = [], 0
+    while length < target:
+        paragraph = " ".join(_sentence(rng) for _ in range(rng.integers(2, 6)))
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 1
+    if rng.random() < 0.2:
+        paragraphs.append(rng.choice(BOILERPLATE))
+    return "\n".join(paragraphs)
+
+def make_date(rng, source, timestamp):
+    """Date au format brut de la source (la plupart) ou déjà normalisée en ISO."""
+    t = time.gmtime(timestamp)
+    roll = rng.random()
+    if roll < 0.3:
+        return time.strftime("%Y-%m-%dT%H:%M:00+00:00", t)
+    if source == "utoday":
+        return f"{WEEKDAYS[t.tm_wday]}, {t.tm_mday}/{t.tm_mon:02d}/{t.tm_year} - {t.tm_hour}:{t.tm_min:02d}"
+    hour12 = t.tm_hour % 12 or 12
+    ampm = "PM" if t.tm_hour >= 12 else "AM"
+    return f"{MONTHS[t.tm_mon - 1]} {t.tm_mday}, {t.tm_year} at {hour12:02d}:{t.tm_min:02d} {ampm} GMT+2"
+
+def generate_rows(rng, start, count, rows, now, bodies):
+    """Produit les lignes [start, start + count) (colonnes encodées comme dans le dataset réel)."""
+    contents, links, dates, cryptos, notes = [], [], [], [], []
+    # Articles répartis sur les SPAN_DAYS derniers jours, stockés du plus ancien au plus récent
+    positions = (start + np.arange(count) + rng.uniform(0, 1, size=count)) / rows
+    timestamps = now - SPAN_DAYS * 86400 * (1 - positions)
+    for i in range(count):
+        host, source = SOURCES[rng.integers(0, len(SOURCES))]
+        # Corps tiré d'un pool + phrase d'accroche propre à l'article : textes
+        # tous différents sans générer 1M articles mot à mot
+        content = _sentence(rng) + "\n" + bodies[rng.integers(0, len(bodies))]
+        contents.append(content.encode("utf-8"))
+        links.append(f"{host}news/synthetic-article-{start + i}".encode("utf-8"))
+        dates.append(make_date(rng, source, timestamps[i]).encode("utf-8"))
+        cryptos.append(",".join(detect_cryptos(content)).encode("utf-8"))
+        notes.append(float(np.clip(rng.normal(0.05, 0.45), -1, 1)))
+    return {
+        "content": np.array(contents, dtype=object),
+        "link": np.array(links, dtype=object),
+        "date": np.array(dates, dtype=object),
+        "crypto": np.array(cryptos, dtype=object),
+        "note": np.array(notes, dtype="f8"),
+    }
+
+def generate(path, rows, seed=DEFAULT_SEED, chunk_rows=CHUNK_ROWS, now=None, pool_size=BODY_POOL_SIZE):
+    """
+    Écrit un dataset synthétique de `rows` lignes dans `path` (sans .h5).
+    Retourne le chemin du fichier créé.
+    """
+    rng = np.random.default_rng(seed)
+    now = now if now is not None else time.time()
+    bodies = [make_content(rng) for _ in range(min(rows, pool_size))]
+    filename = path + ".h5"
+    tmp = filename + ".tmp"
+    string = h5py.string_dtype(encoding="utf-8")
+    with h5py.File(tmp, "w") as f:
+        for name in ("content", "link", "date", "crypto"):
+            f.create_dataset(name, shape=(0,), dtype=string, compression="gzip", chunks=True, maxshape=(None,))
+        f.create_dataset("note", shape=(0,), dtype="f8", compression="gzip", chunks=True, maxshape=(None,))
+        f.attrs["description"] = "Dataset synthétique pour les benchmarks"
+        f.attrs["source"] = f"benchmarks/synthetic.py (seed={seed})"
+        f.attrs["placeholderContent"] = False
+        f.attrs["last_news_cryptoNews"] = "None"
+        f.attrs["last_news_uToday"] = "None"
+        f.attrs["last_news_beInCrypto"] = "None"
+
+        for start in range(0, rows, chunk_rows):
+            chunk = generate_rows(rng, start, min(chunk_rows, rows - start), rows, now, bodies)
+            for name, values in chunk.items():
+                dset = f[name]
+                dset.resize((start + len(values),))
+                dset[start:] = values
+    os.replace(tmp, filename)
+    return filename
+
+def ensure_dataset(data_dir, rows, seed=DEFAULT_SEED):
+    """Chemin (sans .h5) d'un dataset synthétique de `rows` lignes, généré s'il n'existe pas."""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"synthetic_{rows}_{seed}")
+    if not os.path.exists(path + ".h5"):
+        generate(path, rows, seed)
+    return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic dataset.h5")
+    parser.add_argument("--rows", default="10k", help="Nombre de lignes : 10k, 100k, 1m ou un entier")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("-o", "--output", required=True, help="Chemin du dataset sans l'extension .h5")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    filename = generate(args.output, parse_rows(args.rows), args.seed)
+    print(f"{filename} generated in {time.perf_counter() - started:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# ingest_client.py
+"""
+Client du worker d'ingestion (cf. ingest_worker.py) pour l'API.
+
+Même interface que IngestService (start / stop / status) mais chaque appel
+passe par le canal IPC local : l'API n'importe ni Selenium, ni torch, ni le
+pipeline d'ingestion.
+"""
+import logging
+import os
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+
+logger = logging.getLogger(__name__)
+
+INGEST_HOST = os.environ.get("INGEST_HOST", "127.0.0.1")
+INGEST_PORT = int(os.environ.get("INGEST_PORT", "6001"))
+# Secret partagé par l'API et le worker : pas de valeur par défaut, une clé
+# connue de tous laisserait n'importe quel process local piloter l'ingest
+INGEST_AUTHKEY = os.environ.get("INGEST_AUTHKEY")
+
+def require_authkey(authkey=INGEST_AUTHKEY):
+    if not authkey:
+        raise RuntimeError(
+            "INGEST_AUTHKEY must be set to the same secret for the API and the ingest worker "
+            "(e.g. python -c 'import secrets; print(secrets.token_hex(32))')"
+        )
+    return authkey.encode() if isinstance(authkey, str) else authkey
+
+class IngestClient:
+    def __init__(self, address=(INGEST_HOST, INGEST_PORT), authkey=INGEST_AUTHKEY):
+        self.address = address
+        self.authkey = require_authkey(authkey)
+
+    def _call(self, cmd):
+        try:
+            with Client(self.address, authkey=self.authkey) as conn:
+                conn.send({"cmd": cmd})
+                reply = conn.recv()
+        except AuthenticationError as e:
+            raise RuntimeError(
+                f"Ingest worker at {self.address} rejected the handshake: "
+                f"INGEST_AUTHKEY differs between the API and the worker ({e})"
+            ) from e
+        if "error" in reply:
+            raise RuntimeError(f"Ingest worker error on '{cmd}': {reply['error']}")
+        return reply
+
+    def start(self):
+        return self._call("start")
+
+    def stop(self):
+        return self._call("stop")
+
+    def status(self):
+        """
+        Statut du worker, ou un statut dégradé ('reachable' à False) si le
+        worker ne répond pas, refuse la clé ou renvoie une erreur.
+        """
+        try:
+            return self._call("status")
+        except (OSError, EOFError) as e:
+            logger.warning(f"Ingest worker unreachable at {self.address}: {e}")
+            error = str(e)
+        except RuntimeError as e:
+            logger.warning(str(e))
+            error = str(e)
+        return {"running": False, "alive": False, "reachable": False, "error": error}
+
+    def metrics(self):
+        """Texte Prometheus des métriques d'ingestion du worker."""
+        return self._call("metrics")["text"]
@@ -0,0 +1,180 @@
+# ingest_worker.py
+"""
+Boucle d'ingestion (un worker de scraping par source -> storeData) et son
+pilotage start / stop / status.
+
+Deux façons de l'utiliser :
+- dans le process de l'API (INGEST_MODE=inprocess, défaut) : main.py crée un
+  IngestService et l'appelle directement ;
+- dans un process séparé (INGEST_MODE=worker) : ce script sert IngestService
+  sur un canal IPC local, l'API le pilote avec ingest_client.IngestClient.
+  Scraping, Selenium et inférence ne partagent alors plus le GIL de l'API et
+  peuvent être limités à certains cœurs (--cpus).
+
+Les résultats restent visibles côté API via le dataset h5, relu à chaque
+recalcul du cache.
+
+Usage :
+    python backend/ingest_worker.py --cpus 2-5 --start
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+from multiprocessing.connection import Listener
+
+# Ajoute backend/ au path pour importer les packages scraping et processor
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BASE_DIR)
+
+from ingest_client import INGEST_AUTHKEY, INGEST_HOST, INGEST_PORT, require_authkey
+from scraping.store_data import SOURCES, storeData
+from scraping.scheduler import SourceScheduler
+from scraping import browser_pool, browser_profile, ingest_pipeline
+from processor import metrics
+
+logger = logging.getLogger(__name__)
+
+# Pour éviter les warnings de tokenizers. Le parallélisme CPU de l'inférence passe
+# par le pool multi-process (SENTIMENT_POOL_WORKERS, cf. processor/inference_pool.py)
+os.environ["TOKENIZERS_PARALLELISM"] = "false"
+
+PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
+DATASET = os.path.join(PROJECT_ROOT, "dataset")
+
+# ==== Scraping Sources ====
+# Un worker indépendant par source, chacun avec sa cadence (en secondes).
+# La cadence part de `interval` puis suit le rythme de publication observé,
+# entre `min_interval` et `max_interval`.
+# Pour ajouter une source (ex: beInCrypto), il suffit de l'ajouter ici une fois
+# son scraper branché dans store_data.SOURCES (sinon refusée au démarrage).
+SCRAPING_SOURCES = {
+    "cryptoNews": {"interval": 10, "min_interval": 10, "max_interval": 300, "error_backoff": 60},
+    "uToday":     {"interval": 10, "min_interval": 10, "max_interval": 300, "error_backoff": 60},
+}
+
+def _make_scraping_task(website, datasetFileName):
+    def task():
+        return storeData(website, nbArticle=10000, h5FileName=datasetFileName)
+    return task
+
+def fmt_time(dt):
+    return dt.isoformat() if dt else None
+
+class IngestService:
+    def __init__(self, sources=SCRAPING_SOURCES, datasetFileName=DATASET):
+        self.active = False
+        self.scheduler = SourceScheduler()
+        unsupported = [name for name in sources if name not in SOURCES]
+        if unsupported:
+            raise ValueError(f"No scraper for source(s): {', '.join(unsupported)}")
+        for name, options in sources.items():
+            self.scheduler.register(name, _make_scraping_task(name, datasetFileName), **options)
+
+    def start(self):
+        # Démarre un worker par source (ou relance ceux qui se sont arrêtés)
+        if not self.active or not self.scheduler.is_alive():
+            self.active = True
+            self.scheduler.start()
+            logger.info("Scraping workers started")
+        else:
+            logger.info("Scraping already active")
+        return self.status()
+
+    def stop(self):
+        self.active = False
+        self.scheduler.stop()
+        # Ferme les drivers inactifs ; ceux d'un cycle en cours reviennent au pool à la fin du cycle
+        browser_pool.get_pool().close_all()
+        logger.info("Scraping stop requested")
+        return self.status()
+
+    def status(self):
+        return {
+            "running": self.active,
+            "alive": self.scheduler.is_alive(),
+            "reachable": True,
+            "pid": os.getpid(),
+            "cpus": sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None,
+            "last_run": fmt_time(self.scheduler.last_run()),
+            "sources": self.scheduler.health(),
+            "browser_pool": browser_pool.get_pool().health(),
+            "browser_profile": browser_profile.stats(),
+            "ingest": ingest_pipeline.stats(),
+        }
+
+    def metrics(self):
+        """Exposition Prometheus des métriques d'ingestion de ce process."""
+        return metrics.ingest_exposition()
+
+# ==== Serveur IPC ====
+# Commande -> réponse (toujours un dict)
+COMMANDS = {
+    "start": lambda service: service.start(),
+    "stop": lambda service: service.stop(),
+    "status": lambda service: service.status(),
+    "metrics": lambda service: {"text": service.metrics()},
+}
+
+def _handle(service, conn):
+    with conn:
+        try:
+            while True:
+                request = conn.recv()
+                cmd = request.get("cmd")
+                if cmd not in COMMANDS:
+                    conn.send({"error": f"unknown command {cmd!r}"})
+                    continue
+                try:
+                    conn.send(COMMANDS[cmd](service))
+                except Exception as e:
+                    logger.error(f"Ingest command '{cmd}' failed: {e}")
+                    conn.send({"error": str(e)})
+        except EOFError:
+            pass
+
+def serve(service, address=(INGEST_HOST, INGEST_PORT), authkey=INGEST_AUTHKEY):
+    """Accepte les connexions de l'API, une connexion par thread."""
+    with Listener(address, authkey=require_authkey(authkey)) as listener:
+        logger.info(f"Ingest worker listening on {address[0]}:{address[1]}")
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:  # authentification refusée, client coupé...
+                logger.warning(f"Rejected ingest connection: {e}")
+                continue
+            threading.Thread(target=_handle, args=(service, conn), daemon=True).start()
+
+def parse_cpus(spec):
+    """'0-3,6' -> {0, 1, 2, 3, 6}"""
+    cpus = set()
+    for part in spec.split(","):
+        start, _, stop = part.partition("-")
+        cpus.update(range(int(start), int(stop or start) + 1))
+    return cpus
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scraping/ingest loop as its own process")
+    parser.add_argument("--host", default=INGEST_HOST)
+    parser.add_argument("--port", type=int, default=INGEST_PORT)
+    parser.add_argument("--cpus", default=None, help="Cœurs autorisés pour l'ingest, ex: 2-5 ou 2,3")
+    parser.add_argument("--start", action="store_true", help="Démarre le scraping sans attendre l'API")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper(), format="%(asctime)s [%(levelname)s] %(name)s %(message)s")
+    if args.cpus:
+        # Fixé avant la première inférence : les pools de threads torch/OpenMP
+        # se dimensionnent sur les cœurs autorisés
+        os.sched_setaffinity(0, parse_cpus(args.cpus))
+        logger.info(f"Ingest worker pinned to CPUs {sorted(os.sched_getaffinity(0))}")
+
+    # Vérifiée avant de lancer le scraping : sans clé, l'API ne pourrait pas se connecter
+    require_authkey()
+    service = IngestService()
+    if args.start:
+        service.start()
+    serve(service, (args.host, args.port))
+
+if __name__ == "__main__":
+    main()
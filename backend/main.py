@@ -1,60 +1,50 @@
 # main.py
+import asyncio
 import logging
 import os
 import sys
 from datetime import datetime, timedelta
 import threading
 import time
-from typing import Optional
 
 import pandas as pd
-from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 
 # === Ensure backend/ is on PYTHONPATH so imports work ===
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, BASE_DIR)
 
-# Import du module de scraping
-from scraping.store_data import storeData
-from processor.h5_utilities import getDataset, getDatasetLength
+from processor import dedup, exporter, metrics, search_index
+from processor.crypto_registry import CRYPTO_DEFINITIONS
+from processor.date_parser import parse_dates
+from processor.h5_utilities import getDataset
+from snapshot_cache import SnapshotCache
 
 # ==== Logging Configuration ====
+# Niveau réglable (LOG_LEVEL=DEBUG pour le détail article par article)
 logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s [%(levelname)s] %(message)s",
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+    format="%(asctime)s [%(levelname)s] %(name)s %(message)s",
     handlers=[logging.FileHandler("fastapi_service.log"), logging.StreamHandler()]
 )
 logger = logging.getLogger(__name__)
 
 
-os.environ["TOKENIZERS_PARALLELISM"] = "false" # pour éviter les warnings de tokenizers
-
 # ==== Paths ====
 PROJECT_ROOT = os.path.abspath(os.path.join(BASE_DIR, ".."))
 
-# ==== Global variables for background scraping ====
-scraping_thread: Optional[threading.Thread] = None
-scraping_active = False
-last_scraping_time: Optional[datetime] = None
-data_cache = {} # Dictionnaire python qui stocke toutes les données calculées
-cache_lock = threading.Lock() # Lock pour synchroniser l'accès au cache
-cache_update_time: Optional[datetime] = None
-
-
-# ==== Crypto Definitions ====
-CRYPTO_DEFINITIONS = [
-    {"name": "Bitcoin",       "aliases": ["bitcoin", "btc"]},
-    {"name": "Ethereum",      "aliases": ["ethereum", "eth"]},
-    {"name": "Tether",        "aliases": ["tether", "usdt"]},
-    {"name": "XRP",           "aliases": ["xrp", "ripple"]},
-    {"name": "Binance Coin",  "aliases": ["binance coin", "bnb"]},
-    {"name": "Solana",        "aliases": ["solana", "sol"]},
-    {"name": "USD Coin",      "aliases": ["usd coin", "usdc"]},
-    {"name": "Dogecoin",      "aliases": ["dogecoin", "doge"]},
-    {"name": "Cardano",       "aliases": ["cardano", "ada"]},
-    {"name": "TRON",          "aliases": ["tron", "trx"]}
-]
+# ==== Ingest ====
+# "inprocess" : le scraping tourne dans le process de l'API (comportement historique)
+# "worker" : le scraping tourne dans ingest_worker.py, piloté par IPC local ;
+#            l'API n'importe alors ni Selenium ni torch
+INGEST_MODE = os.environ.get("INGEST_MODE", "inprocess")
+if INGEST_MODE == "worker":
+    from ingest_client import IngestClient
+    ingest = IngestClient()
+else:
+    from ingest_worker import IngestService
+    ingest = IngestService()
 
 def get_sentiment_status(avg_score: float) -> str:
     if avg_score <= -0.6: return "Extreme fear"
@@ -63,9 +53,11 @@ def get_sentiment_status(avg_score: float) -> str:
     if avg_score <=  0.6: return "Greed"
     return "Extreme greed"
 
-def read_h5_and_compute() -> dict:
+@metrics.COMPUTE_SECONDS.time()
+def read_h5_and_compute(h5_path: str = os.path.join(PROJECT_ROOT, "dataset.h5")) -> dict:
     """Lit le fichier H5 et calcule les métriques"""
-    h5_path = os.path.join(PROJECT_ROOT, "dataset.h5")
+    # Heure de lecture du dataset : c'est elle que le snapshot publie (cf. SnapshotCache)
+    computed_at = datetime.utcnow()
     if not os.path.exists(h5_path):
         raise FileNotFoundError(f"{h5_path} not found")
 
@@ -76,7 +68,7 @@ def read_h5_and_compute() -> dict:
         isTrainDataset=True
     )
 
-    dt = pd.to_datetime(dates, format='mixed', errors="coerce", utc=True).tz_convert(None)
+    dt = parse_dates(dates, links, as_datetime=True).dt.tz_convert(None)
     df = pd.DataFrame({
         "date":      dt,
         "crypto":    cryptos,
@@ -85,6 +77,10 @@ def read_h5_and_compute() -> dict:
         "link":      links
     }).dropna(subset=["date"]) # Supprime les valeurs NaN dans les dates, si il y en a
 
+    # Un même article (ou communiqué republié par une autre source) ne compte qu'une fois
+    df = df.drop_duplicates(subset="link")
+    df = df[~df["link"].isin(dedup.duplicate_links(base_name))]
+
     now = datetime.utcnow() # Date et heure actuelle
 
     # Définition des fenêtres de temps pour les statistiques
@@ -175,66 +171,32 @@ def read_h5_and_compute() -> dict:
     ]
 
     # Total dataset length
-    result["dataset_length"] = int(getDatasetLength(datasetFileName=base_name))
+    result["dataset_length"] = len(content)
+    metrics.DATASET_ROWS.set(len(content))
     
     # Ajouter le statut du scraping et l'heure de mise à jour
-    result["scraping_active"] = scraping_active
-    result["last_scraping_time"] = last_scraping_time.isoformat() if last_scraping_time else None
-    result["cache_update_time"] = cache_update_time.isoformat() if cache_update_time else None
-    result["scraping_thread_alive"] = scraping_thread.is_alive() if scraping_thread else False
+    status = ingest.status()
+    result["scraping_active"] = status["running"]
+    result["last_scraping_time"] = status.get("last_run")
+    result["cache_update_time"] = fmt_time(computed_at)
+    result["scraping_thread_alive"] = status["alive"]
     
 
     return result
 
-def update_cache():
-    """Met à jour le cache avec les dernières données"""
-    global data_cache, cache_update_time
-    try:
-        new_data = read_h5_and_compute() # On récupère les données du fichier H5 et on les calcule
-        with cache_lock:
-            data_cache = new_data # On met à jour le cache avec les nouvelles données
-            cache_update_time = datetime.utcnow() # On met à jour l'heure de la mise à jour du cache
-        logger.info(f"Cache updated at {cache_update_time}")
-    except Exception as e:
-        logger.error(f"Error updating cache: {e}")
+def fmt_time(dt):
+    return dt.isoformat() if dt else None
 
-def continuous_scraping():
-    """Fonction de scraping continu qui tourne en arrière-plan pour le realtime"""
-    global scraping_active, last_scraping_time
-    
-    logger.info("Starting continuous scraping thread...")
-    
-    while scraping_active:
-        try:
-            logger.info("Starting new scraping cycle...")
-            last_scraping_time = datetime.utcnow()
-
-            logger.info("Scraping cryptoNews...")
-            result1 = storeData("cryptoNews", nbArticle=10000, h5FileName="dataset")
-            
-            logger.info("Scraping uToday...")
-            result2 = storeData("uToday", nbArticle=10000, h5FileName="dataset")
-            
-            
-            logger.info(f"Scraping cycle completed at {last_scraping_time}")
-            logger.info(f"Articles scraped - cryptoNews: {result1 if result1 else 0}, uToday: {result2 if result2 else 0}")
-            
-            # Courte pause avant le prochain cycle
-            time.sleep(10)
-            
-        except Exception as e:
-            logger.error(f"Error in scraping cycle: {e}")
-            # En cas d'erreur, pause de 60 secondes avant de réessayer
-            time.sleep(60)
-
-    logger.info("Continuous scraping stopped")
+# Snapshot immuable des métriques : lu sans verrou ni copie par les endpoints,
+# recalculé dans un thread dédié (jamais sur la boucle d'événements)
+cache = SnapshotCache(read_h5_and_compute)
 
 # Thread pour mettre à jour le cache régulièrement
 def cache_updater():
     """Met à jour le cache toutes les 10 secondes"""
     while True:
         time.sleep(10)
-        update_cache()
+        cache.refresh().result()
 
 
 
@@ -253,24 +215,21 @@ logger.info("Cache updater thread started")
 @app.on_event("startup")
 async def startup_event():
     """Charge les données initiales dans le cache au démarrage"""
-    try:
-        update_cache()
-        logger.info("Initial data loaded into cache")
-    except Exception as e:
-        logger.error(f"Error loading initial data: {e}")
+    await cache.refresh_async()
+    logger.info("Initial data loaded into cache")
 
 @app.get("/sentiment_summary", response_class=JSONResponse)
 def sentiment_summary():
     """Retourne les données depuis le cache (mis à jour toutes les 10 secondes)"""
     try:
-        # Si le cache est vide, essayer de le charger
-        if not data_cache:
-            update_cache()
-        
-        # Retourner les données du cache
-        with cache_lock:
-            return data_cache.copy()
-            
+        snapshot = cache.current
+        # Si le cache est vide, attendre le recalcul (en cours ou lancé ici)
+        if not snapshot.data:
+            snapshot = cache.refresh().result()
+
+        # Le snapshot n'est jamais modifié : pas besoin de copie
+        return snapshot.data
+
     except Exception as e:
         logger.error(f"Error in sentiment_summary: {e}")
         return JSONResponse(
@@ -281,29 +240,17 @@ def sentiment_summary():
 @app.post("/engage_analysis", response_class=JSONResponse)
 async def engage_analysis():
     """Lance le scraping continu en arrière-plan et retourne les données actuelles"""
-    global scraping_thread, scraping_active
-    
     try:
-        # Si le scraping n'est pas déjà actif, le démarrer
-        if not scraping_active or scraping_thread is None or not scraping_thread.is_alive():
-            scraping_active = True
-            
-            scraping_thread = threading.Thread(target=continuous_scraping, daemon=True)
-            scraping_thread.start()
-            logger.info("Scraping thread started")
-            
-            # Mettre à jour le cache immédiatement
-            update_cache()
-            
-            # Retourner les données actuelles
-            with cache_lock:
-                return data_cache.copy()
-        else:
-            logger.info("Scraping already active, returning current data")
-            # Si le scraping est déjà actif, retourner simplement les données actuelles
-            with cache_lock:
-                return data_cache.copy()
-            
+        # Démarre un worker par source s'il ne tourne pas déjà (appel IPC en mode worker)
+        status = await asyncio.to_thread(ingest.start)
+        logger.info(f"Scraping active: {status['running']}")
+
+        # Recalcul du cache en arrière-plan : la réponse n'attend pas
+        cache.refresh()
+
+        # Retourner les données actuelles
+        return cache.current.data
+
     except Exception as e:
         logger.error(f"Error in engage_analysis: {e}")
         return JSONResponse(
@@ -314,24 +261,123 @@ async def engage_analysis():
 @app.post("/stop_analysis", response_class=JSONResponse)
 async def stop_analysis():
     """Arrête le scraping continu (optionnel)"""
-    global scraping_active
-    
-    scraping_active = False
-    logger.info("Scraping stop requested")
-    
-    return {
-        "status": "Scraping stopped",
-        "message": "Continuous scraping has been stopped.",
-        "scraping_active": False
-    }
+    try:
+        await asyncio.to_thread(ingest.stop)
+        logger.info("Scraping stop requested")
+
+        return {
+            "status": "Scraping stopped",
+            "message": "Continuous scraping has been stopped.",
+            "scraping_active": False
+        }
+
+    except Exception as e:
+        logger.error(f"Error in stop_analysis: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": str(e), "message": "Error stopping analysis"}
+        )
+
+@app.get("/search", response_class=JSONResponse)
+def search(
+    q: str,
+    crypto: str | None = None,
+    date_from: str | None = Query(None, alias="from"),
+    date_to: str | None = Query(None, alias="to"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=search_index.MAX_PAGE_SIZE),
+):
+    """Recherche plein texte dans les articles (classement bm25, paginé)"""
+    try:
+        index = search_index.get_index(os.path.join(PROJECT_ROOT, "dataset"))
+        found = index.search(q, crypto, date_from, date_to, limit=page_size, offset=(page - 1) * page_size)
+        for result in found["results"]:
+            note = result["sentiment"]
+            result["status"] = get_sentiment_status(note) if note is not None else None
+        return {"query": q, "page": page, "page_size": page_size, **found}
+
+    except search_index.IndexBuilding as e:
+        return JSONResponse(
+            status_code=503,
+            content={"error": str(e), "message": "Search index building, retry later"}
+        )
+    except ValueError as e:
+        logger.error(f"Error in search: {e}")
+        return JSONResponse(
+            status_code=400,
+            content={"error": str(e), "message": "Error searching articles"}
+        )
+    except Exception as e:
+        logger.error(f"Error in search: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": str(e), "message": "Error searching articles"}
+        )
+
+@app.get("/export")
+def export(
+    format: str = "ndjson",
+    columns: str | None = None,
+    crypto: str | None = None,
+    date_from: str | None = Query(None, alias="from"),
+    date_to: str | None = Query(None, alias="to"),
+):
+    """Export du dataset en flux (NDJSON, Arrow IPC ou Parquet), tranche par tranche"""
+    dataset = os.path.join(PROJECT_ROOT, "dataset")
+    try:
+        if not os.path.exists(dataset + ".h5"):
+            raise FileNotFoundError(f"{dataset}.h5 not found")
+        body = exporter.stream_export(format, dataset, exporter.parse_columns(columns), date_from, date_to, crypto)
+    except (ValueError, RuntimeError, FileNotFoundError) as e:
+        logger.error(f"Error in export: {e}")
+        return JSONResponse(
+            status_code=400,
+            content={"error": str(e), "message": "Error exporting dataset"}
+        )
+    except OSError as e:
+        # Dataset verrouillé ou illisible après les tentatives d'ouverture
+        logger.error(f"Error in export: {e}")
+        return JSONResponse(
+            status_code=503,
+            content={"error": str(e), "message": "Dataset unavailable, retry later"}
+        )
+    filename = f"articles.{exporter.EXTENSIONS[format]}"
+    return StreamingResponse(
+        body,
+        media_type=exporter.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Métriques au format texte Prometheus : API + ingest (local ou worker par IPC)"""
+    updated_at = cache.current.updated_at
+    metrics.CACHE_AGE_SECONDS.set((datetime.utcnow() - updated_at).total_seconds() if updated_at else float("nan"))
+    try:
+        ingest_text = ingest.metrics()
+        metrics.INGEST_WORKER_UP.set(1)
+    except Exception as e:
+        logger.warning(f"Ingest metrics unavailable: {e}")
+        ingest_text = ""
+        metrics.INGEST_WORKER_UP.set(0)
+    return PlainTextResponse(metrics.serving_exposition() + ingest_text, media_type=metrics.CONTENT_TYPE)
 
 # Endpoint de santé pour vérifier le statut
 @app.get("/health", response_class=JSONResponse)
 def health():
     """Endpoint de santé pour vérifier le statut du service"""
+    status = ingest.status()
     return {
-        "status": "healthy",
-        "scraping_active": scraping_active,
-        "last_scraping_time": last_scraping_time.isoformat() if last_scraping_time else None,
-        "cache_update_time": cache_update_time.isoformat() if cache_update_time else None
+        # Worker injoignable ou en erreur : l'API sert toujours le cache
+        "status": "healthy" if status.get("reachable", True) else "degraded",
+        "ingest_mode": INGEST_MODE,
+        "scraping_active": status["running"],
+        "last_scraping_time": status.get("last_run"),
+        "cache_update_time": fmt_time(cache.current.updated_at),
+        "cache_version": cache.current.version,
+        "ingest_worker": {k: status.get(k) for k in ("reachable", "pid", "cpus", "error") if k in status},
+        "sources": status.get("sources"),
+        "browser_pool": status.get("browser_pool"),
+        "browser_profile": status.get("browser_profile"),
+        "ingest": status.get("ingest")
     }
\ No newline at end of file
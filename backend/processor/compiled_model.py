@@ -0,0 +1,178 @@
+# backend/processor/compiled_model.py
+"""
+Graphe d'inférence TorchScript figé pour BertRegressor.
+
+Le régresseur est tracé pour quelques longueurs de séquence et quelques
+tailles de batch (buckets), puis figé (`torch.jit.freeze`, le dropout disparaît en
+mode eval) et optimisé pour l'inférence. Les artefacts sont sauvegardés à côté
+de MODEL_DIR (`<MODEL_DIR>_compiled/`) pour que les démarrages suivants les
+réutilisent sans retracer.
+
+Activation : SENTIMENT_COMPILED=1
+Benchmark  : python backend/processor/compiled_model.py --benchmark
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import torch
+import torch.nn.functional as F
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor import sentiment
+
+logger = logging.getLogger(__name__)
+
+# Sous-ensemble des buckets de sentiment.py pour lequel on trace un graphe
+COMPILED_BUCKETS = (64, 128, 256, 512)
+# Tailles de batch tracées (plafonnées à batch_size) : un article isolé ou un
+# petit batch de fin de pipeline n'est pas complété jusqu'à 16
+COMPILED_BATCH_SIZES = (1, 4, 16)
+
+def batch_buckets(batch_size, sizes=COMPILED_BATCH_SIZES):
+    return tuple(sorted({size for size in sizes if size < batch_size} | {batch_size}))
+
+def compiled_dir_for(model_dir):
+    return os.path.normpath(model_dir) + "_compiled"
+
+def _graph_file(batch, bucket):
+    return f"bert_regressor_B{batch}_L{bucket}.pt"
+
+def _manifest_for(model_dir, device, batch_size, buckets):
+    """Tout ce qui invalide les artefacts s'ils changent."""
+    weights = os.path.join(model_dir, "pytorch_model.bin")
+    stat = os.stat(weights)
+    return {
+        "torch": torch.__version__,
+        "device": device.type,
+        "weights_size": stat.st_size,
+        "weights_mtime": int(stat.st_mtime),
+        "batch_size": batch_size,
+        "batch_buckets": list(batch_buckets(batch_size)),
+        "buckets": list(buckets),
+    }
+
+class CompiledRegressor:
+    """
+    Appelable comme BertRegressor. Les entrées sont complétées jusqu'au plus
+    petit graphe tracé qui les contient (taille de batch et longueur), puis la
+    sortie est recoupée.
+    """
+    def __init__(self, graphs: dict, batch_size: int, device: torch.device, pad_token_id: int = 0):
+        self.graphs = dict(sorted(graphs.items()))  # (batch, longueur) -> graphe
+        self.batch_size = batch_size
+        self.device = device
+        self.pad_token_id = pad_token_id
+
+    def _graph_for(self, n, length):
+        for (batch, bucket), graph in self.graphs.items():
+            if n <= batch and length <= bucket:
+                return batch, bucket, graph
+        raise ValueError(f"No compiled graph for batch {n} and sequence length {length}")
+
+    def __call__(self, input_ids, attention_mask=None, token_type_ids=None):
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+        if token_type_ids is None:
+            token_type_ids = torch.zeros_like(input_ids)
+
+        outputs = []
+        for start in range(0, input_ids.shape[0], self.batch_size):
+            ids = input_ids[start:start + self.batch_size]
+            n, length = ids.shape
+            batch, bucket, graph = self._graph_for(n, length)
+            pad = (0, bucket - length, 0, batch - n)
+            out = graph(
+                F.pad(ids, pad, value=self.pad_token_id),
+                F.pad(attention_mask[start:start + self.batch_size], pad, value=0),
+                F.pad(token_type_ids[start:start + self.batch_size], pad, value=0),
+            )
+            outputs.append(out[:n])
+        return torch.cat(outputs)
+
+def trace_bucket(model, bucket, batch_size, device):
+    """Trace, fige et optimise le modèle pour une forme (batch_size, bucket)."""
+    example = (
+        torch.ones((batch_size, bucket), dtype=torch.long, device=device),
+        torch.ones((batch_size, bucket), dtype=torch.long, device=device),
+        torch.zeros((batch_size, bucket), dtype=torch.long, device=device),
+    )
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example, strict=False, check_trace=False)
+        frozen = torch.jit.freeze(traced.eval())
+        return torch.jit.optimize_for_inference(frozen)
+
+def load_or_compile(model, tokenizer, model_dir=sentiment.MODEL_DIR, device=sentiment.DEVICE,
+                    batch_size=sentiment.BATCH_SIZE, buckets=COMPILED_BUCKETS) -> CompiledRegressor:
+    """
+    Retourne un CompiledRegressor en rechargeant les graphes depuis le disque
+    si le manifeste correspond, sinon en les traçant puis en les sauvegardant.
+    """
+    model.eval()
+    out_dir = compiled_dir_for(model_dir)
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    manifest = _manifest_for(model_dir, device, batch_size, buckets)
+
+    cached = None
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            cached = json.load(f)
+
+    shapes = [(batch, bucket) for batch in batch_buckets(batch_size) for bucket in buckets]
+    graphs = {}
+    if cached == manifest:
+        logger.info(f"Loading compiled sentiment graphs from {out_dir}")
+        for batch, bucket in shapes:
+            graphs[batch, bucket] = torch.jit.load(os.path.join(out_dir, _graph_file(batch, bucket)), map_location=device)
+    else:
+        logger.info(f"Compiling sentiment graphs for shapes {shapes} into {out_dir}")
+        os.makedirs(out_dir, exist_ok=True)
+        for batch, bucket in shapes:
+            graphs[batch, bucket] = trace_bucket(model, bucket, batch, device)
+            torch.jit.save(graphs[batch, bucket], os.path.join(out_dir, _graph_file(batch, bucket)))
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+    return CompiledRegressor(graphs, batch_size, device, pad_token_id=tokenizer.pad_token_id or 0)
+
+# ==== Benchmark ====
+def benchmark(texts, batch_size=sentiment.BATCH_SIZE, rounds=3):
+    """Compare le débit eager vs compilé sur les mêmes textes (articles/s)."""
+    tokenizer, eager = sentiment.load_model(sentiment.MODEL_DIR, sentiment.DEVICE, compiled=False)
+    compiled = load_or_compile(eager, tokenizer, batch_size=batch_size)
+
+    results = {}
+    for name, model in (("eager", eager), ("compiled", compiled)):
+        sentiment.compute_sentiment_batch(texts[:batch_size], batch_size, tokenizer, model)  # warmup
+        started = time.perf_counter()
+        for _ in range(rounds):
+            sentiment.compute_sentiment_batch(texts, batch_size, tokenizer, model)
+        elapsed = time.perf_counter() - started
+        results[name] = {
+            "articles_per_s": len(texts) * rounds / elapsed,
+            "ms_per_batch": 1000 * elapsed / (rounds * -(-len(texts) // batch_size)),
+        }
+    results["speedup"] = results["compiled"]["articles_per_s"] / results["eager"]["articles_per_s"]
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile BertRegressor into frozen TorchScript graphs")
+    parser.add_argument("--benchmark", action="store_true", help="Compare eager et compilé")
+    parser.add_argument("--samples", type=int, default=128)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    if args.benchmark:
+        # Mélange de longueurs pour toucher plusieurs buckets
+        texts = [("Bitcoin rallies as ETF inflows keep growing. " * (1 + i % 40)) for i in range(args.samples)]
+        print(json.dumps(benchmark(texts), indent=2))
+    else:
+        tokenizer, model = sentiment.load_model(sentiment.MODEL_DIR, sentiment.DEVICE, compiled=False)
+        load_or_compile(model, tokenizer)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# backend/processor/crypto_registry.py
+"""
+Registre unique des cryptomonnaies suivies et détection de leurs mentions.
+
+Le matcher est construit une seule fois : chaque alias est découpé en mots et
+rangé dans un dictionnaire indexé par tuple de mots. Le texte est parcouru en
+une passe, mot par mot, avec au plus MAX_ALIAS_WORDS recherches par position :
+le coût dépend de la longueur du texte, pas du nombre de cryptos suivies.
+"""
+import re
+from collections import Counter
+
+# Cryptos suivies (nom affiché + alias recherchés, insensibles à la casse).
+# Ajouter une crypto ici suffit : détection, filtres des scrapers et statistiques
+# par crypto de l'API s'appuient tous sur cette liste.
+CRYPTO_DEFINITIONS = [
+    {"name": "Bitcoin",       "aliases": ["bitcoin", "btc"]},
+    {"name": "Ethereum",      "aliases": ["ethereum", "eth"]},
+    {"name": "Tether",        "aliases": ["tether", "usdt"]},
+    {"name": "XRP",           "aliases": ["xrp", "ripple"]},
+    {"name": "Binance Coin",  "aliases": ["binance coin", "bnb"]},
+    {"name": "Solana",        "aliases": ["solana", "sol"]},
+    {"name": "USD Coin",      "aliases": ["usd coin", "usdc"]},
+    {"name": "Dogecoin",      "aliases": ["dogecoin", "doge"]},
+    {"name": "Cardano",       "aliases": ["cardano", "ada"]},
+    {"name": "TRON",          "aliases": ["tron", "trx"]}
+]
+
+_WORD_RE = re.compile(r"\w+")
+
+class CryptoMatcher:
+    def __init__(self, definitions=CRYPTO_DEFINITIONS):
+        self.names = [crypto["name"] for crypto in definitions]
+        self._aliases = {}  # tuple de mots -> nom
+        for crypto in definitions:
+            for alias in crypto["aliases"]:
+                words = tuple(_WORD_RE.findall(alias.lower()))
+                if words:
+                    self._aliases.setdefault(words, crypto["name"])
+        self.max_alias_words = max((len(words) for words in self._aliases), default=1)
+
+    def _matches(self, text):
+        """Yield le nom de la crypto pour chaque mention trouvée (alias le plus long d'abord)."""
+        words = _WORD_RE.findall(text.lower())
+        i = 0
+        while i < len(words):
+            for size in range(min(self.max_alias_words, len(words) - i), 0, -1):
+                name = self._aliases.get(tuple(words[i:i + size]))
+                if name is not None:
+                    yield name
+                    i += size
+                    break
+            else:
+                i += 1
+
+    def count(self, text) -> Counter:
+        """Nombre de mentions par crypto."""
+        return Counter(self._matches(text))
+
+    def detect(self, text) -> list[str]:
+        """Cryptos mentionnées, dans l'ordre du registre."""
+        counts = self.count(text)
+        return [name for name in self.names if name in counts]
+
+    def mentions_any(self, text) -> bool:
+        """True dès la première mention (filtre des titres sur les pages de listing)."""
+        return next(self._matches(text), None) is not None
+
+# Matcher partagé, compilé une fois à l'import
+MATCHER = CryptoMatcher()
+
+def detect_cryptos(text: str) -> list[str]:
+    """Retourne la liste unique des `name` des cryptos mentionnées dans `text`."""
+    return MATCHER.detect(text)
+
+def count_mentions(text: str) -> Counter:
+    return MATCHER.count(text)
+
+def mentions_crypto(text: str) -> bool:
+    return MATCHER.mentions_any(text or "")
@@ -1,88 +1,229 @@
+import logging
 import re
 from datetime import datetime, timedelta
+from functools import lru_cache
+from urllib.parse import urlparse
 from dateutil import parser as dateutil_parser
+import numpy as np
+import pandas as pd
 import pytz
 
-def parse_date_with_context(date_str, source_url=None):
-    if isinstance(date_str, bytes):
-        date_str = date_str.decode('utf-8')
-    
-    # trouver la source
-    is_utoday = source_url and 'u.today' in source_url.lower()
-    
-    # Pattern pour U.Today: "Mon, 9/06/2025 - 6:16"
-    utoday_pattern = r'(\w+),\s*(\d{1,2})/(\d{1,2})/(\d{4})\s*-\s*(\d{1,2}):(\d{2})'
-    match = re.match(utoday_pattern, date_str)
-    
-    if match and is_utoday:
-        day_name, first_num, second_num, year, hour, minute = match.groups()
-        day = int(first_num)
-        month = int(second_num)
-        dt = datetime(int(year), month, day, int(hour), int(minute))
+logger = logging.getLogger(__name__)
+
+# ==== Formats connus (regex compilées une seule fois) ====
+# U.Today : "Mon, 9/06/2025 - 6:16" (jour/mois/année, UTC)
+UTODAY_RE = re.compile(r'(\w+),\s*(\d{1,2})/(\d{1,2})/(\d{4})\s*-\s*(\d{1,2}):(\d{2})')
+# crypto.news : "Jun 10, 2025 at 02:59 PM GMT+2"
+CRYPTONEWS_RE = re.compile(r'(\w+)\s+(\d{1,2}),\s+(\d{4})\s+at\s+(\d{1,2}):(\d{2})\s+(AM|PM)\s*(GMT[+-]\d+)?')
+GMT_OFFSET_RE = re.compile(r'GMT([+-])(\d+)')
+DAY_FIRST_RE = re.compile(r'^\d{1,2}/\d{1,2}/\d{4}')
+# Date ISO 8601 déjà normalisée (format de sortie de ce module)
+ISO_RE = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?[+-]\d{2}:\d{2}$')
+
+MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
+def _parse_utoday(date_str):
+    match = UTODAY_RE.match(date_str)
+    if not match:
+        return None
+    day_name, first_num, second_num, year, hour, minute = match.groups()
+    dt = datetime(int(year), int(second_num), int(first_num), int(hour), int(minute))
+    return pytz.UTC.localize(dt).isoformat()
+
+def _parse_cryptonews(date_str):
+    match = CRYPTONEWS_RE.match(date_str)
+    if not match:
+        return None
+    month_name, day, year, hour, minute, ampm, timezone = match.groups()
+    month = MONTHS.get(month_name[:3].capitalize(), 1)
+
+    # Convertir l'heure en 24h
+    hour = int(hour)
+    if ampm == 'PM' and hour != 12:
+        hour += 12
+    elif ampm == 'AM' and hour == 12:
+        hour = 0
+
+    dt = datetime(int(year), month, int(day), hour, int(minute))
+    offset_match = GMT_OFFSET_RE.search(timezone) if timezone else None
+    if offset_match:
+        hours_offset = int(offset_match.group(2))
+        if offset_match.group(1) == '-':
+            hours_offset = -hours_offset
+        dt = pytz.FixedOffset(hours_offset * 60).localize(dt)
+    else:
         dt = pytz.UTC.localize(dt)
-        return dt.isoformat()
-    
-    # Pattern pour crypto.news: "Jun 10, 2025 at 02:59 PM GMT+2"
-    cryptonews_pattern = r'(\w+)\s+(\d{1,2}),\s+(\d{4})\s+at\s+(\d{1,2}):(\d{2})\s+(AM|PM)\s+(GMT[+-]\d+)?'
-    match = re.match(cryptonews_pattern, date_str)
-    
-    if match:
-        month_name, day, year, hour, minute, ampm, timezone = match.groups()
-        
-        # Convertir le nom du mois en numéro
-        months = {
-            'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
-            'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
-        }
-        month = months.get(month_name, 1)
-        
-        # Convertir l'heure en 24h
-        hour = int(hour)
-        if ampm == 'PM' and hour != 12:
-            hour += 12
-        elif ampm == 'AM' and hour == 12:
-            hour = 0
-        
-        dt = datetime(int(year), month, int(day), hour, int(minute))
-        
-        if timezone:
-            offset_match = re.search(r'GMT([+-])(\d+)', timezone)
-            if offset_match:
-                sign = offset_match.group(1)
-                hours_offset = int(offset_match.group(2))
-                if sign == '-':
-                    hours_offset = -hours_offset
-                
-                # Créer un timezone avec l'offset
-                tz = pytz.FixedOffset(hours_offset * 60)
-                dt = tz.localize(dt)
-        else:
-            dt = pytz.UTC.localize(dt)
-        
-        return dt.isoformat()
-    
-    # Fallback: utiliser dateutil mais avec des indices
+    return dt.isoformat()
+
+def _parse_fallback(date_str):
+    # Si on a une date ambiguë comme "6/9/2025", essayer d'abord en format
+    # jour/mois/année (européen), sinon mois/jour/année (américain)
+    if DAY_FIRST_RE.search(date_str):
+        try:
+            dt = dateutil_parser.parse(date_str, dayfirst=True)
+        except (ValueError, OverflowError):
+            dt = dateutil_parser.parse(date_str, dayfirst=False)
+    else:
+        dt = dateutil_parser.parse(date_str)
+
+    if dt.tzinfo is None:
+        dt = pytz.UTC.localize(dt)
+    return dt.isoformat()
+
+# Parseurs essayés dans l'ordre, par hôte de la source
+PARSERS_BY_SOURCE = {
+    "u.today": (_parse_utoday, _parse_cryptonews),
+    None: (_parse_cryptonews,),
+}
+
+def source_key(source_url):
+    """Clé de PARSERS_BY_SOURCE pour une URL (ou un hôte)."""
+    if not source_url:
+        return None
+    source_url = source_url.lower()
+    host = urlparse(source_url).netloc or source_url
+    return "u.today" if 'u.today' in host else None
+
+@lru_cache(maxsize=65536)
+def _parse_cached(date_str, key):
+    for parser in PARSERS_BY_SOURCE[key]:
+        try:
+            parsed = parser(date_str)
+        except ValueError:
+            continue
+        if parsed is not None:
+            return parsed
+
+    # Fallback: utiliser dateutil
     try:
-        # Si on a une date ambiguë comme "6/9/2025", essayer de deviner
-        if re.search(r'^\d{1,2}/\d{1,2}/\d{4}', date_str):
-            # Essayer d'abord en format jour/mois/année (européen)
-            try:
-                dt = dateutil_parser.parse(date_str, dayfirst=True)
-            except:
-                # Sinon essayer mois/jour/année (américain)
-                dt = dateutil_parser.parse(date_str, dayfirst=False)
-        else:
-            dt = dateutil_parser.parse(date_str)
-        
-        if dt.tzinfo is None:
-            dt = pytz.UTC.localize(dt)
-        
-        return dt.isoformat()
-    
+        return _parse_fallback(date_str)
     except Exception as e:
-        print(f"Impossible de parser la date: {date_str}, erreur: {e}")
+        logger.debug("unparsable date value=%r error=%s", date_str, e)
         return date_str
 
+def parse_date_with_context(date_str, source_url=None):
+    """
+    Parse une date d'article et retourne une date ISO 8601 avec fuseau.
+    Les parseurs sont choisis selon l'hôte de `source_url` et les résultats
+    sont mis en cache (mêmes chaînes répétées d'un article à l'autre).
+    """
+    if isinstance(date_str, bytes):
+        date_str = date_str.decode('utf-8')
+    return _parse_cached(date_str, source_key(source_url))
+
+# ==== Mode vectorisé ====
+def _zfill(values, width):
+    return pd.Series(values).astype(str).str.zfill(width).to_numpy()
+
+def _format_iso(year, month, day, hour, minute, offset_minutes):
+    """Assemble les chaînes ISO (format de datetime.isoformat) à partir de colonnes entières."""
+    sign = np.where(offset_minutes < 0, "-", "+").astype(object)
+    offset = np.abs(offset_minutes)
+    parts = [
+        _zfill(year, 4), "-", _zfill(month, 2), "-", _zfill(day, 2), "T",
+        _zfill(hour, 2), ":", _zfill(minute, 2), ":00",
+        sign, _zfill(offset // 60, 2), ":", _zfill(offset % 60, 2),
+    ]
+    out = parts[0].astype(object)
+    for part in parts[1:]:
+        out = out + part
+    return out
+
+def _valid_dates(year, month, day):
+    """Masque des (année, mois, jour) qui forment une date existante."""
+    dates = pd.to_datetime(
+        pd.DataFrame({"year": year, "month": month, "day": day}), errors="coerce"
+    )
+    return dates.notna().to_numpy()
+
+def _vectorized_utoday(texts):
+    groups = texts.str.extract(r'^' + UTODAY_RE.pattern)
+    # Copie : sous copy-on-write (pandas >= 3), le tableau rendu est en lecture seule
+    matched = groups[0].notna().to_numpy().copy()
+    if not matched.any():
+        return matched, None
+    g = groups[matched].astype({i: int for i in range(1, 6)})
+    year, month, day = g[3].to_numpy(), g[2].to_numpy(), g[1].to_numpy()
+    hour, minute = g[4].to_numpy(), g[5].to_numpy()
+    valid = _valid_dates(year, month, day) & (hour < 24) & (minute < 60)
+    out = _format_iso(year, month, day, hour, minute, np.zeros(len(g), dtype=int))
+    idx = np.flatnonzero(matched)
+    matched[idx[~valid]] = False
+    return matched, out[valid]
+
+def _vectorized_cryptonews(texts):
+    groups = texts.str.extract(r'^' + CRYPTONEWS_RE.pattern)
+    # Copie : sous copy-on-write (pandas >= 3), le tableau rendu est en lecture seule
+    matched = groups[0].notna().to_numpy().copy()
+    if not matched.any():
+        return matched, None
+    g = groups[matched]
+    month = g[0].str[:3].str.capitalize().map(MONTHS).fillna(1).astype(int).to_numpy()
+    day, year = g[1].astype(int).to_numpy(), g[2].astype(int).to_numpy()
+    hour, minute = g[3].astype(int).to_numpy(), g[4].astype(int).to_numpy()
+    pm = (g[5] == "PM").to_numpy()
+    hour = np.where(pm & (hour != 12), hour + 12, np.where(~pm & (hour == 12), 0, hour))
+    offset = g[6].str.extract(r'GMT([+-]\d+)')[0].fillna("0").astype(int).to_numpy() * 60
+    valid = _valid_dates(year, month, day) & (hour < 24) & (minute < 60)
+    out = _format_iso(year, month, day, hour, minute, offset)
+    idx = np.flatnonzero(matched)
+    matched[idx[~valid]] = False
+    return matched, out[valid]
+
+def parse_dates(dates, sources=None, as_datetime=False):
+    """
+    Version vectorisée de parse_date_with_context pour une colonne entière.
+
+    dates   : séquence de str/bytes (ex: colonne `date` du dataset).
+    sources : URL (ou hôte) de chaque date, une seule valeur pour toutes, ou None.
+
+    Les formats connus (ISO déjà normalisé, U.Today, crypto.news) sont traités
+    avec les opérations de chaînes pandas ; seules les autres valeurs passent
+    par le parseur élément par élément (avec cache).
+    Retourne un array de chaînes ISO, ou une Series de dates UTC si `as_datetime`
+    (NaT pour les dates non parsables).
+    """
+    texts = pd.Series([d.decode('utf-8') if isinstance(d, bytes) else d for d in dates], dtype=object)
+    n = len(texts)
+    if sources is None or isinstance(sources, str):
+        keys = np.full(n, source_key(sources), dtype=object)
+    else:
+        keys = np.array([source_key(s) for s in sources], dtype=object)
+
+    result = texts.to_numpy(dtype=object).copy()
+    is_str = texts.map(lambda t: isinstance(t, str)).to_numpy()
+    pending = is_str.copy()
+    texts = texts.where(is_str, "")
+
+    # Déjà au format de sortie : inchangé
+    pending &= ~texts.str.match(ISO_RE.pattern).to_numpy()
+
+    is_utoday = keys == "u.today"
+    candidates = pending & is_utoday
+    if candidates.any():
+        matched, values = _vectorized_utoday(texts[candidates])
+        idx = np.flatnonzero(candidates)[matched]
+        result[idx] = values
+        pending[idx] = False
+
+    candidates = pending.copy()
+    if candidates.any():
+        matched, values = _vectorized_cryptonews(texts[candidates])
+        idx = np.flatnonzero(candidates)[matched]
+        result[idx] = values
+        pending[idx] = False
+
+    # Formats inconnus : parseur élément par élément
+    for i in np.flatnonzero(pending):
+        result[i] = _parse_cached(result[i], keys[i])
+
+    if as_datetime:
+        return pd.to_datetime(pd.Series(result), format="ISO8601", errors="coerce", utc=True)
+    return result
+
 def standardize_date_format(date_str):
     """
     Prend une date sous n'importe quel format et retourne un format standard.
@@ -90,19 +231,19 @@ def standardize_date_format(date_str):
     """
     if isinstance(date_str, bytes):
         date_str = date_str.decode('utf-8')
-    
+
     try:
         if 'T' in date_str and ('+' in date_str or 'Z' in date_str):
             dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
         else:
             dt = dateutil_parser.parse(date_str)
-        
+
         if dt.tzinfo is None:
             dt = pytz.UTC.localize(dt)
-        
+
         dt_utc = dt.astimezone(pytz.UTC)
         return dt_utc.strftime("%Y-%m-%d %H:%M:%S%z")
-    
+
     except Exception:
         return date_str
 
@@ -115,11 +256,17 @@ if __name__ == "__main__":
         ("10/06/2025", None),
         ("May 30, 2025 at 07:08 PM GMT+2", "https://crypto.news/example")
     ]
-    
+
     print("Tests de parsing de dates:")
     for date_str, url in test_dates:
         parsed = parse_date_with_context(date_str, url)
         standard = standardize_date_format(parsed)
         print(f"\nOriginal: {date_str}")
         print(f"Parsed:   {parsed}")
-        print(f"Standard: {standard}")
\ No newline at end of file
+        print(f"Standard: {standard}")
+
+    print("\nMode vectorisé:")
+    vectorized = parse_dates([d for d, _ in test_dates], [u for _, u in test_dates])
+    for (date_str, url), parsed in zip(test_dates, vectorized):
+        assert parsed == parse_date_with_context(date_str, url), (date_str, parsed)
+        print(f"{date_str} -> {parsed}")
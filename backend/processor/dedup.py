@@ -0,0 +1,242 @@
+# backend/processor/dedup.py
+"""
+Détection des quasi-doublons d'articles (communiqués republiés presque à
+l'identique d'une source à l'autre).
+
+Chaque article est résumé par une empreinte SimHash 64 bits calculée sur les
+shingles de mots de sa forme normalisée (cf. text_normalizer.hash_form). Deux
+articles sont considérés comme doublons si leurs empreintes diffèrent d'au
+plus MAX_DISTANCE bits. Les empreintes sont rangées dans des buckets LSH
+(l'empreinte découpée en BANDS bandes) : deux empreintes à distance <= BANDS - 1
+partagent forcément au moins une bande, seuls les articles d'un même bucket
+sont comparés.
+
+L'index est persisté à côté du dataset (`dataset.simhash.npz`) : empreintes
+des articles stockés et correspondance doublon -> article d'origine.
+
+Usage (reconstruction depuis le dataset) :
+    python backend/processor/dedup.py --rebuild
+"""
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+# Ajoute backend/ au path pour importer le package processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor import h5_utilities
+from processor.text_normalizer import hash_form
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_DATASET = os.path.join(PROJECT_ROOT, "dataset")
+
+SHINGLE_SIZE = 3
+BANDS = 4
+BAND_BITS = 64 // BANDS
+MAX_DISTANCE = BANDS - 1
+
+_BIT_SHIFTS = np.arange(64, dtype=np.uint64)
+
+def _shingles(text, size=SHINGLE_SIZE):
+    words = hash_form(text).split()
+    if len(words) < size:
+        return words
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+def _hash64(token):
+    # blake2b plutôt que hash() : stable d'un process à l'autre (empreintes persistées)
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+def simhash(text):
+    """Empreinte SimHash 64 bits du texte, ou None s'il n'a aucun mot."""
+    shingles = _shingles(text)
+    if not shingles:
+        return None
+    hashes = np.array([_hash64(s) for s in shingles], dtype=np.uint64)
+    bits = (hashes[:, None] >> _BIT_SHIFTS) & np.uint64(1)
+    # Bit à 1 si la majorité des shingles ont ce bit à 1
+    votes = bits.sum(axis=0) * 2 > len(hashes)
+    return int((votes.astype(np.uint64) << _BIT_SHIFTS).sum())
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+def sidecar_path(datasetFileName):
+    return f"{datasetFileName}.simhash.npz"
+
+class NearDuplicateIndex:
+    def __init__(self, path=None, max_distance=MAX_DISTANCE):
+        self.path = path
+        self.max_distance = max_distance
+        self.fingerprints = []
+        self.links = []
+        self.duplicates = {}  # lien du doublon -> lien de l'article d'origine
+        self._positions = {}  # lien -> position dans fingerprints / links
+        self._pending = set()  # positions réservées par check(), pas encore écrites
+        self._buckets = [defaultdict(list) for _ in range(BANDS)]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bands(fingerprint):
+        mask = (1 << BAND_BITS) - 1
+        return [(fingerprint >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+    def _find(self, fingerprint, link):
+        for band, value in enumerate(self._bands(fingerprint)):
+            for idx in self._buckets[band].get(value, ()):
+                if self.links[idx] != link and hamming(fingerprint, self.fingerprints[idx]) <= self.max_distance:
+                    return self.links[idx]
+        return None
+
+    def _add(self, fingerprint, link):
+        idx = len(self.fingerprints)
+        self.fingerprints.append(fingerprint)
+        self.links.append(link)
+        self._positions[link] = idx
+        for band, value in enumerate(self._bands(fingerprint)):
+            self._buckets[band][value].append(idx)
+        return idx
+
+    def _drop(self, idx):
+        for band, value in enumerate(self._bands(self.fingerprints[idx])):
+            self._buckets[band][value].remove(idx)
+        del self._positions[self.links[idx]]
+        self._pending.discard(idx)
+
+    def check(self, text, link):
+        """
+        Retourne le lien de l'article d'origine si `text` est un quasi-doublon
+        d'un autre article indexé, sinon None. Un original est réservé en
+        attente (les quasi-doublons traités en même temps sont détectés) : il
+        n'est indexé pour de bon qu'après son écriture (cf. commit / release).
+        """
+        fingerprint = simhash(text)
+        if fingerprint is None:
+            return None
+        with self._lock:
+            original = self._find(fingerprint, link)
+            if original is None and link not in self._positions:
+                self._pending.add(self._add(fingerprint, link))
+            return original
+
+    def is_stored(self, link):
+        """True si l'article `link` a déjà été écrit dans le dataset."""
+        with self._lock:
+            idx = self._positions.get(link)
+            return idx is not None and idx not in self._pending
+
+    def commit(self, link, duplicate_of=None):
+        """Appelé après l'écriture h5 : indexe l'original ou enregistre le doublon."""
+        with self._lock:
+            if duplicate_of:
+                self.duplicates[link] = duplicate_of
+            else:
+                self._pending.discard(self._positions.get(link))
+
+    def release(self, links):
+        """Abandonne les réservations des articles `links` qui n'ont pas été écrits."""
+        with self._lock:
+            for link in links:
+                idx = self._positions.get(link)
+                if idx in self._pending:
+                    self._drop(idx)
+
+    def duplicate_links(self):
+        with self._lock:
+            return set(self.duplicates)
+
+    def __len__(self):
+        return len(self._positions) - len(self._pending)
+
+    # ---- Persistance ----
+    def save(self, path=None):
+        path = path or self.path
+        with self._lock:
+            # Seuls les articles écrits sont persistés (ni réservations, ni entrées abandonnées)
+            stored = [idx for idx in self._positions.values() if idx not in self._pending]
+            arrays = {
+                "fingerprints": np.array([self.fingerprints[idx] for idx in stored], dtype=np.uint64),
+                "links": np.array([self.links[idx].encode("utf-8") for idx in stored], dtype="S"),
+                "duplicate_links": np.array([l.encode("utf-8") for l in self.duplicates], dtype="S"),
+                "duplicate_of": np.array([l.encode("utf-8") for l in self.duplicates.values()], dtype="S"),
+            }
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                np.savez(f, **arrays)
+            # Remplacement atomique : un crash ne laisse jamais un index à moitié écrit
+            os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path, max_distance=MAX_DISTANCE):
+        index = cls(path, max_distance)
+        with np.load(path) as data:
+            for fingerprint, link in zip(data["fingerprints"], data["links"]):
+                index._add(int(fingerprint), link.decode("utf-8"))
+            for link, original in zip(data["duplicate_links"], data["duplicate_of"]):
+                index.duplicates[link.decode("utf-8")] = original.decode("utf-8")
+        return index
+
+    @classmethod
+    def rebuild(cls, datasetFileName=DEFAULT_DATASET, chunk_size=2048, max_distance=MAX_DISTANCE):
+        """Reconstruit l'index en parcourant le dataset par tranches (ordre de stockage)."""
+        index = cls(sidecar_path(datasetFileName), max_distance)
+        if not h5_utilities.checkDatasetExist(datasetFileName):
+            return index
+        with h5_utilities.openDatasetWithRetry(datasetFileName, 'r') as f:
+            total = f['content'].shape[0]
+        for start in range(0, total, chunk_size):
+            rows = h5_utilities.getDatasetSlice(start, start + chunk_size, ('content', 'link'), datasetFileName)
+            for content, link in zip(rows['content'], rows['link']):
+                # Le dataset est déjà écrit : chaque article est validé tout de suite
+                index.commit(link, index.check(content, link))
+        logger.info(f"Near-duplicate index rebuilt: {len(index)} articles, {len(index.duplicates)} duplicates")
+        return index
+
+# ==== Index partagé par dataset ====
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_index(datasetFileName=DEFAULT_DATASET) -> NearDuplicateIndex:
+    """Charge l'index du dataset (ou le reconstruit si le fichier n'existe pas encore)."""
+    key = os.path.abspath(datasetFileName)
+    with _indexes_lock:
+        if key not in _indexes:
+            path = sidecar_path(datasetFileName)
+            if os.path.exists(path):
+                _indexes[key] = NearDuplicateIndex.load(path)
+            else:
+                _indexes[key] = NearDuplicateIndex.rebuild(datasetFileName)
+        return _indexes[key]
+
+def duplicate_links(datasetFileName=DEFAULT_DATASET):
+    """Liens marqués comme doublons, lus depuis l'index persisté (sans reconstruire les buckets)."""
+    path = sidecar_path(datasetFileName)
+    if not os.path.exists(path):
+        return set()
+    with np.load(path) as data:
+        return {l.decode("utf-8") for l in data["duplicate_links"]}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Near-duplicate index for dataset.h5")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET, help="Chemin du dataset sans l'extension .h5")
+    parser.add_argument("--rebuild", action="store_true", help="Reconstruit l'index depuis le dataset")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    if args.rebuild:
+        index = NearDuplicateIndex.rebuild(args.dataset)
+        index.save()
+    else:
+        index = get_index(args.dataset)
+    print(f"{len(index)} articles indexed, {len(index.duplicates)} near-duplicates")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,5 @@
-import emoji
+from processor.text_normalizer import strip_emojis
 
 def remove_emojis(text):
     """Supprime tous les emojis d'un texte."""
-    if not isinstance(text, str):
-        return text
-    return emoji.replace_emoji(text, replace='')
\ No newline at end of file
+    return strip_emojis(text)
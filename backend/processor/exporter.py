@@ -0,0 +1,290 @@
+# backend/processor/exporter.py
+"""
+Export en flux du dataset (NDJSON, Arrow IPC, Parquet).
+
+Le dataset est lu par tranches de `chunk_size` lignes (getDatasetSlice) :
+chaque tranche est filtrée (dates, crypto), réduite aux colonnes demandées,
+encodée puis rendue avant de lire la suivante. La mémoire utilisée dépend de
+la taille d'une tranche, pas de celle du dataset. Les lignes ajoutées pendant
+l'export ne sont pas incluses (la longueur est lue au départ).
+
+Les dates sont exportées en ISO 8601 UTC, les cryptos sous forme de liste.
+La ligne de création du dataset et les quasi-doublons connus sont ignorés.
+
+Arrow et Parquet nécessitent pyarrow (dépendance optionnelle), NDJSON non.
+
+Usage :
+    python backend/processor/exporter.py --format parquet -o articles.parquet \
+        --from 2025-05-01 --crypto btc --columns link,date,note
+"""
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow est optionnel : seul l'export NDJSON reste disponible
+    pa = None
+    pq = None
+
+# Ajoute backend/ au path pour importer le package processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor import dedup, h5_utilities
+from processor.crypto_registry import detect_cryptos
+from processor.date_parser import parse_dates
+from processor.search_index import resolve_crypto
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_DATASET = os.path.join(PROJECT_ROOT, "dataset")
+
+COLUMNS = ("content", "link", "date", "crypto", "note")
+FORMATS = ("ndjson", "arrow", "parquet")
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+EXTENSIONS = {"ndjson": "ndjson", "arrow": "arrows", "parquet": "parquet"}
+CHUNK_SIZE = 4096
+
+def parse_columns(spec):
+    """'link,date' -> ('link', 'date') ; None ou '' -> toutes les colonnes."""
+    if not spec:
+        return COLUMNS
+    columns = tuple(c.strip() for c in spec.split(",") if c.strip())
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)} (available: {', '.join(COLUMNS)})")
+    return columns
+
+def _to_utc(value, end_of_day=False):
+    if not value:
+        return None
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    if end_of_day and len(value) == 10:  # 'AAAA-MM-JJ' : toute la journée est incluse
+        ts += pd.Timedelta(days=1) - pd.Timedelta(microseconds=1)
+    return ts
+
+def _plan(datasetFileName, columns, date_from, date_to, crypto):
+    """
+    Vérifie les options et lit l'en-tête du dataset, avant toute tranche :
+    une erreur (colonne, date, fichier absent ou illisible) est levée à
+    l'appel et non au premier octet rendu.
+    """
+    unknown = [c for c in columns if c not in COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(unknown)} (available: {', '.join(COLUMNS)})")
+    try:
+        start_ts, stop_ts = _to_utc(date_from), _to_utc(date_to, end_of_day=True)
+    except ValueError as e:
+        raise ValueError(f"Invalid date filter: {e}") from e
+    if not h5_utilities.checkDatasetExist(datasetFileName):
+        raise FileNotFoundError(f"{datasetFileName}.h5 not found")
+    with h5_utilities.openDatasetWithRetry(datasetFileName, 'r') as f:
+        total = f['content'].shape[0]
+        # La ligne de création du dataset n'est pas un article
+        first = 1 if f.attrs.get('placeholderContent', False) else 0
+
+    if crypto:
+        # Les cryptos du dataset sont les noms du registre (cf. detect_cryptos)
+        if not detect_cryptos(crypto):
+            raise ValueError(f"Unknown crypto: {crypto}")
+        crypto = resolve_crypto(crypto)
+    # Colonnes lues : celles demandées + celles nécessaires aux filtres
+    needed = set(columns) | {"link"}
+    if start_ts is not None or stop_ts is not None:
+        needed.add("date")
+    if crypto:
+        needed.add("crypto")
+    return {
+        "datasetFileName": datasetFileName,
+        "columns": columns,
+        "read": [c for c in COLUMNS if c in needed],
+        "first": first,
+        "total": total,
+        "start_ts": start_ts,
+        "stop_ts": stop_ts,
+        "crypto": crypto,
+        "duplicates": dedup.duplicate_links(datasetFileName),
+    }
+
+def _chunks(plan, chunk_size):
+    datasetFileName, columns = plan["datasetFileName"], plan["columns"]
+    start_ts, stop_ts, crypto = plan["start_ts"], plan["stop_ts"], plan["crypto"]
+    for start in range(plan["first"], plan["total"], chunk_size):
+        rows = h5_utilities.getDatasetSlice(start, start + chunk_size, plan["read"], datasetFileName)
+        links = rows["link"]
+        keep = pd.Series([link not in plan["duplicates"] for link in links])
+        if "date" in rows:
+            dates = parse_dates(rows["date"], links, as_datetime=True)
+            if start_ts is not None:
+                keep &= dates >= start_ts
+            if stop_ts is not None:
+                keep &= dates <= stop_ts
+            rows["date"] = [None if pd.isna(d) else d.isoformat() for d in dates]
+        if "crypto" in rows:
+            rows["crypto"] = [[c for c in value.split(",") if c] for value in rows["crypto"]]
+            if crypto:
+                keep &= pd.Series([crypto in value for value in rows["crypto"]])
+        if "note" in rows:
+            rows["note"] = [None if math.isnan(n) else float(n) for n in rows["note"]]
+
+        mask = keep.to_numpy()
+        if not mask.any():
+            continue
+        yield {c: [v for v, k in zip(rows[c], mask) if k] for c in columns}
+
+def iter_chunks(datasetFileName=DEFAULT_DATASET, columns=COLUMNS, date_from=None, date_to=None,
+                crypto=None, chunk_size=CHUNK_SIZE):
+    """
+    Parcourt le dataset par tranches et produit pour chacune un dict
+    {colonne: liste} filtré, avec seulement les colonnes demandées.
+    Les options et le fichier sont vérifiés dès l'appel (cf. _plan).
+    """
+    return _chunks(_plan(datasetFileName, columns, date_from, date_to, crypto), chunk_size)
+
+# ==== Encodeurs ====
+# Chaque encodeur prend l'itérateur de tranches et produit des bytes au fil de l'eau
+
+def encode_ndjson(chunks, columns):
+    for chunk in chunks:
+        lines = [
+            json.dumps(dict(zip(columns, values)), ensure_ascii=False)
+            for values in zip(*(chunk[c] for c in columns))
+        ]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+def _require_pyarrow(fmt):
+    if pa is None:
+        raise RuntimeError(f"Export format '{fmt}' requires pyarrow (pip install pyarrow)")
+
+def arrow_schema(columns):
+    types = {
+        "content": pa.string(),
+        "link": pa.string(),
+        "date": pa.timestamp("us", tz="UTC"),
+        "crypto": pa.list_(pa.string()),
+        "note": pa.float64(),
+    }
+    return pa.schema([(c, types[c]) for c in columns])
+
+def _record_batch(chunk, schema):
+    arrays = []
+    for field in schema:
+        values = chunk[field.name]
+        if field.name == "date":
+            values = pd.to_datetime(pd.Series(values, dtype=object), utc=True, format="ISO8601")
+        arrays.append(pa.array(values, type=field.type, from_pandas=True))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+class _PendingBytes:
+    """Sortie fichier minimale pour pyarrow : accumule ce qui est écrit jusqu'au prochain `take()`."""
+    def __init__(self):
+        self.parts = []
+        self.closed = False
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+def _encode_arrow_format(chunks, schema, open_writer):
+    sink = _PendingBytes()
+    writer = open_writer(pa.PythonFile(sink, mode="w"), schema)
+    try:
+        for chunk in chunks:
+            writer.write_batch(_record_batch(chunk, schema))
+            data = sink.take()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.take()
+
+def encode_arrow(chunks, columns):
+    _require_pyarrow("arrow")
+    return _encode_arrow_format(chunks, arrow_schema(columns), pa.ipc.new_stream)
+
+def encode_parquet(chunks, columns):
+    # Une tranche = un row group ; le footer est écrit à la fermeture
+    _require_pyarrow("parquet")
+    return _encode_arrow_format(chunks, arrow_schema(columns), lambda sink, schema: pq.ParquetWriter(sink, schema))
+
+ENCODERS = {"ndjson": encode_ndjson, "arrow": encode_arrow, "parquet": encode_parquet}
+
+def stream_export(fmt="ndjson", datasetFileName=DEFAULT_DATASET, columns=COLUMNS, date_from=None,
+                  date_to=None, crypto=None, chunk_size=CHUNK_SIZE):
+    """
+    Itérateur de bytes de l'export au format `fmt` (utilisé par la CLI et par
+    /export). Format, pyarrow, colonnes, filtres et ouverture du dataset sont
+    vérifiés à l'appel : ValueError, RuntimeError ou OSError avant le premier octet.
+    """
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unknown format: {fmt} (available: {', '.join(FORMATS)})")
+    if fmt != "ndjson":
+        _require_pyarrow(fmt)
+    chunks = iter_chunks(datasetFileName, columns, date_from, date_to, crypto, chunk_size)
+    return ENCODERS[fmt](chunks, columns)
+
+def export(path, fmt="ndjson", **options):
+    """Écrit l'export dans `path` ; retourne le nombre d'octets écrits."""
+    written = 0
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            for data in stream_export(fmt, **options):
+                f.write(data)
+                written += len(data)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streaming export of dataset.h5")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET, help="Chemin du dataset sans l'extension .h5")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("-o", "--output", default=None, help="Fichier de sortie (défaut : stdout)")
+    parser.add_argument("--columns", default=None, help=f"Colonnes exportées parmi {','.join(COLUMNS)}")
+    parser.add_argument("--from", dest="date_from", default=None)
+    parser.add_argument("--to", dest="date_to", default=None)
+    parser.add_argument("--crypto", default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    options = dict(
+        datasetFileName=args.dataset, columns=parse_columns(args.columns), date_from=args.date_from,
+        date_to=args.date_to, crypto=args.crypto, chunk_size=args.chunk_size,
+    )
+    if args.output:
+        written = export(args.output, args.format, **options)
+        logger.info(f"Exported {written} bytes to {args.output}")
+    else:
+        for data in stream_export(args.format, **options):
+            sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+if __name__ == "__main__":
+    main()
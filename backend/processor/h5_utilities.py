@@ -1,7 +1,24 @@
+import functools
+import logging
 import os
+import threading
+import time
 import h5py
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+# Plusieurs workers de scraping (threads) écrivent dans le même fichier h5 :
+# toutes les ouvertures du fichier dans ce process passent par ce verrou
+DATASET_LOCK = threading.RLock()
+
+def _with_dataset_lock(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with DATASET_LOCK:
+            return func(*args, **kwargs)
+    return wrapper
+
 def checkDatasetExist(datasetFileName):
     """
     Vérifie si le dataset au format h5 existe.
@@ -16,9 +33,26 @@ def checkDatasetExist(datasetFileName):
         return False
     return True
 
+def openDatasetWithRetry(datasetFileName="dataset", mode='r', retries=10, delay=0.5):
+    """
+    Ouvre le fichier h5 en réessayant si un autre process (API, export,
+    rescore) le verrouille. Utilisé par toutes les lectures et écritures
+    courtes, pour qu'une ouverture concurrente ne fasse pas échouer l'ingest.
+    """
+    for attempt in range(retries):
+        try:
+            return h5py.File(datasetFileName + ".h5", mode)
+        except FileNotFoundError:
+            raise
+        except (OSError, BlockingIOError):
+            if attempt == retries - 1:
+                raise
+            time.sleep(delay * (attempt + 1))
+
+@_with_dataset_lock
 def createDataset(content, link, date, crypto, note, datasetFileName="dataset"):
     if checkDatasetExist(datasetFileName):
-        print(f"Erreur : Le fichier {datasetFileName}.h5 existe déjà.")
+        logger.error(f"Le fichier {datasetFileName}.h5 existe déjà.")
         return
 
     # Encodage en array d'objets
@@ -40,13 +74,14 @@ def createDataset(content, link, date, crypto, note, datasetFileName="dataset"):
         f.attrs['last_news_uToday'] = 'None'
         f.attrs['last_news_beInCrypto'] = 'None'
 
+@_with_dataset_lock
 def remove_first_item(datasetFileName="dataset"):
     """
     Do not run if dataset have only the placeholder entry !
     """
-    with h5py.File(datasetFileName + ".h5", 'r+') as f:
+    with openDatasetWithRetry(datasetFileName, 'r+') as f:
         for name in f.keys():
-            print(f"Traitement du dataset : {name}")
+            logger.debug("remove_first_item column=%s", name)
             dset = f[name]
             
             dset[:len(dset)-1] = dset[1:]
@@ -54,12 +89,31 @@ def remove_first_item(datasetFileName="dataset"):
             dset.resize((len(dset) - 1,))
         
 
+@_with_dataset_lock
+def removePlaceholderRow(datasetFileName="dataset"):
+    """
+    Retire la ligne de création du dataset si elle est encore présente :
+    lecture de l'attribut, suppression de la ligne 0 et remise à False de
+    l'attribut dans une seule ouverture, sous DATASET_LOCK.
+    Retourne True si la ligne a été retirée.
+    """
+    with openDatasetWithRetry(datasetFileName, 'r+') as f:
+        if not f.attrs['placeholderContent'] or f['content'].shape[0] < 2:
+            return False
+        for name in f.keys():
+            dset = f[name]
+            dset[:len(dset)-1] = dset[1:]
+            dset.resize((len(dset) - 1,))
+        f.attrs['placeholderContent'] = False
+    return True
+
+@_with_dataset_lock
 def appendArticleToDataset(new_content, new_link, new_date, new_crypto, new_note, datasetFileName="dataset"):
     if not checkDatasetExist(datasetFileName):
-        print(f"Erreur : Le fichier {datasetFileName}.h5 n'existe pas.")
+        logger.error(f"Le fichier {datasetFileName}.h5 n'existe pas.")
         return
 
-    with h5py.File(datasetFileName + ".h5", 'a') as f:
+    with openDatasetWithRetry(datasetFileName, 'a') as f:
         # Convertir en format encodé
         new_content_b = np.array([new_content.encode('utf-8')])
         new_link_b = np.array([new_link.encode('utf-8')])
@@ -78,8 +132,36 @@ def appendArticleToDataset(new_content, new_link, new_date, new_crypto, new_note
             dset.resize((new_shape,))
             dset[old_shape:] = new_data
 
+@_with_dataset_lock
+def appendArticlesToDataset(new_contents, new_links, new_dates, new_cryptos, new_notes, datasetFileName="dataset"):
+    """
+    Version par lot de appendArticleToDataset : une seule ouverture du fichier
+    et un seul resize par colonne pour tout le lot.
+    """
+    if not new_contents:
+        return
+    if not checkDatasetExist(datasetFileName):
+        logger.error(f"Le fichier {datasetFileName}.h5 n'existe pas.")
+        return
+
+    with openDatasetWithRetry(datasetFileName, 'a') as f:
+        columns = {
+            'content': np.array([c.encode('utf-8') for c in new_contents]),
+            'link': np.array([l.encode('utf-8') for l in new_links]),
+            'date': np.array([(d or '').encode('utf-8') for d in new_dates]),
+            'crypto': np.array([",".join(c).encode('utf-8') for c in new_cryptos]),
+            'note': np.array(new_notes, dtype='f8'),
+        }
+        for name, new_data in columns.items():
+            dset = f[name]
+            old_shape = dset.shape[0]
+            dset.resize((old_shape + len(new_data),))
+            dset[old_shape:] = new_data
+
+@_with_dataset_lock
 def getDataset(datasetFileName="dataset",isTrainDataset=False):
-    with h5py.File(datasetFileName + ".h5", 'r') as f:
+    # Avec retry : le worker d'ingestion (autre process) peut tenir le fichier ouvert en écriture
+    with openDatasetWithRetry(datasetFileName, 'r') as f:
         content = [c.decode('utf-8') for c in f['content'][:]]
         link = [c.decode('utf-8') for c in f['link'][:]]
         date = [c.decode('utf-8') for c in f['date'][:]]
@@ -109,15 +191,18 @@ def getDatasetLength(datasetFileName="dataset"):
     content, link, date, crypto = getDataset(datasetFileName=datasetFileName)
     return len(content)
 
+@_with_dataset_lock
 def getDatasetPlaceholderAttribute(datasetFileName="dataset"):
-    with h5py.File(datasetFileName + ".h5", 'r') as f:
+    with openDatasetWithRetry(datasetFileName, 'r') as f:
         placeHolderAttribute = f.attrs['placeholderContent']
     return placeHolderAttribute
 
+@_with_dataset_lock
 def setDatasetPlaceholderAttribute(newValue,datasetFileName="dataset"):
-    with h5py.File(datasetFileName + ".h5", "r+") as f:
+    with openDatasetWithRetry(datasetFileName, 'r+') as f:
         f.attrs['placeholderContent'] = newValue
 
+@_with_dataset_lock
 def getUrlAttribute(website,datasetFileName="dataset"):
     """
     website_value : str
@@ -125,10 +210,11 @@ def getUrlAttribute(website,datasetFileName="dataset"):
         'last_news_uToday'
         'last_news_beInCrypto'
     """
-    with h5py.File(datasetFileName + ".h5", 'r') as f:
+    with openDatasetWithRetry(datasetFileName, 'r') as f:
         placeHolderAttribute = f.attrs[website]
     return placeHolderAttribute
 
+@_with_dataset_lock
 def setUrlAttribute(website,newValue,datasetFileName="dataset"):
     """
     website_value : str
@@ -136,12 +222,13 @@ def setUrlAttribute(website,newValue,datasetFileName="dataset"):
         'last_news_uToday'
         'last_news_beInCrypto'
     """
-    with h5py.File(datasetFileName + ".h5", "r+") as f:
+    with openDatasetWithRetry(datasetFileName, 'r+') as f:
         f.attrs[website] = newValue
 
+@_with_dataset_lock
 def updateArticleDataset(index, new_content, new_link, new_date, new_crypto, new_note=None, datasetFileName="dataset", isTrainDataset=False):
     try:
-        with h5py.File(datasetFileName + ".h5", 'r+') as f:
+        with openDatasetWithRetry(datasetFileName, 'r+') as f:
             # Strings simples : on encode direct en bytes
             f['content'][index] = new_content.encode('utf-8')
             f['link'][index] = new_link.encode('utf-8')
@@ -155,17 +242,53 @@ def updateArticleDataset(index, new_content, new_link, new_date, new_crypto, new
             if isTrainDataset and new_note is not None:
                 f['note'][index] = new_note
 
-            print(f"Article à l’index {index} mis à jour avec succès.")
+            logger.debug("article updated index=%s", index)
     
     except IndexError:
-        print("Erreur : index en dehors des limites.")
+        logger.error("Index en dehors des limites.")
     except KeyError as e:
-        print(f"Erreur : champ manquant dans le dataset ({e}).")
+        logger.error(f"Champ manquant dans le dataset ({e}).")
     except Exception as e:
-        print(f"Erreur inattendue : {e}")
+        logger.error(f"Erreur inattendue : {e}")
+
+@_with_dataset_lock
+def getDatasetSlice(start, stop, columns=('content', 'link'), datasetFileName="dataset"):
+    """
+    Lit les lignes [start, stop) des colonnes demandées sans charger tout le fichier.
+    Les colonnes texte sont décodées en str, les autres sont retournées telles quelles.
+    Retourne un dict {colonne: liste ou array}.
+    """
+    result = {}
+    with openDatasetWithRetry(datasetFileName, 'r') as f:
+        for name in columns:
+            data = f[name][start:stop]
+            if data.dtype.kind == 'S' or data.dtype.kind == 'O':
+                data = [c.decode('utf-8') for c in data]
+            result[name] = data
+    return result
+
+@_with_dataset_lock
+def setColumnSlice(column, start, values, datasetFileName="dataset"):
+    """
+    Écrit `values` dans la colonne numérique `column` à partir de l'index `start`.
+    La colonne est créée (remplie de NaN) si elle n'existe pas, et agrandie
+    pour suivre la longueur du dataset si des articles ont été ajoutés entre temps.
+    """
+    values = np.asarray(values, dtype='f8')
+    with openDatasetWithRetry(datasetFileName, 'r+') as f:
+        length = f['content'].shape[0]
+        if column not in f:
+            f.create_dataset(column, shape=(length,), dtype='f8', fillvalue=np.nan,
+                             compression="gzip", chunks=True, maxshape=(None,))
+        dset = f[column]
+        needed = max(length, start + len(values))
+        if dset.shape[0] < needed:
+            dset.resize((needed,))
+        dset[start:start + len(values)] = values
 
 
 
+@_with_dataset_lock
 def readDataset(datasetFileName="dataset"):
     with h5py.File(datasetFileName + ".h5", 'r') as f:
         print("Attributs du fichier HDF5 :")
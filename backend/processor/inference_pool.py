@@ -0,0 +1,351 @@
+# backend/processor/inference_pool.py
+"""
+Pool d'inférence CPU multi-process.
+
+Le modèle est chargé une fois dans le process parent puis les workers sont créés
+par fork : les poids sont partagés en copy-on-write (l'inférence ne fait que
+les lire). Chaque worker borne son nombre de threads torch, ce qui permet de
+monter en charge avec le nombre de cœurs au lieu de plafonner vers 4-8 threads.
+
+Avec SENTIMENT_COMPILED=1, le parent ne trace ni n'infère rien avant de créer
+les workers : les graphes TorchScript sont compilés (si besoin) dans un process
+à part, puis chaque worker, lancé en spawn, les recharge depuis le disque.
+
+Réglage :
+    SENTIMENT_POOL_WORKERS / SENTIMENT_POOL_THREADS (variables d'environnement),
+    sinon le résultat de `python backend/processor/inference_pool.py --autotune`,
+    sinon une heuristique basée sur le nombre de cœurs.
+
+Un worker mort (OOM, segfault) ou un lot sans résultat après
+SENTIMENT_POOL_TIMEOUT secondes fait échouer le lot en cours et le pool est
+recréé au lot suivant.
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from multiprocessing import get_context
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor import sentiment
+
+logger = logging.getLogger(__name__)
+
+# Fichier de réglage écrit par l'autotune, à côté du dossier du modèle
+TUNING_FILE = sentiment.MODEL_DIR + ".pool.json"
+
+# Délai maximal (s) pour obtenir les scores d'un appel à score(), et intervalle
+# de vérification que les workers sont toujours vivants pendant l'attente
+RESULT_TIMEOUT = float(os.environ.get("SENTIMENT_POOL_TIMEOUT", "300"))
+HEALTH_CHECK_INTERVAL = 1.0
+
+class BrokenInferencePool(RuntimeError):
+    """Un worker est mort ou ne répond plus : le lot en cours est perdu."""
+
+def available_cpus():
+    """Cœurs utilisables par ce process (respecte l'affinité, ex: ingest_worker.py --cpus)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def default_config(cpu_count=None):
+    """
+    Retourne (workers, threads_per_worker) : variables d'environnement,
+    puis fichier d'autotune, puis heuristique 4 threads par worker.
+    """
+    cpu_count = cpu_count or available_cpus()
+    env_workers = os.environ.get("SENTIMENT_POOL_WORKERS")
+    env_threads = os.environ.get("SENTIMENT_POOL_THREADS")
+    if env_workers:
+        workers = int(env_workers)
+        threads = int(env_threads) if env_threads else max(1, cpu_count // workers)
+        return workers, threads
+
+    if os.path.exists(TUNING_FILE):
+        with open(TUNING_FILE) as f:
+            tuned = json.load(f)
+        return int(tuned["workers"]), int(tuned["threads_per_worker"])
+
+    threads = min(4, cpu_count)
+    return max(1, cpu_count // threads), threads
+
+def pool_enabled():
+    """Le mode pool est activé explicitement via SENTIMENT_POOL_WORKERS."""
+    return int(os.environ.get("SENTIMENT_POOL_WORKERS", "0") or 0) > 0
+
+# ==== Worker ====
+def _compile_artifacts(model_dir):
+    """Process à part : trace et sauvegarde les graphes compilés s'ils sont absents ou périmés."""
+    import torch
+
+    sentiment.load_model(model_dir, torch.device("cpu"), compiled=True)
+
+def _worker_loop(tokenizer, model, num_threads, batch_size, tasks, results, model_dir=None):
+    import torch
+
+    torch.set_num_threads(num_threads)
+    if model is None:
+        # Mode compilé : graphes rechargés dans le worker (déjà tracés par _compile_artifacts)
+        tokenizer, model = sentiment.load_model(model_dir, torch.device("cpu"), compiled=True)
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        task_id, texts = task
+        try:
+            scores = sentiment.compute_sentiment_batch(texts, batch_size=batch_size,
+                                                       tokenizer=tokenizer, model=model)
+            results.put((task_id, scores, None))
+        except Exception as e:
+            results.put((task_id, None, repr(e)))
+
+class InferencePool:
+    def __init__(self, workers=None, threads_per_worker=None, model_dir=sentiment.MODEL_DIR,
+                 batch_size=sentiment.BATCH_SIZE, model=None, compiled=sentiment.SENTIMENT_COMPILED):
+        default_workers, default_threads = default_config()
+        self.workers = workers or default_workers
+        self.threads_per_worker = threads_per_worker or default_threads
+        self.batch_size = batch_size
+        self.model_dir = model_dir
+        # Le modèle peut être fourni (déjà chargé) pour éviter un second chargement ;
+        # en mode compilé il est ignoré, chaque worker charge ses graphes
+        self._model = model
+        self.compiled = compiled
+        # Tracer avant un fork laisserait les workers hériter de l'état OpenMP du parent
+        self._ctx = get_context("spawn" if compiled else "fork")
+        self._tasks = None
+        self._results = None
+        self._processes = []
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._ids = itertools.count()
+        self._collector = None
+        self._state_lock = threading.RLock()  # démarrage / arrêt / reset des workers
+
+    def start(self):
+        with self._state_lock:
+            if self._processes:
+                return self
+            if self.compiled:
+                self._compile()
+                tokenizer, model = None, None
+            else:
+                if self._model is None:
+                    import torch
+                    self._model = sentiment.load_model(self.model_dir, torch.device("cpu"), compiled=False)
+                tokenizer, model = self._model
+
+            self._tasks = self._ctx.Queue()
+            self._results = self._ctx.Queue()
+            # Le fork se fait avant toute inférence dans le parent : le pool de threads
+            # OpenMP n'est pas encore initialisé, et les poids restent partagés
+            for _ in range(self.workers):
+                p = self._ctx.Process(
+                    target=_worker_loop,
+                    args=(tokenizer, model, self.threads_per_worker, self.batch_size, self._tasks, self._results,
+                          self.model_dir),
+                    daemon=True,
+                )
+                p.start()
+                self._processes.append(p)
+
+            self._collector = threading.Thread(target=self._collect_results, args=(self._results,), daemon=True)
+            self._collector.start()
+            logger.info(f"Inference pool started: {self.workers} workers x {self.threads_per_worker} threads")
+            return self
+
+    def _compile(self):
+        """Compile les graphes une fois, hors du parent, avant de lancer les workers."""
+        p = self._ctx.Process(target=_compile_artifacts, args=(self.model_dir,), daemon=True)
+        p.start()
+        p.join()
+        if p.exitcode != 0:
+            raise RuntimeError(f"Compiling sentiment graphs failed (exit code {p.exitcode})")
+
+    def _collect_results(self, results):
+        while True:
+            item = results.get()
+            if item is None:
+                break
+            task_id, scores, error = item
+            with self._pending_lock:
+                future = self._pending.pop(task_id, None)
+            if future is None:
+                continue
+            if error:
+                future.set_exception(RuntimeError(f"Inference worker failed: {error}"))
+            else:
+                future.set_result(scores)
+
+    def submit(self, texts) -> Future:
+        """Envoie un lot de textes à un worker libre et retourne un Future de scores."""
+        with self._state_lock:
+            if not self._processes:
+                self.start()
+            future = Future()
+            task_id = next(self._ids)
+            with self._pending_lock:
+                self._pending[task_id] = future
+            self._tasks.put((task_id, list(texts)))
+        return future
+
+    def _reset(self, reason):
+        """
+        Arrête tous les workers et fait échouer les lots en attente : le
+        prochain submit() recrée le pool (le modèle reste chargé dans le parent).
+        """
+        with self._state_lock:
+            if not self._processes:
+                return
+            logger.error(f"Inference pool reset: {reason}")
+            processes, self._processes = self._processes, []
+            for p in processes:
+                if p.is_alive():
+                    p.terminate()
+                p.join(timeout=5)
+            self._results.put(None)
+            with self._pending_lock:
+                pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(BrokenInferencePool(reason))
+
+    def _wait(self, futures, timeout):
+        """Scores des futures dans l'ordre ; BrokenInferencePool / TimeoutError si le pool ne répond plus."""
+        deadline = time.monotonic() + timeout
+        scores = []
+        for future in futures:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._reset(f"no result after {timeout:.0f}s")
+                    raise TimeoutError(f"Inference pool gave no result after {timeout:.0f}s")
+                try:
+                    scores.extend(future.result(timeout=min(remaining, HEALTH_CHECK_INTERVAL)))
+                    break
+                except FutureTimeout:
+                    dead = [p.pid for p in self._processes if not p.is_alive()]
+                    if dead:
+                        reason = f"worker(s) {dead} died"
+                        self._reset(reason)
+                        raise BrokenInferencePool(reason)
+        return scores
+
+    def score(self, texts, timeout=RESULT_TIMEOUT) -> list[float]:
+        """
+        Score une liste de textes en la répartissant sur tous les workers.
+        Lève BrokenInferencePool si un worker meurt, TimeoutError après
+        `timeout` secondes ; le pool est alors recréé au prochain appel.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        # Découpe en parts multiples de batch_size pour occuper tous les workers
+        per_task = max(self.batch_size, -(-len(texts) // self.workers))
+        per_task = -(-per_task // self.batch_size) * self.batch_size
+        futures = [self.submit(texts[i:i + per_task]) for i in range(0, len(texts), per_task)]
+        return self._wait(futures, timeout)
+
+    def close(self):
+        with self._state_lock:
+            if not self._processes:
+                return
+            for _ in self._processes:
+                self._tasks.put(None)
+            for p in self._processes:
+                p.join(timeout=10)
+                if p.is_alive():
+                    p.terminate()
+            self._results.put(None)
+            self._collector.join(timeout=5)
+            self._processes = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ==== Pool global pour l'ingest ====
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+def get_shared_pool() -> InferencePool:
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = InferencePool().start()
+    return _shared_pool
+
+def score_texts(texts) -> list[float]:
+    """Score via le pool si SENTIMENT_POOL_WORKERS est défini, sinon dans le process courant."""
+    if pool_enabled():
+        return get_shared_pool().score(texts)
+    return sentiment.compute_sentiment_batch(list(texts))
+
+# ==== Autotune ====
+def benchmark_config(texts, workers, threads_per_worker, model, batch_size=sentiment.BATCH_SIZE, rounds=2):
+    """Mesure le débit (articles/s) d'une configuration du pool."""
+    with InferencePool(workers, threads_per_worker, batch_size=batch_size, model=model) as pool:
+        pool.score(texts[:batch_size * workers])  # warmup
+        started = time.perf_counter()
+        for _ in range(rounds):
+            pool.score(texts)
+        elapsed = time.perf_counter() - started
+    return len(texts) * rounds / elapsed
+
+def autotune(texts, cpu_count=None, thread_options=(1, 2, 4, 8), batch_size=sentiment.BATCH_SIZE, save=True):
+    """
+    Essaie toutes les combinaisons workers x threads qui tiennent dans les cœurs
+    disponibles et retient la plus rapide. Le résultat est écrit dans TUNING_FILE.
+    """
+    import torch
+
+    cpu_count = cpu_count or available_cpus()
+    # En mode compilé, le pool charge les graphes dans ses workers
+    model = None if sentiment.SENTIMENT_COMPILED else sentiment.load_model(
+        sentiment.MODEL_DIR, torch.device("cpu"), compiled=False)
+    results = []
+    for threads in thread_options:
+        if threads > cpu_count:
+            continue
+        workers = cpu_count // threads
+        rate = benchmark_config(texts, workers, threads, model, batch_size=batch_size)
+        logger.info(f"{workers} workers x {threads} threads: {rate:.1f} articles/s")
+        results.append({"workers": workers, "threads_per_worker": threads, "articles_per_s": rate})
+
+    best = max(results, key=lambda r: r["articles_per_s"])
+    if save:
+        with open(TUNING_FILE, "w") as f:
+            json.dump({**best, "cpu_count": cpu_count, "results": results}, f, indent=2)
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-process sentiment inference pool")
+    parser.add_argument("--autotune", action="store_true", help="Benchmark et sauvegarde la meilleure configuration")
+    parser.add_argument("--dataset", default=None, help="Dataset (sans .h5) dont les textes servent au benchmark")
+    parser.add_argument("--samples", type=int, default=256)
+    parser.add_argument("--cpus", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    if args.dataset:
+        from processor import h5_utilities
+        texts = h5_utilities.getDatasetSlice(0, args.samples, ('content',), args.dataset)['content']
+    else:
+        texts = ["Bitcoin rallies as institutional demand for spot ETFs keeps growing. " * 20] * args.samples
+
+    if args.autotune:
+        best = autotune(texts, cpu_count=args.cpus)
+        print(json.dumps(best, indent=2))
+    else:
+        print(json.dumps(dict(zip(("workers", "threads_per_worker"), default_config(args.cpus))), indent=2))
+
+if __name__ == "__main__":
+    main()
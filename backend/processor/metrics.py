@@ -0,0 +1,116 @@
+# backend/processor/metrics.py
+"""
+Métriques Prometheus de l'ingestion et de l'API.
+
+Deux registres séparés :
+- INGEST_REGISTRY : chargement des pages, extraction, inférence, écriture h5,
+  compteurs d'articles par source, profondeur des files du pipeline. Il vit
+  dans le process qui fait tourner l'ingest (l'API en mode inprocess, le
+  worker en mode worker, qui le renvoie par IPC) ;
+- SERVING_REGISTRY : recalcul du cache, âge du cache, taille du dataset.
+
+GET /metrics concatène les deux expositions (format texte Prometheus) : une
+métrique n'est définie que dans un registre, les familles ne se répètent pas.
+"""
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+INGEST_REGISTRY = CollectorRegistry()
+SERVING_REGISTRY = CollectorRegistry()
+
+# Hôte (clé d'article_fetcher.EXTRACTORS) -> nom de la source utilisé partout ailleurs
+SOURCE_NAMES = {"crypto.news": "cryptoNews", "u.today": "uToday"}
+
+def source_name(host_key):
+    return SOURCE_NAMES.get(host_key, host_key or "unknown")
+
+# ==== Ingest ====
+PAGE_LOAD_SECONDS = Histogram(
+    "crypto_weather_page_load_seconds", "Page load time (listing pages and articles)",
+    ["source", "kind"], registry=INGEST_REGISTRY,
+    buckets=(0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30),
+)
+EXTRACTION_SECONDS = Histogram(
+    "crypto_weather_article_extraction_seconds", "Time to extract date and content from a loaded article",
+    ["source"], registry=INGEST_REGISTRY,
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1, 5),
+)
+INFERENCE_BATCH_SECONDS = Histogram(
+    "crypto_weather_inference_batch_seconds", "Sentiment inference time per pipeline batch",
+    ["source"], registry=INGEST_REGISTRY,
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32),
+)
+INFERENCE_BATCH_SIZE = Histogram(
+    "crypto_weather_inference_batch_size", "Articles scored per pipeline batch",
+    ["source"], registry=INGEST_REGISTRY,
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+H5_WRITE_SECONDS = Histogram(
+    "crypto_weather_h5_write_seconds", "h5 append time per written batch",
+    ["source"], registry=INGEST_REGISTRY,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+ARTICLES_SCRAPED = Counter(
+    "crypto_weather_articles_scraped", "Articles fetched by the scrapers",
+    ["source"], registry=INGEST_REGISTRY,
+)
+ARTICLES_STORED = Counter(
+    "crypto_weather_articles_stored", "Articles written to the dataset",
+    ["source"], registry=INGEST_REGISTRY,
+)
+ARTICLES_DEDUPED = Counter(
+    "crypto_weather_articles_deduped", "Near-duplicate articles skipped",
+    ["source"], registry=INGEST_REGISTRY,
+)
+ARTICLES_FAILED = Counter(
+    "crypto_weather_articles_failed", "Articles dropped by an error (fetch or pipeline stage)",
+    ["source", "stage"], registry=INGEST_REGISTRY,
+)
+
+class QueueDepthCollector:
+    """Profondeur des files des pipelines en cours, lue au moment du scrape."""
+    def __init__(self, stats):
+        self.stats = stats  # callable -> {pipeline: {"running": bool, "stages": {étage: {...}}}}
+
+    def collect(self):
+        depth = GaugeMetricFamily(
+            "crypto_weather_ingest_queue_depth", "Items waiting in front of each pipeline stage",
+            labels=["source", "stage"],
+        )
+        for source, pipeline in self.stats().items():
+            if not pipeline["running"]:
+                continue
+            for stage, values in pipeline["stages"].items():
+                if "queue_depth" in values:
+                    depth.add_metric([source, stage], values["queue_depth"])
+        yield depth
+
+def register_queue_depths(stats):
+    INGEST_REGISTRY.register(QueueDepthCollector(stats))
+
+# ==== API ====
+COMPUTE_SECONDS = Histogram(
+    "crypto_weather_read_h5_and_compute_seconds", "Time to read the dataset and recompute the metrics",
+    registry=SERVING_REGISTRY,
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 32),
+)
+CACHE_AGE_SECONDS = Gauge(
+    "crypto_weather_cache_age_seconds", "Age of the served metrics snapshot",
+    registry=SERVING_REGISTRY,
+)
+DATASET_ROWS = Gauge(
+    "crypto_weather_dataset_rows", "Rows in the dataset at the last cache refresh",
+    registry=SERVING_REGISTRY,
+)
+INGEST_WORKER_UP = Gauge(
+    "crypto_weather_ingest_worker_up", "1 if the ingest metrics could be collected",
+    registry=SERVING_REGISTRY,
+)
+
+def ingest_exposition() -> str:
+    return generate_latest(INGEST_REGISTRY).decode("utf-8")
+
+def serving_exposition() -> str:
+    return generate_latest(SERVING_REGISTRY).decode("utf-8")
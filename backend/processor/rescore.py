@@ -0,0 +1,129 @@
+# backend/processor/rescore.py
+"""
+Re-scoring hors ligne du dataset avec une nouvelle version du modèle.
+
+Les scores sont écrits dans une nouvelle colonne versionnée (ex: `note_v4`),
+la colonne `note` d'origine n'est pas modifiée (sauf avec `--column note` : les
+notes de l'index de recherche sont alors mises à jour). Le fichier h5 n'est ouvert
+que brièvement pour chaque chunk afin de ne pas bloquer l'ingest live, et la
+progression est sauvegardée dans un fichier de checkpoint pour pouvoir reprendre.
+
+Usage :
+    python backend/processor/rescore.py --model-dir backend/model/output/bert_sentiment_regression_v4
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+
+# Ajoute backend/ au path pour importer le package processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor import h5_utilities, search_index
+from processor.inference_pool import InferencePool
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_DATASET = os.path.join(PROJECT_ROOT, "dataset")
+
+CHUNK_SIZE = 2048
+
+# ==== Checkpoint ====
+def column_for_model(model_dir):
+    """Déduit le nom de colonne versionnée depuis le dossier du modèle (..._v4 -> note_v4)."""
+    name = os.path.basename(os.path.normpath(model_dir))
+    match = re.search(r'_(v\d+)$', name)
+    return f"note_{match.group(1)}" if match else f"note_{name}"
+
+def checkpoint_path(datasetFileName, column):
+    return f"{datasetFileName}.rescore_{column}.json"
+
+def load_checkpoint(datasetFileName, column):
+    path = checkpoint_path(datasetFileName, column)
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        return int(json.load(f).get("next_index", 0))
+
+def save_checkpoint(datasetFileName, column, model_dir, next_index):
+    path = checkpoint_path(datasetFileName, column)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"column": column, "model_dir": model_dir, "next_index": next_index}, f)
+    # Remplacement atomique : un crash ne laisse jamais un checkpoint à moitié écrit
+    os.replace(tmp, path)
+
+def dataset_row_count(datasetFileName):
+    with h5_utilities.openDatasetWithRetry(datasetFileName, 'r') as f:
+        return f['content'].shape[0]
+
+# ==== Pipeline ====
+def rescore_dataset(model_dir, datasetFileName=DEFAULT_DATASET, column=None, chunk_size=CHUNK_SIZE,
+                    workers=None, threads_per_worker=None, batch_size=16, restart=False):
+    """
+    Re-score tout le dataset par chunks avec `workers` process en parallèle.
+    Retourne le nombre d'articles scorés pendant cet appel.
+    """
+    column = column or column_for_model(model_dir)
+    start = 0 if restart else load_checkpoint(datasetFileName, column)
+    total = dataset_row_count(datasetFileName)
+    logger.info(f"Rescoring {datasetFileName}.h5 into '{column}' from row {start}/{total}")
+
+    scored = 0
+    started_at = time.time()
+
+    # Le pool charge le modèle une fois et le partage entre les workers (fork)
+    with InferencePool(workers, threads_per_worker, model_dir=model_dir, batch_size=batch_size) as pool:
+        while start < total:
+            stop = min(start + chunk_size, total)
+            rows = h5_utilities.getDatasetSlice(start, stop, ('content', 'link'), datasetFileName)
+            scores = pool.score(rows['content'])
+
+            h5_utilities.setColumnSlice(column, start, scores, datasetFileName)
+            if column == "note":
+                # L'index de recherche garde une copie de la note servie par /search
+                search_index.get_index(datasetFileName).update_notes(rows['link'], scores)
+            save_checkpoint(datasetFileName, column, model_dir, stop)
+
+            scored += stop - start
+            start = stop
+            rate = scored / max(time.time() - started_at, 1e-6)
+            logger.info(f"{stop}/{total} rows rescored ({rate:.1f} articles/s)")
+
+            # Le dataset peut avoir grandi pendant le chunk (ingest live)
+            if start >= total:
+                total = dataset_row_count(datasetFileName)
+
+    return scored
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score dataset.h5 with a new sentiment model")
+    parser.add_argument("--model-dir", required=True, help="Dossier du nouveau modèle (bert_sentiment_regression_vN)")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET, help="Chemin du dataset sans l'extension .h5")
+    parser.add_argument("--column", default=None, help="Nom de la colonne de sortie (défaut: note_vN)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="Défaut: configuration du pool d'inférence")
+    parser.add_argument("--threads-per-worker", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--restart", action="store_true", help="Ignore le checkpoint et repart de zéro")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    scored = rescore_dataset(
+        model_dir=os.path.abspath(args.model_dir),
+        datasetFileName=args.dataset,
+        column=args.column,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        threads_per_worker=args.threads_per_worker,
+        batch_size=args.batch_size,
+        restart=args.restart,
+    )
+    logger.info(f"Done: {scored} articles rescored")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+# backend/processor/search_index.py
+"""
+Index de recherche plein texte des articles.
+
+Un fichier SQLite à côté du dataset (`dataset.search.sqlite`) contient :
+- une table FTS5 (index inversé) sur le contenu des articles, classement bm25 ;
+- une table des métadonnées (lien, date UTC ISO, note) pour filtrer et
+  afficher les résultats sans relire le h5 ;
+- une table article -> crypto pour le filtre par crypto.
+
+L'index est alimenté par l'étage d'écriture du pipeline d'ingestion, au fil
+des batchs (cf. scraping/store_data.py). Le mode WAL permet à l'API de lire
+pendant que le worker d'ingestion écrit, y compris depuis un autre process.
+Un index absent est créé vide puis reconstruit en arrière-plan : les
+recherches lèvent IndexBuilding (503 côté API) jusqu'à la fin du build.
+
+Usage (reconstruction depuis le dataset, puis requête) :
+    python backend/processor/search_index.py --rebuild
+    python backend/processor/search_index.py --query "etf approval" --crypto btc
+"""
+import argparse
+import logging
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timezone
+
+# Ajoute backend/ au path pour importer le package processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor import dedup, h5_utilities
+from processor.crypto_registry import detect_cryptos
+from processor.date_parser import parse_date_with_context
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_DATASET = os.path.join(PROJECT_ROOT, "dataset")
+
+MAX_PAGE_SIZE = 100
+SNIPPET_TOKENS = 24
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    link TEXT NOT NULL UNIQUE,
+    date TEXT,
+    note REAL
+);
+CREATE INDEX IF NOT EXISTS articles_date ON articles(date);
+CREATE TABLE IF NOT EXISTS article_crypto (
+    id INTEGER NOT NULL,
+    crypto TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS article_crypto_crypto ON article_crypto(crypto, id);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    content, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_TERM_RE = re.compile(r"\w+\*?")
+
+class IndexBuilding(RuntimeError):
+    """L'index est en cours de reconstruction : réessayer plus tard."""
+
+def sidecar_path(datasetFileName):
+    return f"{datasetFileName}.search.sqlite"
+
+def to_utc_iso(date_str, link=None):
+    """Date de l'article en ISO UTC (comparable en chaîne), ou None si illisible."""
+    if not date_str:
+        return None
+    parsed = parse_date_with_context(date_str, link)
+    try:
+        dt = datetime.fromisoformat(parsed)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
+def parse_bound(value):
+    """Borne de filtre en ISO UTC ; ValueError si illisible (une comparaison brute de chaînes serait fausse)."""
+    iso = to_utc_iso(value)
+    if iso is None:
+        raise ValueError(f"Invalid date filter: {value!r}")
+    return iso
+
+def fts_query(text):
+    """
+    Requête utilisateur -> requête FTS5 : chaque mot est cité (pas d'erreur de
+    syntaxe sur la ponctuation), tous les mots sont requis, `mot*` garde la
+    recherche par préfixe.
+    """
+    terms = []
+    for term in _TERM_RE.findall(text or ""):
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if term:
+            terms.append(f'"{term}"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+def resolve_crypto(value):
+    """'btc', 'bitcoin' ou 'Bitcoin' -> 'Bitcoin' (nom du registre), sinon la valeur telle quelle."""
+    names = detect_cryptos(value)
+    return names[0] if names else value
+
+class SearchIndex:
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()  # une connexion par thread
+        self._write_lock = threading.Lock()
+        self.building = threading.Event()  # reconstruction en arrière-plan en cours
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---- Écriture ----
+    def _insert(self, conn, content, link, date, crypto, note):
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO articles(link, date, note) VALUES (?, ?, ?)",
+            (link, to_utc_iso(date, link), None if note is None else float(note)),
+        )
+        if cursor.rowcount == 0:  # déjà indexé
+            return False
+        rowid = cursor.lastrowid
+        conn.execute("INSERT INTO articles_fts(rowid, content) VALUES (?, ?)", (rowid, content))
+        conn.executemany(
+            "INSERT INTO article_crypto(id, crypto) VALUES (?, ?)",
+            [(rowid, name) for name in crypto if name],
+        )
+        return True
+
+    def add_articles(self, articles):
+        """
+        Indexe une liste d'articles (dicts du pipeline : content, url, date,
+        crypto, note) en une transaction. Les liens déjà indexés sont ignorés.
+        Retourne le nombre d'articles ajoutés.
+        """
+        added = 0
+        with self._write_lock:
+            conn = self._connect()
+            with conn:
+                for a in articles:
+                    added += self._insert(conn, a['content'], a['url'], a.get('date'), a.get('crypto') or [], a.get('note'))
+        return added
+
+    def update_notes(self, links, notes):
+        """
+        Met à jour la note des articles déjà indexés (re-scoring de la colonne
+        `note`). Les liens absents de l'index sont ignorés.
+        """
+        rows = [(None if note is None or math.isnan(note) else float(note), link) for link, note in zip(links, notes)]
+        with self._write_lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany("UPDATE articles SET note = ? WHERE link = ?", rows)
+
+    def rebuild(self, datasetFileName=DEFAULT_DATASET, chunk_size=2048):
+        """
+        Vide l'index puis le reconstruit en parcourant le dataset par tranches.
+        Le verrou d'écriture n'est tenu que le temps d'une tranche : l'étage
+        d'écriture peut indexer ses batchs pendant la reconstruction (les
+        liens déjà indexés sont ignorés).
+        """
+        conn = self._connect()
+        with self._write_lock, conn:
+            conn.execute("DELETE FROM articles")
+            conn.execute("DELETE FROM article_crypto")
+            conn.execute("DELETE FROM articles_fts")
+        if not h5_utilities.checkDatasetExist(datasetFileName):
+            return 0
+        with h5_utilities.openDatasetWithRetry(datasetFileName, 'r') as f:
+            total = f['content'].shape[0]
+            # La ligne de création du dataset n'est pas un article
+            first = 1 if f.attrs.get('placeholderContent', False) else 0
+        duplicates = dedup.duplicate_links(datasetFileName)
+        added = 0
+        columns = ('content', 'link', 'date', 'crypto', 'note')
+        for start in range(first, total, chunk_size):
+            rows = h5_utilities.getDatasetSlice(start, start + chunk_size, columns, datasetFileName)
+            with self._write_lock, conn:
+                for content, link, date, crypto, note in zip(*(rows[c] for c in columns)):
+                    if link in duplicates:
+                        continue
+                    added += self._insert(conn, content, link, date, crypto.split(","), note)
+        with self._write_lock, conn:
+            conn.execute("INSERT INTO articles_fts(articles_fts) VALUES ('optimize')")
+        logger.info(f"Search index rebuilt: {added} articles")
+        return added
+
+    def rebuild_in_background(self, datasetFileName=DEFAULT_DATASET):
+        """Lance rebuild() dans un thread ; `building` reste posé jusqu'à la fin."""
+        self.building.set()
+        def run():
+            try:
+                self.rebuild(datasetFileName)
+            except Exception:
+                logger.exception("Search index rebuild failed, run search_index.py --rebuild")
+            finally:
+                self.building.clear()
+        threading.Thread(target=run, name="search-index-rebuild", daemon=True).start()
+
+    # ---- Lecture ----
+    def search(self, query, crypto=None, date_from=None, date_to=None, limit=20, offset=0):
+        """
+        Articles correspondant à `query`, du plus pertinent au moins pertinent
+        (bm25), filtrés par crypto et par date (bornes ISO, incluses).
+        Retourne {"total": int, "results": [...]}. Lève ValueError si une
+        borne de date est illisible, IndexBuilding pendant une reconstruction.
+        """
+        if self.building.is_set():
+            raise IndexBuilding("Search index is building, retry later")
+        match = fts_query(query)
+        if not match:
+            return {"total": 0, "results": []}
+        where = ["articles_fts MATCH ?"]
+        params = [match]
+        if crypto:
+            where.append("a.id IN (SELECT id FROM article_crypto WHERE crypto = ?)")
+            params.append(resolve_crypto(crypto))
+        if date_from:
+            where.append("a.date >= ?")
+            params.append(parse_bound(date_from))
+        if date_to:
+            if len(date_to) == 10:  # 'AAAA-MM-JJ' : toute la journée est incluse
+                date_to += "T23:59:59.999999"
+            where.append("a.date <= ?")
+            params.append(parse_bound(date_to))
+        where_sql = " AND ".join(where)
+        base = f"FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid WHERE {where_sql}"
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+        conn = self._connect()
+        total = conn.execute(f"SELECT COUNT(*) {base}", params).fetchone()[0]
+        rows = conn.execute(
+            f"""SELECT a.id, a.link, a.date, a.note, bm25(articles_fts) AS rank,
+                       snippet(articles_fts, 0, '<b>', '</b>', '…', {SNIPPET_TOKENS}) AS snippet
+                {base} ORDER BY rank LIMIT ? OFFSET ?""",
+            params + [limit, max(0, int(offset))],
+        ).fetchall()
+
+        cryptos = {}
+        if rows:
+            ids = [row["id"] for row in rows]
+            placeholders = ",".join("?" * len(ids))
+            for id_, name in conn.execute(
+                f"SELECT id, crypto FROM article_crypto WHERE id IN ({placeholders})", ids
+            ):
+                cryptos.setdefault(id_, []).append(name)
+
+        results = [{
+            "link": row["link"],
+            "date": row["date"],
+            "crypto": cryptos.get(row["id"], []),
+            "sentiment": row["note"],
+            "score": -row["rank"],  # bm25 est négatif, plus petit = plus pertinent
+            "snippet": row["snippet"],
+        } for row in rows]
+        return {"total": total, "results": results}
+
+    def __len__(self):
+        return self._connect().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+# ==== Index partagé par dataset ====
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def get_index(datasetFileName=DEFAULT_DATASET, background=True) -> SearchIndex:
+    """
+    Ouvre l'index du dataset. S'il n'existe pas encore, il est créé vide et
+    reconstruit en arrière-plan (ou sur place si `background` est faux) :
+    l'appelant (requête /search, étage d'écriture) n'attend pas le build.
+    """
+    key = os.path.abspath(datasetFileName)
+    exists = True
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            path = sidecar_path(datasetFileName)
+            exists = os.path.exists(path)
+            index = _indexes[key] = SearchIndex(path)
+            if not exists and background:
+                index.rebuild_in_background(datasetFileName)
+    if not exists and not background:
+        index.rebuild(datasetFileName)
+    return index
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Full-text search index for dataset.h5")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET, help="Chemin du dataset sans l'extension .h5")
+    parser.add_argument("--rebuild", action="store_true", help="Reconstruit l'index depuis le dataset")
+    parser.add_argument("--query", default=None, help="Recherche à exécuter sur l'index")
+    parser.add_argument("--crypto", default=None)
+    parser.add_argument("--from", dest="date_from", default=None)
+    parser.add_argument("--to", dest="date_to", default=None)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    if args.rebuild:
+        index = SearchIndex(sidecar_path(args.dataset))
+        index.rebuild(args.dataset)
+    else:
+        index = get_index(args.dataset, background=False)
+    print(f"{len(index)} articles indexed")
+
+    if args.query:
+        found = index.search(args.query, args.crypto, args.date_from, args.date_to, args.limit)
+        print(f"{found['total']} results")
+        for result in found["results"]:
+            print(f"{result['score']:.2f}  {result['date']}  {result['sentiment']}  {result['link']}")
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,9 @@
 
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import torch
 from torch import nn
 from transformers import AutoTokenizer, AutoModel
@@ -31,36 +34,272 @@ class BertRegressor(nn.Module):
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 MODEL_DIR = os.path.join(BASE_DIR, "model", "output", "bert_sentiment_regression_v3")
 
-# Tokenizer local
-TOKENIZER = AutoTokenizer.from_pretrained(MODEL_DIR, local_files_only=True)
-
-# Modèle
-MODEL = BertRegressor(model_path=MODEL_DIR)
-MODEL.load_state_dict(
-    torch.load(os.path.join(MODEL_DIR, "pytorch_model.bin"), map_location="cpu")
-)
-MODEL.eval()
-
 # Device
 DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-MODEL.to(DEVICE)
+
+# Taille de batch par défaut pour l'inférence groupée
+BATCH_SIZE = 16
+
+# Graphes TorchScript figés par bucket de longueur (cf. compiled_model.py)
+SENTIMENT_COMPILED = os.environ.get("SENTIMENT_COMPILED", "0") == "1"
+
+# Mode de scoring des articles longs :
+# - "truncate" : on garde les 512 premiers tokens (comportement historique)
+# - "chunked"  : fenêtres glissantes courtes agrégées par moyenne pondérée
+SENTIMENT_MODE = os.environ.get("SENTIMENT_MODE", "truncate")
+# 256 correspond au max_length utilisé pour l'entraînement (training/)
+CHUNK_LENGTH = int(os.environ.get("SENTIMENT_CHUNK_LENGTH", "256"))
+CHUNK_OVERLAP = int(os.environ.get("SENTIMENT_CHUNK_OVERLAP", "32"))
+# Nombre maximum de tokens scorés par article en mode chunké
+TOKEN_BUDGET = int(os.environ.get("SENTIMENT_TOKEN_BUDGET", "2048"))
+
+def check_chunk_config(chunk_length=CHUNK_LENGTH, overlap=CHUNK_OVERLAP):
+    """Les fenêtres doivent avancer : 0 <= overlap < chunk_length."""
+    if not 0 <= overlap < chunk_length:
+        raise ValueError(
+            f"Invalid chunked sentiment config: overlap ({overlap}) must be >= 0 and smaller "
+            f"than chunk length ({chunk_length}) (SENTIMENT_CHUNK_OVERLAP / SENTIMENT_CHUNK_LENGTH)"
+        )
+
+# Vérifié au chargement : une mauvaise config échoue tout de suite, pas au premier article
+if SENTIMENT_MODE == "chunked":
+    check_chunk_config()
+
+# Le modèle par défaut est chargé au premier appel, pas à l'import
+_default_model = None
+_default_model_lock = threading.Lock()
+
+def load_model(model_dir: str = MODEL_DIR, device: torch.device = DEVICE, compiled: bool = SENTIMENT_COMPILED):
+    """
+    Charge le tokenizer et le BertRegressor d'un dossier de modèle local.
+    Retourne (tokenizer, model) prêts pour l'inférence. Avec `compiled`, le modèle
+    est remplacé par ses graphes TorchScript figés (mis en cache sur disque).
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model_dir, local_files_only=True)
+
+    model = BertRegressor(model_path=model_dir)
+    model.load_state_dict(
+        torch.load(os.path.join(model_dir, "pytorch_model.bin"), map_location="cpu")
+    )
+    model.eval()
+    model.to(device)
+
+    if compiled:
+        from processor.compiled_model import load_or_compile
+        model = load_or_compile(model, tokenizer, model_dir, device)
+    return tokenizer, model
+
+def model_device(model) -> torch.device:
+    """Device d'un BertRegressor ou d'un CompiledRegressor (sans paramètres)."""
+    device = getattr(model, "device", None)
+    if isinstance(device, torch.device):
+        return device
+    return next(model.parameters()).device
+
+def get_default_model():
+    """Retourne (tokenizer, model) pour MODEL_DIR, chargés une seule fois."""
+    global _default_model
+    if _default_model is None:
+        with _default_model_lock:
+            if _default_model is None:
+                _default_model = load_model(MODEL_DIR, DEVICE)
+    return _default_model
 
 def compute_sentiment(text: str) -> float:
     """
     Retourne un score de sentiment entre -1 et +1 basé sur le BERT entraîné.
     """
+    if SENTIMENT_MODE == "chunked":
+        return compute_sentiment_chunked_batch([text])[0]
+
+    tokenizer, model = get_default_model()
+
     # Tokenisation
-    enc = TOKENIZER(
+    enc = tokenizer(
         [text],
         truncation=True,
         padding=True,
         max_length=512,
         return_tensors="pt"
     )
-    enc = {k: v.to(DEVICE) for k, v in enc.items()}
+    enc = {k: v.to(model_device(model)) for k, v in enc.items()}
 
     # Inference
-    with torch.no_grad():
-        score = MODEL(**enc).cpu().item()
+    with torch.inference_mode():
+        score = model(**enc).cpu().item()
+
+    return score
+
+# ==== Inférence groupée avec tokenisation en pipeline ====
+# Longueurs de séquence sur lesquelles on aligne le padding : les buffers
+# d'entrée sont préalloués une fois par bucket puis réutilisés
+BUCKET_LENGTHS = (32, 64, 128, 192, 256, 384, 512)
+
+def bucket_for(length: int) -> int:
+    for bucket in BUCKET_LENGTHS:
+        if length <= bucket:
+            return bucket
+    return BUCKET_LENGTHS[-1]
+
+class InputBuffers:
+    """
+    Tenseurs d'entrée préalloués (pinned si CUDA) par bucket de longueur.
+    Deux slots par bucket : le thread de tokenisation remplit l'un pendant
+    que le modèle lit l'autre.
+    """
+    def __init__(self, batch_size: int, pin_memory: bool = False):
+        self.batch_size = batch_size
+        self.pin_memory = pin_memory
+        self._slots = {}
+
+    def get(self, bucket: int, slot: int) -> dict:
+        key = (bucket, slot)
+        if key not in self._slots:
+            self._slots[key] = {
+                name: torch.zeros((self.batch_size, bucket), dtype=torch.long, pin_memory=self.pin_memory)
+                for name in ("input_ids", "attention_mask", "token_type_ids")
+            }
+        return self._slots[key]
+
+# Un jeu de buffers par thread appelant, un thread de tokenisation par process
+_local = threading.local()
+_tokenizer_executor = None
+_tokenizer_executor_pid = None
+_tokenizer_executor_lock = threading.Lock()
+
+def _get_buffers(batch_size: int, pin_memory: bool) -> InputBuffers:
+    buffers = getattr(_local, "buffers", None)
+    if buffers is None or buffers.batch_size < batch_size or buffers.pin_memory != pin_memory:
+        buffers = InputBuffers(batch_size, pin_memory)
+        _local.buffers = buffers
+    return buffers
+
+def _get_tokenizer_executor() -> ThreadPoolExecutor:
+    global _tokenizer_executor, _tokenizer_executor_pid
+    with _tokenizer_executor_lock:
+        # Après un fork (pool d'inférence) le thread du parent n'existe plus
+        if _tokenizer_executor is None or _tokenizer_executor_pid != os.getpid():
+            _tokenizer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tokenizer")
+            _tokenizer_executor_pid = os.getpid()
+    return _tokenizer_executor
+
+def _tokenize_into(tokenizer, texts, buffers: InputBuffers, slot: int) -> dict:
+    """Tokenise `texts` et copie le résultat dans le slot du bucket correspondant."""
+    enc = tokenizer(
+        texts,
+        truncation=True,
+        padding=True,
+        max_length=512,
+        return_tensors="np"
+    )
+    n, length = enc["input_ids"].shape
+    buf = buffers.get(bucket_for(length), slot)
+
+    inputs = {}
+    for name, tensor in buf.items():
+        if name not in enc:
+            continue
+        tensor[:n].fill_(tokenizer.pad_token_id if name == "input_ids" else 0)
+        tensor[:n, :length].copy_(torch.from_numpy(enc[name]))
+        inputs[name] = tensor[:n]
+    return inputs
+
+def compute_sentiment_batch(texts, batch_size=BATCH_SIZE, tokenizer=None, model=None) -> list[float]:
+    """
+    Score une liste de textes par batchs et retourne les scores dans l'ordre d'entrée.
+    Les textes sont triés par longueur pour limiter le padding dans chaque batch, et
+    le batch k+1 est tokenisé en arrière-plan pendant le forward du batch k.
+    """
+    if SENTIMENT_MODE == "chunked":
+        return compute_sentiment_chunked_batch(texts, batch_size=batch_size, tokenizer=tokenizer, model=model)
+
+    if tokenizer is None or model is None:
+        tokenizer, model = get_default_model()
+    device = model_device(model)
+    pin_memory = device.type == "cuda"
+
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    batches = [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+    scores = [0.0] * len(texts)
+    if not batches:
+        return scores
+
+    buffers = _get_buffers(batch_size, pin_memory)
+    executor = _get_tokenizer_executor()
+
+    pending = executor.submit(_tokenize_into, tokenizer, [texts[i] for i in batches[0]], buffers, 0)
+    for k, idx in enumerate(batches):
+        enc = pending.result()
+        if k + 1 < len(batches):
+            # Le slot (k+1)%2 n'est plus lu : le forward k-1 est terminé
+            pending = executor.submit(_tokenize_into, tokenizer, [texts[i] for i in batches[k + 1]],
+                                      buffers, (k + 1) % 2)
+
+        enc = {name: t.to(device, non_blocking=pin_memory) for name, t in enc.items()}
+        with torch.inference_mode():
+            batch_scores = model(**enc).cpu().tolist()
+
+        for i, score in zip(idx, batch_scores):
+            scores[i] = float(score)
+
+    return scores
+
+# ==== Mode chunké pour les articles longs ====
+def max_chunks_for_budget(chunk_length=CHUNK_LENGTH, overlap=CHUNK_OVERLAP, token_budget=TOKEN_BUDGET) -> int:
+    """Nombre de fenêtres qui tiennent dans le budget de tokens (au moins une)."""
+    check_chunk_config(chunk_length, overlap)
+    if token_budget <= chunk_length:
+        return 1
+    return 1 + (token_budget - chunk_length) // (chunk_length - overlap)
+
+def compute_sentiment_chunked_batch(texts, chunk_length=CHUNK_LENGTH, overlap=CHUNK_OVERLAP,
+                                    token_budget=TOKEN_BUDGET, batch_size=BATCH_SIZE,
+                                    tokenizer=None, model=None) -> list[float]:
+    """
+    Découpe chaque article en fenêtres de `chunk_length` tokens qui se chevauchent
+    de `overlap` tokens, score toutes les fenêtres ensemble puis agrège par
+    article avec une moyenne pondérée par le nombre de tokens de chaque fenêtre.
+    Au plus `token_budget` tokens sont scorés par article.
+    """
+    if tokenizer is None or model is None:
+        tokenizer, model = get_default_model()
+    device = model_device(model)
+    if not texts:
+        return []
+
+    max_chunks = max_chunks_for_budget(chunk_length, overlap, token_budget)
+    # Inutile de tokeniser au-delà du budget (large marge de caractères par token)
+    max_chars = token_budget * 8
+    enc = tokenizer(
+        [t[:max_chars] for t in texts],
+        truncation=True,
+        padding=True,
+        max_length=chunk_length,
+        stride=overlap,
+        return_overflowing_tokens=True,
+        return_tensors="pt"
+    )
+    sample_mapping = enc.pop("overflow_to_sample_mapping")
+
+    # Application du budget : on garde les premières fenêtres de chaque article
+    kept, per_sample = [], {}
+    for row, sample in enumerate(sample_mapping.tolist()):
+        if per_sample.get(sample, 0) < max_chunks:
+            per_sample[sample] = per_sample.get(sample, 0) + 1
+            kept.append(row)
+    kept = torch.tensor(kept, dtype=torch.long)
+    sample_mapping = sample_mapping[kept]
+    enc = {name: t[kept] for name, t in enc.items()}
+
+    chunk_scores = []
+    for start in range(0, len(kept), batch_size):
+        batch = {name: t[start:start + batch_size].to(device) for name, t in enc.items()}
+        with torch.inference_mode():
+            chunk_scores.append(model(**batch).cpu())
+    chunk_scores = torch.cat(chunk_scores)
 
-    return score
\ No newline at end of file
+    # Moyenne pondérée par la longueur réelle (hors padding) de chaque fenêtre
+    weights = enc["attention_mask"].sum(dim=1).float()
+    totals = torch.zeros(len(texts)).index_add_(0, sample_mapping, chunk_scores * weights)
+    norms = torch.zeros(len(texts)).index_add_(0, sample_mapping, weights)
+    return (totals / norms.clamp(min=1.0)).tolist()
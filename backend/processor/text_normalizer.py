@@ -0,0 +1,114 @@
+# backend/processor/text_normalizer.py
+"""
+Normalisation du contenu des articles avant détection, déduplication et scoring.
+
+Tout est préparé une fois à l'import : table de traduction qui supprime les
+emojis (plages Unicode) et ramène les caractères d'espacement à une espace,
+regex des paragraphes de boilerplate (disclaimers, invitations à suivre le
+site...). `normalize` applique le tout à un texte, `normalize_batch` à une
+liste. `hash_form` donne une forme stable (casse, ponctuation, espaces) pour
+les empreintes de déduplication.
+"""
+import re
+import unicodedata
+
+# Plages de codepoints emoji : pictogrammes, drapeaux, modificateurs, et dans
+# les blocs de symboles seulement les caractères affichés en emoji par défaut
+# (Emoji_Presentation, cf. emoji-data.txt d'Unicode). Les symboles texte
+# (✓, ⌘, ★, flèches, symboles mathématiques...) restent dans le contenu.
+EMOJI_RANGES = [
+    (0x1F000, 0x1FAFF),  # Mahjong, cartes, pictogrammes, émoticônes, transport, symboles étendus
+    (0x231A, 0x231B),    # ⌚ ⌛
+    (0x23E9, 0x23EC),    # ⏩ ⏪ ⏫ ⏬
+    (0x23F0, 0x23F0),    # ⏰
+    (0x23F3, 0x23F3),    # ⏳
+    (0x25FD, 0x25FE),    # ◽ ◾
+    (0x2614, 0x2615),    # ☔ ☕
+    (0x2648, 0x2653),    # Signes du zodiaque
+    (0x267F, 0x267F),    # ♿
+    (0x2693, 0x2693),    # ⚓
+    (0x26A1, 0x26A1),    # ⚡
+    (0x26AA, 0x26AB),    # ⚪ ⚫
+    (0x26BD, 0x26BE),    # ⚽ ⚾
+    (0x26C4, 0x26C5),    # ⛄ ⛅
+    (0x26CE, 0x26CE),    # ⛎
+    (0x26D4, 0x26D4),    # ⛔
+    (0x26EA, 0x26EA),    # ⛪
+    (0x26F2, 0x26F3),    # ⛲ ⛳
+    (0x26F5, 0x26F5),    # ⛵
+    (0x26FA, 0x26FA),    # ⛺
+    (0x26FD, 0x26FD),    # ⛽
+    (0x2705, 0x2705),    # ✅
+    (0x270A, 0x270B),    # ✊ ✋
+    (0x2728, 0x2728),    # ✨
+    (0x274C, 0x274C),    # ❌
+    (0x274E, 0x274E),    # ❎
+    (0x2753, 0x2755),    # ❓ ❔ ❕
+    (0x2757, 0x2757),    # ❗
+    (0x2795, 0x2797),    # ➕ ➖ ➗
+    (0x27B0, 0x27B0),    # ➰
+    (0x27BF, 0x27BF),    # ➿
+    (0x2B1B, 0x2B1C),    # ⬛ ⬜
+    (0x2B50, 0x2B50),    # ⭐
+    (0x2B55, 0x2B55),    # ⭕
+    (0x1F1E6, 0x1F1FF),  # Indicateurs régionaux (drapeaux)
+    (0xE0020, 0xE007F),  # Tags (drapeaux de sous-régions)
+    (0xFE00, 0xFE0F),    # Sélecteurs de variante
+    (0x200D, 0x200D),    # Zero width joiner
+    (0x20E3, 0x20E3),    # Keycap
+]
+# Symbole texte suivi du sélecteur d'emoji VS16 (❤️, ☀️, ⚠️, ©️...) : affiché
+# en emoji, il est retiré avec son sélecteur
+EMOJI_VS16_RE = re.compile("[\u00a9\u00ae\u203c-\u3299]\ufe0f")
+
+def _build_table():
+    table = {}
+    for start, stop in EMOJI_RANGES:
+        for codepoint in range(start, stop + 1):
+            table[codepoint] = None
+    # Espaces, retours à la ligne et espaces insécables -> espace simple
+    for char in "\n\r\t\f\v\u00a0\u2007\u202f\u3000":
+        table[ord(char)] = " "
+    return table
+
+TRANSLATION_TABLE = _build_table()
+EMOJI_ONLY_TABLE = {k: v for k, v in TRANSLATION_TABLE.items() if v is None}
+
+# Paragraphes de boilerplate en fin d'article (une ligne = un paragraphe)
+BOILERPLATE_RE = re.compile(
+    r"^[ \t]*(?:(?:disclosure|disclaimer|read more|also read|related)\s*:|follow us on\b|"
+    r"subscribe to our\b|join our\b|this article (?:is|was) (?:for informational|sponsored)\b).*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+SPACES_RE = re.compile(r" {2,}")
+NON_WORD_RE = re.compile(r"[\W_]+")
+
+def strip_emojis(text):
+    """Supprime les emojis d'un texte, sans autre transformation."""
+    if not isinstance(text, str):
+        return text
+    return EMOJI_VS16_RE.sub("", text).translate(EMOJI_ONLY_TABLE)
+
+def normalize(text):
+    """
+    Forme normalisée du contenu : Unicode NFKC, boilerplate retiré, emojis
+    supprimés, espaces (dont retours à la ligne) réduits à une seule espace.
+    """
+    if not isinstance(text, str):
+        return text
+    text = unicodedata.normalize("NFKC", text)
+    # Avant la traduction : les paragraphes sont encore séparés par des retours à la ligne
+    text = BOILERPLATE_RE.sub("", text)
+    text = EMOJI_VS16_RE.sub("", text).translate(TRANSLATION_TABLE)
+    return SPACES_RE.sub(" ", text).strip()
+
+def normalize_batch(texts):
+    return [normalize(text) for text in texts]
+
+def hash_form(text):
+    """
+    Forme stable pour le hachage et la déduplication : normalisée, en
+    minuscules (casefold), ponctuation remplacée par des espaces.
+    """
+    text = normalize(text) or ""
+    return NON_WORD_RE.sub(" ", text.casefold()).strip()
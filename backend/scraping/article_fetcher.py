@@ -0,0 +1,130 @@
+# article_fetcher.py
+"""
+Récupération des pages d'articles en HTTP simple, sans navigateur.
+
+Les pages d'articles sont du HTML statique : Selenium ne sert qu'à découvrir les
+liens sur les pages de listing (scroll infini). La date et le contenu sont
+extraits avec des sélecteurs CSS compilés une seule fois par source.
+"""
+import logging
+import sys
+import os
+import time
+from urllib.parse import urlparse
+
+import requests
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Ajouter le chemin parent pour importer le module processor
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processor import metrics
+from processor.date_parser import parse_date_with_context
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+
+# Sélecteurs par source : les mêmes que ceux utilisés avec Selenium
+EXTRACTORS = {
+    "crypto.news": {
+        "date": CSSSelector(".post-detail__date"),
+        "content": CSSSelector("div.post-detail__container p"),
+        "missing_date": 'Date non trouvée',
+    },
+    "u.today": {
+        "date": CSSSelector(".article__short-date"),
+        "content": CSSSelector("div.article__content p"),
+        "missing_date": None,
+    },
+}
+
+def source_for_url(url):
+    """Retourne la clé d'EXTRACTORS correspondant à l'hôte de l'URL, ou None."""
+    host = urlparse(url).netloc.lower()
+    for source in EXTRACTORS:
+        if host == source or host.endswith("." + source):
+            return source
+    return None
+
+def parse_article(page, url):
+    """
+    Extrait {'url', 'date', 'content'} du HTML d'un article.
+    Même format que les générateurs stream_articles des scrapers.
+    """
+    source = source_for_url(url)
+    if source is None:
+        raise ValueError(f"No extractor for {url}")
+    extractor = EXTRACTORS[source]
+
+    doc = lxml_html.fromstring(page)
+    dates = extractor["date"](doc)
+    raw_date = dates[0].text_content().strip() if dates else ""
+    paras = [p.text_content().strip() for p in extractor["content"](doc)]
+    content = '\n'.join(p for p in paras if p)
+
+    if raw_date:
+        date = parse_date_with_context(raw_date, url)
+    else:
+        date = extractor["missing_date"]
+
+    return {'url': url, 'date': date, 'content': content}
+
+class ArticleFetcher:
+    """Client HTTP avec pool de connexions keep-alive et retries sur erreurs transitoires."""
+
+    def __init__(self, pool_size=10, timeout=15, retries=3):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        retry = Retry(
+            total=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET",),
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def fetch(self, url):
+        """Télécharge et parse un article. Retourne None en cas d'échec."""
+        source = metrics.source_name(source_for_url(url))
+        try:
+            started = time.perf_counter()
+            resp = self.session.get(url, timeout=self.timeout)
+            resp.raise_for_status()
+            loaded = time.perf_counter()
+            metrics.PAGE_LOAD_SECONDS.labels(source, "article").observe(loaded - started)
+            article = parse_article(resp.content, url)
+            metrics.EXTRACTION_SECONDS.labels(source).observe(time.perf_counter() - loaded)
+            return article
+        except Exception as e:
+            logger.warning(f"Failed to fetch article {url}: {e}")
+            metrics.ARTICLES_FAILED.labels(source, "fetch").inc()
+            return None
+
+    def close(self):
+        self.session.close()
+
+if __name__ == '__main__':
+    fetcher = ArticleFetcher()
+    try:
+        for url in sys.argv[1:]:
+            article = fetcher.fetch(url)
+            if article:
+                print(f"URL: {article['url']}")
+                print(f"Date: {article['date']}")
+                print(f"Extrait: {article['content'][:200]}…")
+                print('---')
+    finally:
+        fetcher.close()
@@ -0,0 +1,205 @@
+# async_fetcher.py
+"""
+Téléchargement concurrent des articles avec asyncio.
+
+Les URLs découvertes sur une page de listing sont récupérées jusqu'à N à la fois
+par hôte, avec un pool de connexions partagé, une limite de débit par hôte
+(token bucket), des timeouts et des retries avec backoff exponentiel. Les
+articles sont produits dans l'ordre des URLs, au même format que les
+générateurs stream_articles : {'url', 'date', 'content'}.
+"""
+import asyncio
+import logging
+import queue
+import random
+import sys
+import os
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlparse
+
+import aiohttp
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processor import metrics
+from scraping.article_fetcher import USER_AGENT, parse_article, source_for_url
+
+logger = logging.getLogger(__name__)
+
+# Limites par source, pour rester poli avec crypto.news et U.Today
+SOURCE_LIMITS = {
+    "crypto.news": {"concurrency": 4, "rate": 2.0, "burst": 4},
+    "u.today":     {"concurrency": 4, "rate": 2.0, "burst": 4},
+}
+DEFAULT_LIMITS = {"concurrency": 2, "rate": 1.0, "burst": 2}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Articles prêts d'avance au plus dans le pont synchrone : au-delà, la boucle
+# asyncio attend que le scraper consomme
+RESULT_BUFFER = 16
+
+class TokenBucket:
+    """
+    Token bucket par réservation : chaque appel réserve un jeton et attend le
+    temps nécessaire. Indépendant de la boucle asyncio, donc réutilisable
+    d'un batch à l'autre.
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class AsyncArticleFetcher:
+    def __init__(self, timeout=15, retries=3, backoff=0.5, limits=None):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.limits = limits or SOURCE_LIMITS
+        self._buckets = {}
+
+    def _limits_for(self, host):
+        source = source_for_url("https://" + host)
+        return self.limits.get(source, DEFAULT_LIMITS)
+
+    def _bucket_for(self, host):
+        if host not in self._buckets:
+            limits = self._limits_for(host)
+            self._buckets[host] = TokenBucket(limits["rate"], limits["burst"])
+        return self._buckets[host]
+
+    async def _fetch_one(self, session, semaphores, url):
+        host = urlparse(url).netloc.lower()
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(self._limits_for(host)["concurrency"])
+
+        source = metrics.source_name(source_for_url(url))
+        for attempt in range(self.retries + 1):
+            await self._bucket_for(host).acquire()
+            try:
+                async with semaphores[host]:
+                    started = time.perf_counter()
+                    async with session.get(url) as resp:
+                        if resp.status in RETRY_STATUSES:
+                            raise aiohttp.ClientResponseError(
+                                resp.request_info, resp.history, status=resp.status, message=resp.reason
+                            )
+                        resp.raise_for_status()
+                        page = await resp.read()
+                    loaded = time.perf_counter()
+                metrics.PAGE_LOAD_SECONDS.labels(source, "article").observe(loaded - started)
+                article = parse_article(page, url)
+                metrics.EXTRACTION_SECONDS.labels(source).observe(time.perf_counter() - loaded)
+                return article
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt == self.retries:
+                    logger.warning(f"Failed to fetch article {url} after {attempt + 1} attempts: {e}")
+                    metrics.ARTICLES_FAILED.labels(source, "fetch").inc()
+                    return None
+                # Backoff exponentiel avec jitter
+                await asyncio.sleep(self.backoff * 2 ** attempt + random.uniform(0, self.backoff))
+            except Exception as e:
+                logger.warning(f"Failed to parse article {url}: {e}")
+                metrics.ARTICLES_FAILED.labels(source, "fetch").inc()
+                return None
+
+    async def fetch_many(self, urls):
+        """Générateur asynchrone : télécharge tout en parallèle, produit dans l'ordre des URLs."""
+        connector = aiohttp.TCPConnector(limit=64, ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        headers = {"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"}
+        semaphores = {}
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            tasks = [asyncio.ensure_future(self._fetch_one(session, semaphores, url)) for url in urls]
+            try:
+                for task in tasks:
+                    article = await task
+                    if article is not None:
+                        yield article
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def fetch(self, urls):
+        """
+        Pont synchrone pour les scrapers : la boucle asyncio tourne dans un thread
+        dédié et les articles sont produits au fur et à mesure, dans l'ordre, via
+        une file bornée. Si le générateur est fermé avant la fin (lien déjà
+        connu), les téléchargements en cours sont annulés.
+        """
+        results = queue.Queue(maxsize=RESULT_BUFFER)
+        ready = Future()
+        stop = threading.Event()
+        done = object()
+
+        async def put(item):
+            # File pleine : attendre le scraper sans bloquer la boucle
+            while not stop.is_set():
+                try:
+                    results.put_nowait(item)
+                    return
+                except queue.Full:
+                    await asyncio.sleep(0.05)
+
+        async def pump():
+            ready.set_result((asyncio.get_running_loop(), asyncio.current_task()))
+            try:
+                async for article in self.fetch_many(urls):
+                    await put(article)
+            finally:
+                await put(done)
+
+        def run():
+            try:
+                asyncio.run(pump())
+            except asyncio.CancelledError:
+                pass  # arrêt demandé par le consommateur
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        loop, task = ready.result()
+        try:
+            while True:
+                article = results.get()
+                if article is done:
+                    break
+                yield article
+        finally:
+            # Le consommateur peut s'arrêter avant la fin : asyncio.run annule
+            # alors les téléchargements restants et ferme la session
+            stop.set()
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # boucle déjà terminée
+
+    def close(self):
+        pass
+
+if __name__ == '__main__':
+    fetcher = AsyncArticleFetcher()
+    started = time.perf_counter()
+    for article in fetcher.fetch(sys.argv[1:]):
+        print(f"URL: {article['url']}")
+        print(f"Date: {article['date']}")
+        print(f"Extrait: {article['content'][:200]}…")
+        print('---')
+    print(f"{len(sys.argv) - 1} URLs in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,272 @@
+# backend/scraping/backfill.py
+"""
+Remplissage de l'historique d'une source en parallèle, avec reprise.
+
+Les pages d'archive de la source (pagination côté serveur, sans navigateur) sont
+découpées en plages de pages traitées par plusieurs workers. Les articles
+passent par le pipeline d'ingestion (écriture par batch) et les liens déjà
+présents dans le dataset (ou quasi-doublons d'un article stocké) sont ignorés. Une plage n'est marquée terminée dans le
+checkpoint qu'une fois tous ses articles écrits : après un crash, seules les
+plages incomplètes sont reprises.
+
+Usage :
+    python backend/scraping/backfill.py --source cryptoNews --pages 500 --workers 8
+    python backend/scraping/backfill.py --source uToday --pages 2000 --since 2025-01-01
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+# Ajoute backend/ au path pour importer les packages scraping et processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor import h5_utilities, dedup
+from processor.crypto_registry import mentions_crypto
+from scraping import ingest_pipeline, store_data
+from scraping.article_fetcher import ArticleFetcher
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_DATASET = os.path.join(PROJECT_ROOT, "dataset")
+
+# Pages d'archive par source : URL de la page N et sélecteur des liens d'articles
+ARCHIVES = {
+    "cryptoNews": {
+        "page_url": "https://crypto.news/markets/page/{page}/",
+        "link": CSSSelector("a.post-loop__media-link"),
+    },
+    "uToday": {
+        "page_url": "https://u.today/latest-cryptocurrency-news?page={page}",
+        "link": CSSSelector("a.news__item-body"),
+    },
+}
+
+RANGE_SIZE = 10
+
+# ==== Checkpoint ====
+def checkpoint_path(datasetFileName, source):
+    return f"{datasetFileName}.backfill_{source}.json"
+
+def load_checkpoint(datasetFileName, source):
+    """Retourne l'ensemble des pages déjà traitées pour la source."""
+    path = checkpoint_path(datasetFileName, source)
+    if not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        return set(json.load(f).get("done_pages", []))
+
+def save_checkpoint(datasetFileName, source, done_pages):
+    path = checkpoint_path(datasetFileName, source)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"source": source, "done_pages": sorted(done_pages)}, f)
+    # Remplacement atomique : un crash ne laisse jamais un checkpoint à moitié écrit
+    os.replace(tmp, path)
+
+def existing_links(datasetFileName):
+    """Liens déjà présents dans le dataset (lecture de la seule colonne link)."""
+    if not h5_utilities.checkDatasetExist(datasetFileName):
+        return set()
+    return set(h5_utilities.getDatasetSlice(0, None, ('link',), datasetFileName)['link'])
+
+def _parse_iso(date):
+    try:
+        dt = datetime.fromisoformat(date)
+    except (TypeError, ValueError):
+        return None
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+class Backfill:
+    def __init__(self, source, pages, range_size=RANGE_SIZE, workers=4, datasetFileName=DEFAULT_DATASET,
+                 since=None, restart=False):
+        """
+        pages : nombre de pages d'archive à parcourir (1..pages).
+        since : date (aware) en dessous de laquelle on arrête de remonter l'archive.
+        """
+        if source not in ARCHIVES:
+            raise ValueError(f"No archive configured for {source}")
+        self.source = source
+        self.archive = ARCHIVES[source]
+        self.pages = pages
+        self.range_size = range_size
+        self.workers = workers
+        self.datasetFileName = datasetFileName
+        self.since = since
+
+        self.done_pages = set() if restart else load_checkpoint(datasetFileName, source)
+        self.seen = existing_links(datasetFileName)
+        self.fetcher = ArticleFetcher(pool_size=workers * 2)
+
+        self._lock = threading.Lock()
+        self._pending = {}        # plage -> nombre d'articles pas encore écrits
+        self._fetched = {}        # plage parcourue -> pages effectivement visitées
+        self._range_of = {}       # url -> plage
+        self._oldest_page = None  # première page entièrement antérieure à `since`
+        self._queue = queue.Queue(maxsize=store_data.PIPELINE_QUEUE_SIZE)
+
+    def ranges(self):
+        """Plages de pages restant à traiter."""
+        result = []
+        for start in range(1, self.pages + 1, self.range_size):
+            pages = range(start, min(start + self.range_size, self.pages + 1))
+            if not all(p in self.done_pages for p in pages):
+                result.append((pages.start, pages.stop))
+        return result
+
+    # ---- Fetch (workers) ----
+    def _listing(self, page):
+        """Retourne [(url, titre)] de la page d'archive, [] si la page n'existe pas."""
+        url = self.archive["page_url"].format(page=page)
+        resp = self.fetcher.session.get(url, timeout=self.fetcher.timeout)
+        if resp.status_code == 404:
+            return []
+        resp.raise_for_status()
+        doc = lxml_html.fromstring(resp.content)
+        return [(a.get("href"), a.text_content().strip()) for a in self.archive["link"](doc)]
+
+    def _claim(self, url, key):
+        with self._lock:
+            if url in self.seen:
+                return False
+            self.seen.add(url)
+            self._range_of[url] = key
+            self._pending[key] = self._pending.get(key, 0) + 1
+            return True
+
+    def _fetch_range(self, key):
+        start, stop = key
+        with self._lock:
+            self._pending.setdefault(key, 0)
+        visited = []
+        for page in range(start, stop):
+            if self._oldest_page is not None and page > self._oldest_page:
+                break
+            links = self._listing(page)
+            if not links:
+                break
+            visited.append(page)
+            dates = []
+            for url, title in links:
+                if not url or not mentions_crypto(title):
+                    continue
+                if not self._claim(url, key):
+                    continue
+                article = self.fetcher.fetch(url)
+                if article is None:
+                    # La plage reste incomplète : elle sera reprise au prochain lancement
+                    continue
+                dates.append(_parse_iso(article['date']))
+                self._queue.put(article)
+            # Page entièrement plus ancienne que `since` : inutile d'aller plus loin
+            if self.since is not None and dates and all(d is not None and d < self.since for d in dates):
+                with self._lock:
+                    if self._oldest_page is None or page < self._oldest_page:
+                        self._oldest_page = page
+                break
+        with self._lock:
+            self._fetched[key] = visited
+        self._maybe_complete(key)
+
+    # ---- Suivi des plages ----
+    def _written(self, articles):
+        """Appelé par l'étage d'écriture : décompte les articles écrits par plage."""
+        keys = set()
+        with self._lock:
+            for article in articles:
+                key = self._range_of.pop(article['url'], None)
+                if key is not None:
+                    self._pending[key] -= 1
+                    keys.add(key)
+        for key in keys:
+            self._maybe_complete(key)
+
+    def _maybe_complete(self, key):
+        with self._lock:
+            if key not in self._fetched or self._pending.get(key):
+                return
+            # Seules les pages visitées sont marquées : un --since plus ancien
+            # ou une archive plus longue les reprendra plus tard
+            self.done_pages.update(self._fetched.pop(key))
+            self._pending.pop(key, None)
+            save_checkpoint(self.datasetFileName, self.source, self.done_pages)
+        logger.info(f"{self.source}: pages {key[0]}-{key[1] - 1} done")
+
+    # ---- Orchestration ----
+    def _articles(self, futures):
+        """Source du pipeline : articles produits par les workers, jusqu'à leur fin."""
+        while True:
+            try:
+                yield self._queue.get(timeout=0.5)
+            except queue.Empty:
+                if all(f.done() for f in futures) and self._queue.empty():
+                    return
+
+    def run(self):
+        """Lance le backfill et retourne le nombre d'articles écrits."""
+        todo = self.ranges()
+        logger.info(f"Backfilling {self.source}: {len(todo)} page range(s) with {self.workers} worker(s)")
+        started_at = time.time()
+
+        pipeline = store_data.build_pipeline(f"backfill-{self.source}", self.datasetFileName,
+                                             on_written=self._written)
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f"backfill-{self.source}")
+        try:
+            futures = [executor.submit(self._fetch_range, key) for key in todo]
+            try:
+                stats = pipeline.run(self._articles(futures))
+            except ingest_pipeline.PipelineError as e:
+                # Les plages dont des articles n'ont pas été écrits restent incomplètes
+                logger.error(f"{e} (incomplete ranges will be retried on next run)")
+                stats = e.stats
+            for future in futures:
+                if future.exception() is not None:
+                    logger.error(f"Backfill range failed (will be retried on next run): {future.exception()}")
+        finally:
+            executor.shutdown(wait=True)
+            self.fetcher.close()
+            near_duplicates = dedup.get_index(self.datasetFileName)
+            near_duplicates.release(self.seen)
+            near_duplicates.save()
+
+        written = stats["write"]["emitted"]
+        rate = written / max(time.time() - started_at, 1e-6)
+        logger.info(f"{self.source}: {written} articles written ({rate:.1f} articles/s)")
+        return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill dataset.h5 from a source's archive pages")
+    parser.add_argument("--source", required=True, choices=sorted(ARCHIVES))
+    parser.add_argument("--pages", type=int, required=True, help="Nombre de pages d'archive à parcourir")
+    parser.add_argument("--range-size", type=int, default=RANGE_SIZE, help="Pages par plage (unité de checkpoint)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--since", default=None, help="Ne pas remonter avant cette date (YYYY-MM-DD)")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET, help="Chemin du dataset sans l'extension .h5")
+    parser.add_argument("--restart", action="store_true", help="Ignore le checkpoint et repart de zéro")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    since = datetime.fromisoformat(args.since).replace(tzinfo=timezone.utc) if args.since else None
+    backfill = Backfill(
+        source=args.source,
+        pages=args.pages,
+        range_size=args.range_size,
+        workers=args.workers,
+        datasetFileName=args.dataset,
+        since=since,
+        restart=args.restart,
+    )
+    backfill.run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# base_scraper.py
+"""
+Partie commune des scrapers de listing (crypto.news, U.Today) : driver Chrome
+paresseux, fetch des articles (HTTP, async ou navigateur) et découverte par
+flux RSS. Chaque scraper fournit SOURCE, `_fetch_with_browser(url)` et
+`_stream_from_listing()`.
+"""
+import os
+
+from processor.crypto_registry import mentions_crypto
+from scraping.article_fetcher import ArticleFetcher
+from scraping.async_fetcher import AsyncArticleFetcher
+from scraping import browser_profile
+from scraping.browser_pool import create_driver
+from scraping.feed_discovery import FeedDiscovery
+
+# "http" : Selenium ne sert qu'au listing, les articles sont récupérés en HTTP
+# "async" : comme "http", mais les articles d'une page sont téléchargés en parallèle
+# "browser" : chaque article est ouvert dans un onglet Chrome (ancien mode)
+FETCH_MODE = os.environ.get("SCRAPER_FETCH_MODE", "http")
+
+# "feed" : nouveaux liens lus dans le flux RSS, scroll seulement en complément
+# "scroll" : scroll infini de la page de listing (ancien mode, backfill)
+DISCOVERY_MODE = os.environ.get("SCRAPER_DISCOVERY", "feed")
+
+class BaseScraper:
+    # Nom de la source (clé des allowlists du profil navigateur et des flux)
+    SOURCE = None
+    # Dates rendues par `_fetch_with_browser` quand la page n'en donne pas
+    MISSING_DATES = (None,)
+
+    def __init__(self, headless=True, max_articles=-1, fetch_mode=FETCH_MODE,
+                 driver_provider=None, discovery=DISCOVERY_MODE):
+        self.headless = headless
+        self.max_articles = max_articles
+        self.fetch_mode = fetch_mode
+        self.scraped = 0
+        self.seen_links = set()
+        if fetch_mode == "async":
+            self.fetcher = AsyncArticleFetcher()
+        elif fetch_mode == "http":
+            self.fetcher = ArticleFetcher()
+        else:
+            self.fetcher = None
+        self.discovery = discovery
+        self.feed = FeedDiscovery(self.SOURCE) if discovery == "feed" else None
+        # Le driver n'est créé qu'au premier usage : en mode feed, Chrome n'est
+        # lancé que si le scroll doit prendre le relais. Un driver emprunté via
+        # `driver_provider` (pool de navigateurs) n'est pas fermé par le scraper.
+        self._driver = None
+        self._driver_provider = driver_provider
+        self.owns_driver = False
+        self.page_loads = 0
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            if self._driver_provider is not None:
+                self._driver = self._driver_provider()
+            else:
+                self._driver = self._init_driver()
+                self.owns_driver = True
+        return self._driver
+
+    def _init_driver(self):
+        return create_driver(self.headless, self.SOURCE)
+
+    def _fetch_with_browser(self, url):
+        raise NotImplementedError
+
+    def _stream_from_listing(self):
+        raise NotImplementedError
+
+    def _record_page_stats(self, kind):
+        """Mesures réseau de la page qui vient d'être chargée (profil allégé uniquement)."""
+        if browser_profile.LEAN_PROFILE:
+            browser_profile.record_page_stats(self.SOURCE, self.driver, kind)
+
+    def _fetch_many(self, urls):
+        if self.fetch_mode == "async":
+            yield from self.fetcher.fetch(urls)
+            return
+        for url in urls:
+            article = self.fetcher.fetch(url) if self.fetcher is not None else self._fetch_with_browser(url)
+            if article is not None:
+                yield article
+
+    def _stream_from_feed(self):
+        entries = self.feed.discover()
+        urls, published = [], {}
+        for entry in entries:
+            if 0 <= self.max_articles <= self.scraped + len(urls):
+                break
+            if not mentions_crypto(entry['title']):
+                self.feed.mark_seen(entry['url'])
+                continue
+            if entry['url'] in self.seen_links:
+                continue
+            self.seen_links.add(entry['url'])
+            urls.append(entry['url'])
+            published[entry['url']] = entry['published']
+
+        for article in self._fetch_many(urls):
+            # Date du flux si la page n'en donne pas
+            if article['date'] in self.MISSING_DATES and published.get(article['url']):
+                article['date'] = published[article['url']]
+            yield article
+            self.scraped += 1
+
+    def stream_articles(self):
+        """
+        Générateur qui yield dicts: {'url': ..., 'date': ..., 'content': ...}
+        Les articles rendus ne sont marqués vus dans le flux qu'une fois
+        traités par l'appelant (cf. mark_handled).
+        """
+        if self.feed is not None:
+            yield from self._stream_from_feed()
+            if not self.feed.needs_backfill:
+                return
+        yield from self._stream_from_listing()
+
+    def mark_handled(self, urls):
+        """
+        Marque des articles comme traités (écrits ou écartés) : ils ne seront
+        plus proposés par le flux. Les autres reviennent au prochain cycle.
+        """
+        if self.feed is None:
+            return
+        for url in urls:
+            self.feed.mark_seen(url)
+
+    def close(self):
+        if self.feed is not None:
+            self.feed.save()
+            self.feed.close()
+        if self.fetcher is not None:
+            self.fetcher.close()
+        if self._driver is not None:
+            if browser_profile.LEAN_PROFILE:
+                # Requêtes du scroll depuis la dernière page mesurée : pas une page de plus
+                browser_profile.record_page_stats(self.SOURCE, self._driver, new_page=False)
+            if self.owns_driver:
+                self._driver.quit()
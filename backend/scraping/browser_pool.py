@@ -0,0 +1,164 @@
+# browser_pool.py
+"""
+Pool de navigateurs Chrome headless réutilisés d'un cycle de scraping à l'autre.
+
+Lancer un nouveau Chrome à chaque cycle coûte cher (démarrage + mémoire). Le pool
+garde des drivers chauds par source, les recycle après N chargements de page ou
+au-delà d'un seuil de RSS, et remplace les drivers plantés.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import psutil
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+
+from scraping import browser_profile
+
+logger = logging.getLogger(__name__)
+
+# Recyclage d'un driver après ce nombre de pages chargées...
+MAX_PAGE_LOADS = int(os.environ.get("BROWSER_MAX_PAGE_LOADS", "200"))
+# ...ou si Chrome (avec ses process enfants) dépasse cette mémoire
+MAX_RSS_MB = int(os.environ.get("BROWSER_MAX_RSS_MB", "1500"))
+
+def build_chrome_options(headless=True, lean=browser_profile.LEAN_PROFILE):
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--log-level=3")
+    if lean:
+        browser_profile.apply_lean_options(chrome_options)
+    return chrome_options
+
+def create_driver(headless=True, source=None, lean=browser_profile.LEAN_PROFILE):
+    driver = webdriver.Chrome(options=build_chrome_options(headless, lean))
+    if lean:
+        browser_profile.install_request_blocking(driver, source)
+    return driver
+
+class PooledDriver:
+    def __init__(self, source, driver):
+        self.source = source
+        self.driver = driver
+        self.page_loads = 0
+        self.created_at = time.time()
+
+    def rss_mb(self):
+        """Mémoire résidente de chromedriver et de tous les process Chrome lancés par lui."""
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            procs = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs) / (1024 * 1024)
+        except (psutil.Error, AttributeError):
+            return 0.0
+
+    def is_healthy(self):
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    def reset(self):
+        """Ferme les onglets restants et revient sur le premier."""
+        handles = self.driver.window_handles
+        for handle in handles[1:]:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(handles[0])
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error while quitting driver for {self.source}: {e}")
+
+class BrowserPool:
+    def __init__(self, headless=True, max_page_loads=MAX_PAGE_LOADS, max_rss_mb=MAX_RSS_MB, driver_factory=None):
+        self.headless = headless
+        self.max_page_loads = max_page_loads
+        self.max_rss_mb = max_rss_mb
+        self.driver_factory = driver_factory or create_driver
+        self._idle = {}  # source -> [PooledDriver]
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "recycled": 0, "crashed": 0}
+
+    def _new_driver(self, source):
+        logger.info(f"Starting new Chrome driver for {source}")
+        self.stats["created"] += 1
+        return PooledDriver(source, self.driver_factory(self.headless, source))
+
+    def acquire(self, source) -> PooledDriver:
+        """Retourne un driver sain pour `source`, réutilisé si possible."""
+        while True:
+            with self._lock:
+                idle = self._idle.get(source, [])
+                pooled = idle.pop() if idle else None
+            if pooled is None:
+                return self._new_driver(source)
+            if pooled.is_healthy():
+                return pooled
+            logger.warning(f"Discarding crashed Chrome driver for {source}")
+            self.stats["crashed"] += 1
+            pooled.quit()
+
+    def release(self, pooled: PooledDriver):
+        """Remet le driver dans le pool, ou le recycle s'il a trop servi ou trop grossi."""
+        rss = pooled.rss_mb()
+        if pooled.page_loads >= self.max_page_loads or rss >= self.max_rss_mb:
+            logger.info(
+                f"Recycling Chrome driver for {pooled.source} "
+                f"({pooled.page_loads} page loads, {rss:.0f} MB)"
+            )
+            self.stats["recycled"] += 1
+            pooled.quit()
+            return
+        if not pooled.is_healthy():
+            self.stats["crashed"] += 1
+            pooled.quit()
+            return
+        try:
+            pooled.reset()
+        except WebDriverException:
+            pooled.quit()
+            return
+        with self._lock:
+            self._idle.setdefault(pooled.source, []).append(pooled)
+
+    @contextmanager
+    def lease(self, source):
+        pooled = self.acquire(source)
+        try:
+            yield pooled
+        finally:
+            self.release(pooled)
+
+    def close_all(self):
+        with self._lock:
+            drivers = [d for idle in self._idle.values() for d in idle]
+            self._idle = {}
+        for pooled in drivers:
+            pooled.quit()
+
+    def health(self):
+        with self._lock:
+            idle = {source: len(drivers) for source, drivers in self._idle.items()}
+        return {"idle": idle, **self.stats}
+
+# ==== Pool partagé par le process ====
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> BrowserPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+    return _pool
@@ -0,0 +1,191 @@
+# browser_profile.py
+"""
+Profil Chrome allégé pour les pages de listing.
+
+Seuls les liens et leur texte sont lus sur les pages de listing : images,
+polices, médias, publicités et trackers sont bloqués via le
+Chrome DevTools Protocol (Network.setBlockedURLs), avec une liste
+d'exceptions par source. La page est rendue dès le DOMContentLoaded
+(page_load_strategy "eager"). Les octets chargés, les requêtes bloquées et une
+estimation des octets et du temps économisés sont enregistrés par source.
+"""
+import json
+import logging
+import os
+import sys
+import threading
+from collections import defaultdict
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processor import metrics
+
+logger = logging.getLogger(__name__)
+
+LEAN_PROFILE = os.environ.get("BROWSER_LEAN_PROFILE", "1") == "1"
+
+# Types de ressources inutiles pour lire des ancres. Les feuilles de style
+# restent chargées : le scroll infini, les attentes de visibilité et le clic
+# sur "load more" dépendent de la mise en page
+BLOCKED_RESOURCE_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+]
+
+# Domaines tiers (pub, analytics, widgets sociaux)
+BLOCKED_THIRD_PARTY_PATTERNS = [
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.com*", "*facebook.net*",
+    "*connect.facebook.com*", "*platform.twitter.com*", "*hotjar.com*",
+    "*taboola.com*", "*outbrain.com*", "*criteo.com*", "*amazon-adsystem.com*",
+    "*scorecardresearch.com*", "*quantserve.com*", "*onesignal.com*",
+    "*cloudflareinsights.com*", "*clarity.ms*", "*youtube.com*", "*ytimg.com*",
+]
+
+# Exceptions par source : motifs à ne pas bloquer (ex: script tiers nécessaire
+# au bouton "load more")
+SOURCE_ALLOWLISTS = {
+    "cryptoNews": [],
+    "uToday": [],
+}
+
+# Taille moyenne estimée d'une ressource bloquée, par type CDP (octets)
+ESTIMATED_RESOURCE_BYTES = {
+    "Image": 40_000,
+    "Font": 30_000,
+    "Stylesheet": 25_000,
+    "Media": 500_000,
+    "Script": 60_000,
+    "XHR": 5_000,
+    "Fetch": 5_000,
+    "Other": 10_000,
+}
+
+def blocked_patterns_for(source=None):
+    allow = SOURCE_ALLOWLISTS.get(source, [])
+    patterns = BLOCKED_RESOURCE_PATTERNS + BLOCKED_THIRD_PARTY_PATTERNS
+    return [p for p in patterns if p not in allow]
+
+def apply_lean_options(chrome_options):
+    """Options Chrome du profil allégé (à appeler avant la création du driver)."""
+    chrome_options.page_load_strategy = "eager"
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--mute-audio")
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+        "profile.managed_default_content_settings.notifications": 2,
+    })
+    # Logs réseau pour mesurer ce qui est chargé et ce qui est bloqué
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return chrome_options
+
+def install_request_blocking(driver, source=None):
+    """Active l'interception réseau CDP sur le driver avec les motifs de la source."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_patterns_for(source)})
+
+# ==== Mesures ====
+_stats = defaultdict(lambda: {
+    "pages": 0,
+    "bytes_loaded": 0,
+    "requests_blocked": 0,
+    "blocked_by_type": defaultdict(int),
+    "estimated_bytes_saved": 0,
+    "load_ms": 0.0,
+    "estimated_ms_saved": 0.0,
+})
+_stats_lock = threading.Lock()
+
+def collect_page_stats(driver):
+    """
+    Vide le buffer de logs réseau du driver et résume la page courante :
+    octets chargés, requêtes bloquées par type, temps de chargement.
+    """
+    resource_types = {}
+    bytes_loaded = 0
+    blocked_by_type = defaultdict(int)
+
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        entries = []
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            resource_types[params.get("requestId")] = params.get("type", "Other")
+        elif method == "Network.loadingFinished":
+            bytes_loaded += int(params.get("encodedDataLength", 0))
+        elif method == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked_by_type[params.get("type") or resource_types.get(params.get("requestId"), "Other")] += 1
+
+    try:
+        load_ms = driver.execute_script(
+            "const t = performance.timing;"
+            "return Math.max(0, (t.domContentLoadedEventEnd || t.responseEnd) - t.navigationStart);"
+        ) or 0
+    except Exception:
+        load_ms = 0
+
+    estimated_bytes_saved = sum(
+        count * ESTIMATED_RESOURCE_BYTES.get(kind, ESTIMATED_RESOURCE_BYTES["Other"])
+        for kind, count in blocked_by_type.items()
+    )
+    # Temps économisé estimé au débit observé pour cette page
+    throughput = bytes_loaded / load_ms if load_ms and bytes_loaded else 0
+    estimated_ms_saved = estimated_bytes_saved / throughput if throughput else 0.0
+
+    return {
+        "bytes_loaded": bytes_loaded,
+        "requests_blocked": sum(blocked_by_type.values()),
+        "blocked_by_type": dict(blocked_by_type),
+        "estimated_bytes_saved": estimated_bytes_saved,
+        "load_ms": float(load_ms),
+        "estimated_ms_saved": estimated_ms_saved,
+    }
+
+def record_page_stats(source, driver, kind="listing", new_page=True):
+    """
+    Collecte les mesures réseau depuis le dernier appel et les ajoute aux
+    totaux de la source. À appeler après chaque chargement de page (`kind` :
+    "listing" ou "article"). Avec `new_page` faux (requêtes du scroll infini,
+    fin de session), les octets et requêtes bloquées sont ajoutés à la page
+    courante sans compter de page ni de temps de chargement.
+    """
+    page = collect_page_stats(driver)
+    if not new_page:
+        page["load_ms"] = page["estimated_ms_saved"] = 0.0
+    # Les pages d'article sont déjà chronométrées par les scrapers
+    if page["load_ms"] and kind == "listing":
+        metrics.PAGE_LOAD_SECONDS.labels(source or "unknown", "listing").observe(page["load_ms"] / 1000)
+    with _stats_lock:
+        totals = _stats[source]
+        totals["pages"] += 1 if new_page else 0
+        for key in ("bytes_loaded", "requests_blocked", "estimated_bytes_saved", "load_ms", "estimated_ms_saved"):
+            totals[key] += page[key]
+        for blocked, count in page["blocked_by_type"].items():
+            totals["blocked_by_type"][blocked] += count
+    logger.debug(
+        f"{source} {kind} page: {page['bytes_loaded'] / 1024:.0f} KB loaded, "
+        f"{page['requests_blocked']} requests blocked, "
+        f"~{page['estimated_bytes_saved'] / 1024:.0f} KB / ~{page['estimated_ms_saved']:.0f} ms saved"
+    )
+    return page
+
+def stats():
+    """Totaux et moyennes par page, par source."""
+    with _stats_lock:
+        result = {}
+        for source, totals in _stats.items():
+            pages = max(totals["pages"], 1)
+            result[source] = {
+                **{k: v for k, v in totals.items() if k != "blocked_by_type"},
+                "blocked_by_type": dict(totals["blocked_by_type"]),
+                "avg_bytes_loaded_per_page": totals["bytes_loaded"] / pages,
+                "avg_bytes_saved_per_page": totals["estimated_bytes_saved"] / pages,
+                "avg_ms_saved_per_page": totals["estimated_ms_saved"] / pages,
+            }
+        return result
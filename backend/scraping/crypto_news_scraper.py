@@ -4,52 +4,29 @@ import sys
 import os
 # Ajouter le chemin parent pour importer le module processor
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processor import metrics
+from processor.crypto_registry import mentions_crypto
 from processor.date_parser import parse_date_with_context
+from scraping.base_scraper import BaseScraper
 
-from selenium import webdriver
 from selenium.common.exceptions import (
     StaleElementReferenceException,
     NoSuchElementException,
     TimeoutException,
     ElementClickInterceptedException
 )
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
-CRYPTO_KEYWORDS = [
-    "Bitcoin", "BTC",
-    "Ethereum", "ETH",
-    "Tether", "USDT",
-    "XRP",
-    "Binance Coin", "BNB",
-    "Solana", "SOL",
-    "USD Coin", "USDC",
-    "Dogecoin", "DOGE",
-    "Cardano", "ADA",
-    "TRON", "TRX"
-]
-
 MAX_SCROLL_ATTEMPTS = 5
 
-class CryptoNewsMarketsScraper:
-    def __init__(self, headless=True, max_articles=-1):
-        self.headless = headless
-        self.max_articles = max_articles
-        self.scraped = 0
-        self.seen_links = set()
-        self.driver = self._init_driver()
-
-    def _init_driver(self):
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--log-level=3")
-        return webdriver.Chrome(options=chrome_options)
+# Nom de la source (clé des allowlists du profil navigateur)
+SOURCE = "cryptoNews"
+
+class CryptoNewsMarketsScraper(BaseScraper):
+    SOURCE = SOURCE
+    MISSING_DATES = (None, 'Date non trouvée')
 
     def _clear_cookie_banner(self):
         try:
@@ -102,9 +79,50 @@ class CryptoNewsMarketsScraper:
                 time.sleep(delay)
         return []
 
-    def stream_articles(self):
+    def _fetch_with_browser(self, url):
+        started = time.perf_counter()
+        self.driver.execute_script("window.open(arguments[0]);", url)
+        self.driver.switch_to.window(self.driver.window_handles[-1])
+        self.page_loads += 1
+        try:
+            WebDriverWait(self.driver, 10).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            loaded = time.perf_counter()
+            metrics.PAGE_LOAD_SECONDS.labels(SOURCE, "article").observe(loaded - started)
+
+            # retry global
+            for _ in range(3):
+                try:
+                    date = self._retry_find_text('.post-detail__date') or 'Date non trouvée'
+                    paras = self._retry_find_all_texts('div.post-detail__container p')
+                    content = '\n'.join(paras)
+
+                    # Parser la date avec le contexte crypto.news
+                    if date != 'Date non trouvée':
+                        parsed_date = parse_date_with_context(date, url)
+                    else:
+                        parsed_date = date
+
+                    metrics.EXTRACTION_SECONDS.labels(SOURCE).observe(time.perf_counter() - loaded)
+                    return {'url': url, 'date': parsed_date, 'content': content}
+                except Exception:
+                    time.sleep(1)
+            metrics.ARTICLES_FAILED.labels(SOURCE, "fetch").inc()
+            return None
+        except TimeoutException:
+            metrics.ARTICLES_FAILED.labels(SOURCE, "fetch").inc()
+            raise
+        finally:
+            self._record_page_stats("article")
+            self.driver.close()
+            self.driver.switch_to.window(self.driver.window_handles[0])
+
+    def _stream_from_listing(self):
         base_url = "https://crypto.news/markets/"
         self.driver.get(base_url)
+        self.page_loads += 1
+        self._record_page_stats("listing")
         self._clear_cookie_banner()
 
         selector = "a.post-loop__media-link"
@@ -118,8 +136,9 @@ class CryptoNewsMarketsScraper:
                 break
 
             total = len(thumbs)
+            pending = []  # URLs à télécharger en parallèle (mode async)
             for idx in range(total):
-                if 0 <= self.max_articles <= self.scraped:
+                if 0 <= self.max_articles <= self.scraped + len(pending):
                     break
 
                 try:
@@ -128,7 +147,7 @@ class CryptoNewsMarketsScraper:
                     continue
 
                 title = thumb.text or ""
-                if not any(kw.lower() in title.lower() for kw in CRYPTO_KEYWORDS):
+                if not mentions_crypto(title):
                     continue
 
                 try:
@@ -139,40 +158,24 @@ class CryptoNewsMarketsScraper:
                     continue
                 self.seen_links.add(url)
 
-                self.driver.execute_script("window.open(arguments[0]);", url)
-                self.driver.switch_to.window(self.driver.window_handles[-1])
-
-                WebDriverWait(self.driver, 10).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
-                )
-
-                # retry global
-                success = False
-                for _ in range(3):
-                    try:
-                        date = self._retry_find_text('.post-detail__date') or 'Date non trouvée'
-                        paras = self._retry_find_all_texts('div.post-detail__container p')
-                        content = '\n'.join(paras)
-                        
-                        # Parser la date avec le contexte crypto.news
-                        if date != 'Date non trouvée':
-                            parsed_date = parse_date_with_context(date, url)
-                        else:
-                            parsed_date = date
-                        
-                        yield {'url': url, 'date': parsed_date, 'content': content}
-                        self.scraped += 1
-                        success = True
-                        break
-                    except Exception:
-                        time.sleep(1)
-
-                if not success:
+                if self.fetch_mode == "async":
+                    pending.append(url)
+                    continue
+                elif self.fetcher is not None:
+                    article = self.fetcher.fetch(url)
+                else:
+                    article = self._fetch_with_browser(url)
+                if article is None:
                     # skip if permanently failing
-                    pass
+                    continue
+
+                yield article
+                self.scraped += 1
 
-                self.driver.close()
-                self.driver.switch_to.window(self.driver.window_handles[0])
+            if pending:
+                for article in self.fetcher.fetch(pending):
+                    yield article
+                    self.scraped += 1
 
             # pagination
             old_count = total
@@ -200,8 +203,6 @@ class CryptoNewsMarketsScraper:
                 if not self._wait_for_new_articles(old_count):
                     break
 
-    def close(self):
-        self.driver.quit()
 
 if __name__ == '__main__':
     scraper = CryptoNewsMarketsScraper(headless=True, max_articles=-1)
@@ -210,6 +211,7 @@ if __name__ == '__main__':
             print(f"URL: {article['url']}")
             print(f"Date: {article['date']}")
             print(f"Extrait: {article['content'][:200]}…")
+            scraper.mark_handled([article['url']])
             print('---')
     finally:
         scraper.close()
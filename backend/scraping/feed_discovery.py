@@ -0,0 +1,199 @@
+# feed_discovery.py
+"""
+Découverte des nouveaux articles via les flux RSS / sitemaps news des sources.
+
+Une requête HTTP conditionnelle (ETag / If-Modified-Since) par flux et par
+cycle remplace les minutes de scroll infini dans Chrome. Seules les URLs jamais
+vues sont retournées, avec leur date de publication. Quand le flux ne recoupe
+plus les URLs déjà vues (premier lancement, longue coupure) ou qu'il est
+indisponible, `needs_backfill` indique qu'il faut compléter par le scroll.
+
+Une URL n'est marquée vue (`mark_seen`) qu'une fois l'article traité, et les
+validateurs d'une réponse ne sont enregistrés que si toutes ses entrées l'ont
+été : sinon le flux est relu en entier au cycle suivant et les entrées
+restantes sont proposées à nouveau.
+"""
+import json
+import logging
+import os
+import threading
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+import requests
+
+from scraping.article_fetcher import USER_AGENT
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Flux par source (RSS, Atom ou sitemap news)
+FEEDS = {
+    "cryptoNews": ["https://crypto.news/feed/"],
+    "uToday": ["https://u.today/rss"],
+}
+
+# Nombre d'URLs vues conservées par source
+MAX_SEEN = 5000
+
+NAMESPACES = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "sm": "http://www.sitemaps.org/schemas/sitemap/0.9",
+    "news": "http://www.google.com/schemas/sitemap-news/0.9",
+}
+
+def _to_iso(value):
+    """Convertit une date RFC 822 (RSS) ou ISO 8601 (Atom, sitemap) en ISO UTC."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).isoformat()
+
+def parse_feed(body):
+    """
+    Parse un flux RSS 2.0, Atom ou sitemap news.
+    Retourne [{'url', 'title', 'published'}] dans l'ordre du flux.
+    """
+    root = ET.fromstring(body)
+    entries = []
+
+    for item in root.iter("item"):  # RSS
+        entries.append({
+            "url": (item.findtext("link") or "").strip(),
+            "title": (item.findtext("title") or "").strip(),
+            "published": _to_iso(item.findtext("pubDate")),
+        })
+    for entry in root.iter(f"{{{NAMESPACES['atom']}}}entry"):  # Atom
+        link = entry.find("atom:link", NAMESPACES)
+        entries.append({
+            "url": (link.get("href") if link is not None else "").strip(),
+            "title": (entry.findtext("atom:title", "", NAMESPACES)).strip(),
+            "published": _to_iso(entry.findtext("atom:published", None, NAMESPACES)
+                                 or entry.findtext("atom:updated", None, NAMESPACES)),
+        })
+    for url in root.iter(f"{{{NAMESPACES['sm']}}}url"):  # sitemap news
+        entries.append({
+            "url": (url.findtext("sm:loc", "", NAMESPACES)).strip(),
+            "title": (url.findtext("news:news/news:title", "", NAMESPACES)).strip(),
+            "published": _to_iso(url.findtext("news:news/news:publication_date", None, NAMESPACES)
+                                 or url.findtext("sm:lastmod", None, NAMESPACES)),
+        })
+
+    return [e for e in entries if e["url"]]
+
+class FeedDiscovery:
+    def __init__(self, source, feeds=None, state_path=None, timeout=15):
+        self.source = source
+        self.feeds = feeds if feeds is not None else FEEDS.get(source, [])
+        self.state_path = state_path or os.path.join(PROJECT_ROOT, f"feed_state_{source}.json")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT})
+        self.needs_backfill = False
+        # feed -> (validateurs de la dernière réponse, URLs de ses entrées non vues)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._load_state()
+
+    def _load_state(self):
+        self.validators = {}  # feed -> {'etag', 'last_modified'}
+        self.seen = []
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                state = json.load(f)
+            self.validators = state.get("validators", {})
+            self.seen = state.get("seen", [])
+        self._seen_set = set(self.seen)
+
+    def save(self):
+        with self._lock:
+            # Validateurs gardés tant qu'une entrée de la réponse reste à traiter
+            for feed, (validators, urls) in list(self._pending.items()):
+                if urls <= self._seen_set:
+                    self.validators[feed] = validators
+                    del self._pending[feed]
+            state = {"validators": self.validators, "seen": self.seen[-MAX_SEEN:]}
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
+
+    def mark_seen(self, url):
+        with self._lock:
+            if url not in self._seen_set:
+                self._seen_set.add(url)
+                self.seen.append(url)
+
+    def _fetch(self, feed):
+        """
+        GET conditionnel. Retourne (corps, validateurs de la réponse), ou
+        (None, None) si le flux n'a pas changé (304).
+        """
+        headers = {}
+        validators = self.validators.get(feed, {})
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        resp = self.session.get(feed, headers=headers, timeout=self.timeout)
+        if resp.status_code == 304:
+            return None, None
+        resp.raise_for_status()
+        return resp.content, {
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+        }
+
+    def discover(self):
+        """
+        Retourne les entrées jamais vues, de la plus récente à la plus ancienne.
+        Positionne `needs_backfill` si le scroll doit prendre le relais.
+        """
+        self.needs_backfill = False
+        if not self.feeds:
+            self.needs_backfill = True
+            return []
+
+        entries, overlap = [], False
+        for feed in self.feeds:
+            try:
+                body, validators = self._fetch(feed)
+            except Exception as e:
+                logger.warning(f"Feed {feed} unavailable, falling back to listing scroll: {e}")
+                self.needs_backfill = True
+                continue
+            if body is None:
+                logger.debug(f"Feed {feed} not modified")
+                overlap = True
+                continue
+            unseen = set()
+            for entry in parse_feed(body):
+                if entry["url"] in self._seen_set:
+                    overlap = True
+                else:
+                    entries.append(entry)
+                    unseen.add(entry["url"])
+            with self._lock:
+                self._pending[feed] = (validators, unseen)
+
+        # Aucune URL connue dans le flux : il peut manquer des articles plus anciens
+        if entries and not overlap:
+            self.needs_backfill = True
+
+        unique = {e["url"]: e for e in entries}
+        return sorted(unique.values(), key=lambda e: e["published"] or "", reverse=True)
+
+    def close(self):
+        self.session.close()
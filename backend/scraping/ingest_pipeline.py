@@ -0,0 +1,232 @@
+# ingest_pipeline.py
+"""
+Pipeline d'ingestion par étages reliés par des files bornées.
+
+    fetch -> normalize -> detect -> dedup -> score (par batch) -> write (par batch)
+
+Chaque étage a son propre nombre de workers (threads) et, optionnellement, une
+taille de batch. Les files sont bornées : un étage lent fait attendre les
+étages en amont (backpressure) au lieu de tout sérialiser. Chaque étage mesure
+son débit et la profondeur de sa file d'entrée.
+"""
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processor import metrics
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class PipelineError(RuntimeError):
+    """Au moins un étage a échoué sur des éléments : le run n'est pas complet."""
+    def __init__(self, name, stats):
+        self.stats = stats
+        failed = {stage: s["failed"] for stage, s in stats.items() if s.get("failed")}
+        details = ", ".join(f"{stage}: {count}" for stage, count in failed.items())
+        super().__init__(f"Pipeline '{name}' dropped items ({details})")
+
+class Stage:
+    def __init__(self, name, fn, workers=1, batch_size=1, batch_timeout=0.5, maxsize=64):
+        """
+        fn : item -> item (ou None pour l'écarter) si batch_size == 1,
+             list[item] -> list[item] sinon.
+        """
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.inbox = queue.Queue(maxsize=maxsize)
+        self.next = None
+        self.pipeline = None  # nom du pipeline (source), fixé par Pipeline
+
+        self.processed = 0
+        self.emitted = 0
+        self.failed = 0
+        self.busy_s = 0.0
+        self.max_queue_depth = 0
+        self.started_at = None
+        self.finished_at = None
+        self._finished_workers = 0
+        self._lock = threading.Lock()
+
+    def put(self, item):
+        self.inbox.put(item)
+        depth = self.inbox.qsize()
+        if depth > self.max_queue_depth:
+            self.max_queue_depth = depth
+
+    def _emit(self, items):
+        items = [item for item in items if item is not None]
+        with self._lock:
+            self.emitted += len(items)
+        if self.next is None:
+            return
+        for item in items:
+            self.next.put(item)
+
+    def _process(self, items):
+        started = time.perf_counter()
+        try:
+            if self.batch_size > 1:
+                out = self.fn(items)
+            else:
+                out = [self.fn(items[0])]
+            self._emit(out)
+            with self._lock:
+                self.processed += len(items)
+        except Exception as e:
+            logger.error(f"Ingest stage '{self.name}' failed on {len(items)} item(s): {e}")
+            with self._lock:
+                self.failed += len(items)
+            metrics.ARTICLES_FAILED.labels(self.pipeline or "unknown", self.name).inc(len(items))
+        finally:
+            with self._lock:
+                self.busy_s += time.perf_counter() - started
+
+    def _next_batch(self):
+        """Attend un premier élément puis complète le batch jusqu'à batch_timeout."""
+        first = self.inbox.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.batch_timeout
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.inbox.get(timeout=max(remaining, 0)) if remaining > 0 else self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        while True:
+            batch, stopping = self._next_batch()
+            if batch:
+                self._process(batch)
+            if stopping:
+                break
+        # Le dernier worker à finir propage l'arrêt à l'étage suivant
+        with self._lock:
+            self._finished_workers += 1
+            last = self._finished_workers == self.workers
+        if last:
+            self.finished_at = time.perf_counter()
+            if self.next is not None:
+                for _ in range(self.next.workers):
+                    self.next.inbox.put(_STOP)
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        threads = []
+        for i in range(self.workers):
+            t = threading.Thread(target=self._run, name=f"ingest-{self.name}-{i}", daemon=True)
+            t.start()
+            threads.append(t)
+        return threads
+
+    def stats(self):
+        end = self.finished_at or time.perf_counter()
+        elapsed = max(end - self.started_at, 1e-6) if self.started_at else 0
+        return {
+            "workers": self.workers,
+            "batch_size": self.batch_size,
+            "processed": self.processed,
+            "emitted": self.emitted,
+            "failed": self.failed,
+            "queue_depth": self.inbox.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "throughput": round(self.processed / elapsed, 3) if elapsed else 0.0,
+            "busy_s": round(self.busy_s, 3),
+        }
+
+class Pipeline:
+    def __init__(self, name, stages):
+        self.name = name
+        self.stages = stages
+        for stage, nxt in zip(stages, stages[1:]):
+            stage.next = nxt
+        for stage in stages:
+            stage.pipeline = name
+        self.fetched = 0
+        self.fetch_s = 0.0
+        self.started_at = None
+
+    def run(self, source):
+        """
+        Alimente le premier étage avec `source` (itérable, ex: un scraper) dans
+        le thread appelant, puis attend que tous les étages aient terminé.
+        Une exception de la source est relancée après l'arrêt propre des étages ;
+        si un étage a échoué sur des éléments, lève PipelineError (avec les stats).
+        """
+        self.started_at = time.perf_counter()
+        threads = [t for stage in self.stages for t in stage.start()]
+        _register(self)
+        first = self.stages[0]
+        try:
+            iterator = iter(source)
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    self.fetch_s += time.perf_counter() - started
+                self.fetched += 1
+                # Bloque si le premier étage est plein : backpressure sur le fetch
+                first.put(item)
+        finally:
+            for _ in range(first.workers):
+                first.inbox.put(_STOP)
+            for t in threads:
+                t.join()
+            _unregister(self)
+        stats = self.stats()
+        if any(stage.failed for stage in self.stages):
+            raise PipelineError(self.name, stats)
+        return stats
+
+    def stats(self):
+        elapsed = max(time.perf_counter() - self.started_at, 1e-6) if self.started_at else 0
+        return {
+            "fetch": {
+                "processed": self.fetched,
+                "throughput": round(self.fetched / elapsed, 3) if elapsed else 0.0,
+                "busy_s": round(self.fetch_s, 3),
+            },
+            **{stage.name: stage.stats() for stage in self.stages},
+        }
+
+# ==== Suivi des pipelines en cours / derniers résultats ====
+_active = {}
+_last = {}
+_registry_lock = threading.Lock()
+
+def _register(pipeline):
+    with _registry_lock:
+        _active[pipeline.name] = pipeline
+
+def _unregister(pipeline):
+    with _registry_lock:
+        _active.pop(pipeline.name, None)
+        _last[pipeline.name] = pipeline.stats()
+
+def stats():
+    """État par pipeline : en cours (profondeur des files en direct) ou dernier run."""
+    with _registry_lock:
+        result = {name: {"running": False, "stages": s} for name, s in _last.items()}
+        for name, pipeline in _active.items():
+            result[name] = {"running": True, "stages": pipeline.stats()}
+    return result
+
+metrics.register_queue_depths(stats)
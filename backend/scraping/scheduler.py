@@ -0,0 +1,206 @@
+# scheduler.py
+"""
+Ordonnanceur de scraping : un worker indépendant par source.
+
+Chaque source a sa propre cadence, son propre backoff en cas d'erreur et son
+propre état de santé. Une source lente ou en panne ne retarde plus les autres.
+Ajouter une source revient à appeler `register` avec sa fonction de scraping.
+
+La cadence s'adapte au rythme de publication observé de chaque source : elle
+s'allonge quand la source est calme et se resserre pendant les rafales.
+"""
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+class AdaptiveCadence:
+    def __init__(self, min_interval=10, max_interval=600, initial=None, smoothing=0.3, target_ratio=0.5):
+        """
+        Estime le temps moyen entre deux nouveaux articles (moyenne mobile
+        exponentielle) et en déduit l'intervalle de polling.
+
+        smoothing    : poids de la dernière observation dans la moyenne.
+        target_ratio : fraction de l'inter-arrivée moyenne visée entre deux
+                       cycles (0.5 : deux passages par article attendu).
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.smoothing = smoothing
+        self.target_ratio = target_ratio
+        self.mean_interarrival = (initial if initial is not None else min_interval) / target_ratio
+        self.last_arrival = None
+        self.created_at = time.time()
+
+    def observe(self, count, now=None):
+        """Enregistre le résultat d'un cycle : `count` nouveaux articles trouvés."""
+        now = time.time() if now is None else now
+        if count <= 0:
+            return
+        if self.last_arrival is not None:
+            # count articles arrivés depuis le dernier article vu
+            sample = (now - self.last_arrival) / count
+            self.mean_interarrival += self.smoothing * (sample - self.mean_interarrival)
+        self.last_arrival = now
+
+    def interval(self, now=None):
+        """
+        Intervalle avant le prochain cycle. Sans nouvel article depuis plus
+        longtemps que l'inter-arrivée moyenne, ce silence sert d'estimation :
+        la cadence ralentit d'elle-même quand la source est calme.
+        """
+        now = time.time() if now is None else now
+        quiet_for = now - (self.last_arrival if self.last_arrival is not None else self.created_at)
+        expected = max(self.mean_interarrival, quiet_for)
+        return min(max(expected * self.target_ratio, self.min_interval), self.max_interval)
+
+class SourceWorker:
+    def __init__(self, name, task, interval=10, error_backoff=60, max_backoff=600,
+                 adaptive=True, min_interval=None, max_interval=600, jitter=0.5):
+        """
+        task : callable sans argument qui scrape la source et retourne le
+               nombre de nouveaux articles stockés.
+        interval : cadence fixe, ou cadence de départ si `adaptive`.
+        min_interval / max_interval : bornes de la cadence adaptative
+               (min_interval vaut `interval` par défaut).
+        jitter : fraction aléatoire retirée du backoff d'erreur, pour que les
+               sources en panne ne réessaient pas toutes au même instant.
+        """
+        self.name = name
+        self.task = task
+        self.interval = interval
+        self.error_backoff = error_backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.cadence = AdaptiveCadence(
+            min_interval=min_interval if min_interval is not None else interval,
+            max_interval=max_interval,
+            initial=interval,
+        ) if adaptive else None
+        self.cycles = 0
+        self.empty_cycles = 0
+
+        self.status = "idle"
+        self.last_run = None
+        self.last_success = None
+        self.last_error = None
+        self.last_count = 0
+        self.total_articles = 0
+        self.consecutive_failures = 0
+        self.next_run = None
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        # Un worker arrêté mais encore dans son cycle reprend simplement sa boucle
+        self._stop.clear()
+        if self.is_alive():
+            return
+        self._thread = threading.Thread(target=self._run, name=f"scraper-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def next_delay(self):
+        """Délai avant le prochain cycle : cadence (adaptative), ou backoff exponentiel avec jitter après erreurs."""
+        if self.consecutive_failures == 0:
+            return self.cadence.interval() if self.cadence else self.interval
+        backoff = min(self.error_backoff * 2 ** (self.consecutive_failures - 1), self.max_backoff)
+        return backoff * (1 - self.jitter * random.random())
+
+    def run_once(self):
+        self.status = "running"
+        self.last_run = datetime.utcnow()
+        try:
+            count = self.task() or 0
+        except Exception as e:
+            self.consecutive_failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            self.status = "error"
+            logger.error(f"Scraping {self.name} failed ({self.consecutive_failures} in a row): {e}")
+            return
+
+        self.consecutive_failures = 0
+        self.last_success = datetime.utcnow()
+        self.last_count = count
+        self.total_articles += count
+        self.cycles += 1
+        if count == 0:
+            self.empty_cycles += 1
+        if self.cadence:
+            self.cadence.observe(count)
+        self.status = "ok"
+        logger.info(f"Scraping {self.name} completed: {count} new articles")
+
+    def _run(self):
+        logger.info(f"Starting scraping worker for {self.name}")
+        while not self._stop.is_set():
+            self.run_once()
+            delay = self.next_delay()
+            self.next_run = datetime.utcnow() + timedelta(seconds=delay)
+            # wait() plutôt que sleep() : l'arrêt est pris en compte immédiatement
+            self._stop.wait(delay)
+        self.status = "stopped"
+        self.next_run = None
+        logger.info(f"Scraping worker for {self.name} stopped")
+
+    def health(self):
+        def fmt(dt):
+            return dt.isoformat() if dt else None
+        return {
+            "status": self.status,
+            "alive": self.is_alive(),
+            "interval": round(self.cadence.interval(), 1) if self.cadence else self.interval,
+            "adaptive": self.cadence is not None,
+            "mean_interarrival": round(self.cadence.mean_interarrival, 1) if self.cadence else None,
+            "last_run": fmt(self.last_run),
+            "last_success": fmt(self.last_success),
+            "next_run": fmt(self.next_run),
+            "last_error": self.last_error,
+            "consecutive_failures": self.consecutive_failures,
+            "last_count": self.last_count,
+            "total_articles": self.total_articles,
+            "cycles": self.cycles,
+            "empty_cycles": self.empty_cycles,
+        }
+
+class SourceScheduler:
+    def __init__(self):
+        self.workers = {}
+
+    def register(self, name, task, **options):
+        """
+        Déclare une source. `options` : interval, error_backoff, max_backoff,
+        adaptive, min_interval, max_interval, jitter.
+        """
+        if name in self.workers:
+            raise ValueError(f"Source {name} already registered")
+        worker = SourceWorker(name, task, **options)
+        self.workers[name] = worker
+        return worker
+
+    def start(self):
+        for worker in self.workers.values():
+            worker.start()
+
+    def stop(self):
+        for worker in self.workers.values():
+            worker.stop()
+
+    def is_alive(self):
+        return any(worker.is_alive() for worker in self.workers.values())
+
+    def last_run(self):
+        runs = [w.last_run for w in self.workers.values() if w.last_run]
+        return max(runs) if runs else None
+
+    def health(self):
+        return {name: worker.health() for name, worker in self.workers.items()}
@@ -1,110 +1,218 @@
 # store_data.py
+import logging
 import sys
 import os
-import re
+import time
 
 # Ajoute le dossier parent de "processor" au path
 script_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.join(script_dir, '..')
 sys.path.append(os.path.abspath(parent_dir))
 
-from processor import h5_utilities, emoji_handler
-from processor.sentiment import compute_sentiment
+from processor import h5_utilities, text_normalizer, inference_pool, sentiment, dedup, search_index, metrics
+from processor.crypto_registry import detect_cryptos
+from . import browser_pool
+from . import ingest_pipeline
 from . import crypto_news_scraper
 from . import u_today_scraper
 
-CRYPTO_DEFINITIONS = [
-    {"name": "Bitcoin", "aliases": ["bitcoin", "btc"]},
-    {"name": "Ethereum", "aliases": ["ethereum", "eth"]},
-    {"name": "Tether", "aliases": ["tether", "usdt"]},
-    {"name": "XRP", "aliases": ["xrp", "ripple"]},
-    {"name": "Binance Coin", "aliases": ["binance coin", "bnb"]},
-    {"name": "Solana", "aliases": ["solana", "sol"]},
-    {"name": "USD Coin", "aliases": ["usd coin", "usdc"]},
-    {"name": "Dogecoin", "aliases": ["dogecoin", "doge"]},
-    {"name": "Cardano", "aliases": ["cardano", "ada"]},
-    {"name": "TRON", "aliases": ["tron", "trx"]}
-]
-
-def detect_cryptos(text: str, definitions=CRYPTO_DEFINITIONS) -> list[str]:
-        """
-        Parcourt `definitions` pour trouver les alias présents dans `text`.
-        Retourne une liste unique des `name` des cryptos détectées.
-        """
-        detected = set()
-        text_lower = text.lower()
-        for crypto in definitions:
-            for alias in crypto["aliases"]:
-                # mot entier uniquement (\b…\b)
-                if re.search(rf"\b{re.escape(alias)}\b", text_lower):
-                    detected.add(crypto["name"])
-                    break
-        return list(detected)
+logger = logging.getLogger(__name__)
+
+# Configuration des étages du pipeline d'ingestion : nombre de workers et
+# taille de batch par étage, profondeur maximale des files entre étages
+PIPELINE_CONFIG = {
+    "normalize": {"workers": 2, "batch_size": 32},
+    "detect":    {"workers": 2},
+    "dedup":     {"workers": 1},
+    "score":     {"workers": 1, "batch_size": sentiment.BATCH_SIZE},
+    "write":     {"workers": 1, "batch_size": 32},
+}
+PIPELINE_QUEUE_SIZE = int(os.environ.get("INGEST_QUEUE_SIZE", "64"))
+
+# Sources branchées : attribut h5 du dernier lien connu et scraper du listing
+SOURCES = {
+    "cryptoNews": ("last_news_cryptoNews", crypto_news_scraper.CryptoNewsMarketsScraper),
+    "uToday": ("last_news_uToday", u_today_scraper.UTodayScraper),
+}
+
+def normalize_articles(articles):
+    contents = text_normalizer.normalize_batch([a['content'] for a in articles])
+    for article, content in zip(articles, contents):
+        article['content'] = content
+    return articles
+
+def detect_article(article):
+    article['crypto'] = detect_cryptos(article['content'])
+    return article
+
+def is_new(article):
+    """Article à scorer et à écrire : ni quasi-doublon, ni déjà présent dans le dataset."""
+    return not article.get('duplicate_of') and not article.get('already_stored')
+
+def make_deduplicator(h5FileName):
+    """
+    Marque les quasi-doublons d'articles déjà stockés et les articles déjà
+    écrits (repris après un cycle en échec) : ni scorés, ni écrits.
+    """
+    index = dedup.get_index(h5FileName)
+    def dedup_article(article):
+        if index.is_stored(article['url']):
+            article['already_stored'] = True
+            return article
+        article['duplicate_of'] = index.check(article['content'], article['url'])
+        if article['duplicate_of']:
+            logger.debug(f"{article['url']} is a near-duplicate of {article['duplicate_of']}")
+        return article
+    return dedup_article
+
+def make_scorer(source):
+    def score_articles(articles):
+        originals = [a for a in articles if is_new(a)]
+        if not originals:
+            return articles
+        started = time.perf_counter()
+        scores = inference_pool.score_texts([a['content'] for a in originals])
+        metrics.INFERENCE_BATCH_SECONDS.labels(source).observe(time.perf_counter() - started)
+        metrics.INFERENCE_BATCH_SIZE.labels(source).observe(len(originals))
+        for article, score in zip(originals, scores):
+            article['note'] = score
+        return articles
+    return score_articles
+
+def make_writer(h5FileName, on_written=None, source="unknown"):
+    """
+    Étage d'écriture : un seul worker, un append h5 par batch. Les doublons ne
+    sont pas écrits. Une fois le batch écrit, les articles sont validés dans
+    l'index des quasi-doublons et ajoutés à l'index de recherche.
+    `on_written(articles)` est appelé après chaque batch traité (articles
+    écrits et doublons écartés). Retourne les articles écrits.
+    """
+    state = {"havePlaceholder": True} #Check que dataset n'as plus le placeholder de création
+    near_duplicates = dedup.get_index(h5FileName)
+    def write_articles(batch):
+        articles = [a for a in batch if is_new(a)]
+        started = time.perf_counter()
+        h5_utilities.appendArticlesToDataset(
+            [a['content'] for a in articles],
+            [a['url'] for a in articles],
+            [a['date'] for a in articles],
+            [a['crypto'] for a in articles],
+            [a['note'] for a in articles],
+            h5FileName
+        )
+        for a in batch:
+            near_duplicates.commit(a['url'], a.get('duplicate_of'))
+        if articles:
+            metrics.H5_WRITE_SECONDS.labels(source).observe(time.perf_counter() - started)
+        metrics.ARTICLES_STORED.labels(source).inc(len(articles))
+        metrics.ARTICLES_DEDUPED.labels(source).inc(len(batch) - len(articles))
+        for a in articles:
+            logger.debug("article stored source=%s url=%s date=%s crypto=%s note=%s",
+                         source, a['url'], a['date'], ",".join(a['crypto']), a['note'])
+        if articles and state["havePlaceholder"]:
+            if h5_utilities.removePlaceholderRow(h5FileName):
+                logger.info(f"Removed placeholder row from {h5FileName}.h5")
+            state["havePlaceholder"] = False
+        try:
+            # Ouvert sous la garde (un index absent est reconstruit en arrière-plan) :
+            # un index corrompu ne fait pas échouer l'écriture
+            search_index.get_index(h5FileName).add_articles(articles)
+        except Exception as e:
+            # L'index se reconstruit depuis le h5 (--rebuild) : ne jamais bloquer l'ingest
+            logger.warning(f"Search index update failed: {e}")
+        if on_written is not None:
+            on_written(batch)
+        return articles
+    return write_articles
+
+def build_pipeline(website, h5FileName, config=PIPELINE_CONFIG, maxsize=PIPELINE_QUEUE_SIZE, on_written=None):
+    fns = {
+        "normalize": normalize_articles,
+        "detect": detect_article,
+        "dedup": make_deduplicator(h5FileName),
+        "score": make_scorer(website),
+        "write": make_writer(h5FileName, on_written, source=website),
+    }
+    stages = [
+        ingest_pipeline.Stage(name, fns[name], maxsize=maxsize, **config.get(name, {}))
+        for name in ("normalize", "detect", "dedup", "score", "write")
+    ]
+    return ingest_pipeline.Pipeline(website, stages)
 
 def storeData(website="cryptoNews", nbArticle = -1, h5FileName="dataset"):
     """
-    website_value : str
+    website_value : str (clé de SOURCES)
         'cryptoNews'
         'uToday'
-        'beInCrypto'
+    Retourne le nombre de nouveaux articles stockés. Si un étage du pipeline
+    a échoué, lève ingest_pipeline.PipelineError (le scheduler applique son
+    backoff) : le dernier lien connu n'avance alors que jusqu'aux articles
+    effectivement traités, les autres seront repris au prochain cycle (en
+    mode feed, ils restent non vus dans l'état du flux).
+
+    Le scraper alimente le pipeline d'ingestion (cf. ingest_pipeline.py) :
+    normalisation, détection, déduplication, scoring et écriture tournent en
+    parallèle du fetch, avec des files bornées entre les étages.
     """
-    havePlaceholder = True #Check que dataset n'as plus le placeholder de création
-    firstScrap = True
-    linkFirstScrap = ""
-
-    match website:
-        case "cryptoNews":
-            print("Scrapping cryptoNews !")
-            h5Attribute = 'last_news_cryptoNews'
-            scraper = crypto_news_scraper.CryptoNewsMarketsScraper(headless=True, max_articles=nbArticle)
-        case "uToday":
-            print("Scrapping uToday !")
-            h5Attribute = 'last_news_uToday'
-            scraper = u_today_scraper.UTodayScraper(headless=True, max_articles=nbArticle)
-        case "beInCrypto":
-            print("Scrapping beInCrypto !")
-            h5Attribute = 'last_news_beInCrypto'
-            scraper = None  # Not implemented yet
-
-    try:
+    state = {"linkFirstScrap": ""}
+    fetched = []     # liens envoyés au pipeline, du plus récent au plus ancien
+    handled = set()  # liens traités par l'étage d'écriture (écrits ou écartés)
+
+    if website not in SOURCES:
+        raise ValueError(f"Unknown website: {website} (available: {', '.join(SOURCES)})")
+    logger.info(f"Scraping {website}")
+    h5Attribute, scraper_class = SOURCES[website]
+
+    # Driver Chrome chaud réutilisé d'un cycle à l'autre (recyclé par le pool),
+    # emprunté seulement si le scraper en a besoin (scroll du listing)
+    pool = browser_pool.get_pool()
+    leased = []
+    def lease_driver():
+        leased.append(pool.acquire(website))
+        return leased[-1].driver
+    scraper = scraper_class(headless=True, max_articles=nbArticle, driver_provider=lease_driver)
+
+    # Dernier lien connu lu une seule fois : il ne change pas pendant le cycle
+    lastKnownLink = h5_utilities.getUrlAttribute(h5Attribute,h5FileName)
+
+    def fetch():
         for article in scraper.stream_articles():
             link = article['url']
-            date = article['date']
-            print("URL: ",link)
-            print("Date: ", date)
-
-            content = article['content'].replace("\n"," ")
-            content = emoji_handler.remove_emojis(content)
-            print(content)
-            print('---')
-
-            if link == h5_utilities.getUrlAttribute(h5Attribute,h5FileName):
-                linkFirstScrap = link
-                print("Data already scrapped !")
+            if link == lastKnownLink:
+                logger.info(f"{website}: reached last known article, stopping")
                 break
-            else:
-                if firstScrap:
-                    linkFirstScrap = link
-                    print(h5_utilities.getUrlAttribute(h5Attribute,h5FileName))
-                    firstScrap = False
-                list_crypto = detect_cryptos(content)
-
-                print("Cryptos détectées :", list_crypto or "Aucune")
-
-                sentiment_score = compute_sentiment(content)
-
-                h5_utilities.appendArticleToDataset(content,link,date,list_crypto,sentiment_score,h5FileName)
-                
-                if havePlaceholder:
-                     if h5_utilities.getDatasetPlaceholderAttribute(h5FileName):
-                         print("Remove placeholder content")
-                         h5_utilities.remove_first_item(h5FileName)
-                         h5_utilities.setDatasetPlaceholderAttribute(False, h5FileName)
-                     havePlaceholder = False
+            metrics.ARTICLES_SCRAPED.labels(website).inc()
+            fetched.append(link)
+            yield article
+
+    def on_written(batch):
+        handled.update(a['url'] for a in batch)
+        # En mode feed, seuls les articles traités sont marqués vus dans le flux
+        scraper.mark_handled(a['url'] for a in batch)
 
+    pipeline = build_pipeline(website, h5FileName, on_written=on_written)
+    try:
+        stats = pipeline.run(fetch())
     finally:
-        h5_utilities.setUrlAttribute(h5Attribute,linkFirstScrap,h5FileName)
+        # Le prochain cycle s'arrête au dernier lien connu : il ne peut avancer
+        # que jusqu'au plus récent article dont tous les plus anciens ont été
+        # traités. Un cycle sans article ne doit pas effacer le dernier lien connu
+        newest_handled = len(fetched)
+        while newest_handled and fetched[newest_handled - 1] in handled:
+            newest_handled -= 1
+        if newest_handled < len(fetched):
+            state["linkFirstScrap"] = fetched[newest_handled]
+            h5_utilities.setUrlAttribute(h5Attribute,state["linkFirstScrap"],h5FileName)
+        # Les articles non écrits (étage en échec) ne restent pas réservés dans l'index
+        near_duplicates = dedup.get_index(h5FileName)
+        near_duplicates.release(fetched)
+        near_duplicates.save()
         scraper.close()
+        for pooled in leased:
+            pooled.page_loads += scraper.page_loads
+            pool.release(pooled)
+
+    return stats["write"]["emitted"]
 
 
 
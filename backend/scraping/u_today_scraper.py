@@ -4,52 +4,27 @@ import sys
 import os
 # Ajouter le chemin parent pour importer le module processor
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from processor import metrics
+from processor.crypto_registry import mentions_crypto
 from processor.date_parser import parse_date_with_context
+from scraping.base_scraper import BaseScraper
 
-from selenium import webdriver
 from selenium.common.exceptions import (
     StaleElementReferenceException,
     TimeoutException
 )
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
-# Top 10 cryptos de CoinMarketCap (stocké en dur)
-CRYPTO_KEYWORDS = [
-    "Bitcoin", "BTC",
-    "Ethereum", "ETH",
-    "Tether", "USDT",
-    "XRP",
-    "Binance Coin", "BNB",
-    "Solana", "SOL",
-    "USD Coin", "USDC",
-    "Dogecoin", "DOGE",
-    "Cardano", "ADA",
-    "TRON", "TRX"
-]
-
 # Nombre maximal de tentatives de scroll pour charger plus d'articles
 MAX_SCROLL_ATTEMPTS = 5
 
-class UTodayScraper:
-    def __init__(self, headless=True, max_articles=-1):
-        self.headless = headless
-        self.max_articles = max_articles
-        self.seen_links = set()
-        self.scraped_count = 0
-        self.driver = self._init_driver()
-
-    def _init_driver(self):
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--log-level=3")
-        return webdriver.Chrome(options=chrome_options)
+# Nom de la source (clé des allowlists du profil navigateur)
+SOURCE = "uToday"
+
+class UTodayScraper(BaseScraper):
+    SOURCE = SOURCE
 
     def _clear_cookie_banner(self):
         try:
@@ -91,17 +66,57 @@ class UTodayScraper:
                 time.sleep(delay)
         return fn()
 
-    def stream_articles(self):
-        """
-        Générateur qui yield dicts: {'url': ..., 'date': ..., 'content': ...}
-        """
+    def _fetch_with_browser(self, url):
+        # Ouvrir l'article et extraire date & contenu
+        started = time.perf_counter()
+        self.driver.execute_script("window.open(arguments[0]);", url)
+        self.driver.switch_to.window(self.driver.window_handles[-1])
+        self.page_loads += 1
+        try:
+            WebDriverWait(self.driver, 10).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            loaded = time.perf_counter()
+            metrics.PAGE_LOAD_SECONDS.labels(SOURCE, "article").observe(loaded - started)
+            # Date
+            def grab_date():
+                return self.driver.find_element(By.CSS_SELECTOR, ".article__short-date").text
+            try:
+                date = self._retry_on_stale(grab_date)
+            except TimeoutException:
+                date = None
+            # Contenu
+            def grab_content():
+                paras = self.driver.find_elements(By.CSS_SELECTOR, "div.article__content p")
+                return "\n".join(p.text for p in paras)
+            content = self._retry_on_stale(grab_content)
+
+            # Parser la date avec le contexte U.Today
+            if date:
+                parsed_date = parse_date_with_context(date, url)
+            else:
+                parsed_date = date
+
+            metrics.EXTRACTION_SECONDS.labels(SOURCE).observe(time.perf_counter() - loaded)
+            return {'url': url, 'date': parsed_date, 'content': content}
+        except Exception:
+            metrics.ARTICLES_FAILED.labels(SOURCE, "fetch").inc()
+            return None
+        finally:
+            self._record_page_stats("article")
+            self.driver.close()
+            self.driver.switch_to.window(self.driver.window_handles[0])
+
+    def _stream_from_listing(self):
         base_url = "https://u.today/latest-cryptocurrency-news"
         self.driver.get(base_url)
+        self.page_loads += 1
+        self._record_page_stats("listing")
         self._clear_cookie_banner()
 
         selector = "a.news__item-body"
         while True:
-            if 0 <= self.max_articles <= self.scraped_count:
+            if 0 <= self.max_articles <= self.scraped:
                 break
 
             try:
@@ -110,8 +125,9 @@ class UTodayScraper:
                 break
 
             total = len(items)
+            pending = []  # URLs à télécharger en parallèle (mode async)
             for idx in range(total):
-                if 0 <= self.max_articles <= self.scraped_count:
+                if 0 <= self.max_articles <= self.scraped + len(pending):
                     break
 
                 try:
@@ -120,7 +136,7 @@ class UTodayScraper:
                     continue
 
                 text = item.text or ""
-                if not any(kw.lower() in text.lower() for kw in CRYPTO_KEYWORDS):
+                if not mentions_crypto(text):
                     continue
 
                 try:
@@ -131,39 +147,23 @@ class UTodayScraper:
                     continue
                 self.seen_links.add(url)
 
-                # Ouvrir l'article et extraire date & contenu
-                self.driver.execute_script("window.open(arguments[0]);", url)
-                self.driver.switch_to.window(self.driver.window_handles[-1])
-                try:
-                    WebDriverWait(self.driver, 10).until(
-                        lambda d: d.execute_script("return document.readyState") == "complete"
-                    )
-                    # Date
-                    def grab_date():
-                        return self.driver.find_element(By.CSS_SELECTOR, ".article__short-date").text
-                    try:
-                        date = self._retry_on_stale(grab_date)
-                    except TimeoutException:
-                        date = None
-                    # Contenu
-                    def grab_content():
-                        paras = self.driver.find_elements(By.CSS_SELECTOR, "div.article__content p")
-                        return "\n".join(p.text for p in paras)
-                    content = self._retry_on_stale(grab_content)
-
-                    # Parser la date avec le contexte U.Today
-                    if date:
-                        parsed_date = parse_date_with_context(date, url)
-                    else:
-                        parsed_date = date
-                    
-                    yield {'url': url, 'date': parsed_date, 'content': content}
-                    self.scraped_count += 1
-                except Exception:
-                    pass
-                finally:
-                    self.driver.close()
-                    self.driver.switch_to.window(self.driver.window_handles[0])
+                if self.fetch_mode == "async":
+                    pending.append(url)
+                    continue
+                elif self.fetcher is not None:
+                    article = self.fetcher.fetch(url)
+                else:
+                    article = self._fetch_with_browser(url)
+                if article is None:
+                    continue
+
+                yield article
+                self.scraped += 1
+
+            if pending:
+                for article in self.fetcher.fetch(pending):
+                    yield article
+                    self.scraped += 1
 
             # Pagination via scroll
             old_count = total
@@ -181,9 +181,6 @@ class UTodayScraper:
             if not loaded:
                 break
 
-    def close(self):
-        self.driver.quit()
-
 
 if __name__ == '__main__':
     scraper = UTodayScraper(headless=True, max_articles=-1)
@@ -192,6 +189,7 @@ if __name__ == '__main__':
             print(f"URL: {article['url']}")
             print(f"Date: {article['date']}")
             print(f"Extrait: {article['content'][:200]}…")
+            scraper.mark_handled([article['url']])
             print("---")
     finally:
         scraper.close()
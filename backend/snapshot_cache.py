@@ -0,0 +1,64 @@
+# snapshot_cache.py
+"""
+Cache des métriques servi sous forme de snapshots immuables.
+
+Le recalcul produit un nouveau Snapshot qui remplace l'ancien par simple
+réassignation de référence : les endpoints lisent `cache.current` sans verrou
+ni copie, et un snapshot publié n'est plus jamais modifié. Les recalculs
+tournent toujours dans un thread dédié, jamais sur la boucle d'événements, et
+les demandes simultanées partagent le même recalcul (single-flight).
+"""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class Snapshot:
+    data: dict = field(default_factory=dict)  # ne doit plus être modifié une fois publié
+    version: int = 0
+    updated_at: Optional[datetime] = None
+
+class SnapshotCache:
+    def __init__(self, compute):
+        """compute : callable sans argument qui retourne le dict des métriques."""
+        self.compute = compute
+        self.current = Snapshot()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-refresh")
+        self._inflight = None
+        self._lock = threading.Lock()  # protège seulement `_inflight`, jamais les lectures
+
+    def _run(self) -> Snapshot:
+        try:
+            # Date des données = début du recalcul (pas sa fin, ni le snapshot précédent)
+            started_at = datetime.utcnow()
+            data = self.compute()
+            snapshot = Snapshot(data, self.current.version + 1, started_at)
+            self.current = snapshot  # swap atomique de la référence
+            logger.info(f"Cache updated at {snapshot.updated_at} (version {snapshot.version})")
+            return snapshot
+        except Exception as e:
+            logger.error(f"Error updating cache: {e}")
+            return self.current
+        finally:
+            with self._lock:
+                self._inflight = None
+
+    def refresh(self):
+        """
+        Lance un recalcul en arrière-plan, ou rejoint celui en cours.
+        Retourne un Future qui donne le snapshot publié (l'ancien si le recalcul échoue).
+        """
+        with self._lock:
+            if self._inflight is None:
+                self._inflight = self._executor.submit(self._run)
+            return self._inflight
+
+    async def refresh_async(self) -> Snapshot:
+        """Comme refresh(), en attendant le résultat sans bloquer la boucle d'événements."""
+        return await asyncio.wrap_future(self.refresh())
@@ -0,0 +1,40 @@
+# backend/tests/conftest.py
+"""
+Fixtures partagées : petit dataset h5 écrit dans le dossier temporaire du test,
+avec les mêmes colonnes et attributs que le dataset réel.
+"""
+import os
+import sys
+
+import h5py
+import numpy as np
+import pytest
+
+# Ajoute backend/ au path pour importer les packages du projet
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def write_dataset(path, articles):
+    """
+    Écrit `articles` ([{'content', 'link', 'date', 'crypto': [...], 'note'}])
+    dans `path`.h5 (sans ligne de création). Retourne `path`.
+    """
+    string = h5py.string_dtype(encoding="utf-8")
+    with h5py.File(path + ".h5", "w") as f:
+        for name in ("content", "link", "date"):
+            values = np.array([(a[name] or "").encode("utf-8") for a in articles], dtype=object)
+            f.create_dataset(name, data=values, dtype=string, chunks=True, maxshape=(None,))
+        cryptos = np.array([",".join(a["crypto"]).encode("utf-8") for a in articles], dtype=object)
+        f.create_dataset("crypto", data=cryptos, dtype=string, chunks=True, maxshape=(None,))
+        f.create_dataset("note", data=np.array([a["note"] for a in articles], dtype="f8"),
+                         chunks=True, maxshape=(None,))
+        f.attrs["placeholderContent"] = False
+        f.attrs["last_news_cryptoNews"] = "None"
+        f.attrs["last_news_uToday"] = "None"
+    return path
+
+@pytest.fixture
+def make_dataset(tmp_path):
+    """Fabrique de datasets : make_dataset(articles, name='dataset') -> chemin sans .h5"""
+    def make(articles, name="dataset"):
+        return write_dataset(str(tmp_path / name), articles)
+    return make
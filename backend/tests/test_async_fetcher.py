@@ -0,0 +1,54 @@
+# backend/tests/test_async_fetcher.py
+"""
+Pont synchrone de AsyncArticleFetcher : ordre des articles, file bornée et
+annulation des téléchargements quand le scraper s'arrête avant la fin.
+Les téléchargements sont simulés (pas de réseau).
+
+Usage :
+    python -m pytest backend/tests
+"""
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+# Ajoute backend/ au path pour importer le package scraping
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scraping import async_fetcher
+from scraping.async_fetcher import AsyncArticleFetcher
+
+class FakeFetcher(AsyncArticleFetcher):
+    def __init__(self):
+        super().__init__()
+        self.produced = 0
+        self.cancelled = threading.Event()
+
+    async def fetch_many(self, urls):
+        try:
+            for url in urls:
+                await asyncio.sleep(0)
+                self.produced += 1
+                yield {"url": url, "date": None, "content": ""}
+        except (asyncio.CancelledError, GeneratorExit):
+            self.cancelled.set()
+            raise
+
+def test_fetch_yields_in_order():
+    urls = [f"https://u.today/{i}" for i in range(50)]
+    assert [a["url"] for a in FakeFetcher().fetch(urls)] == urls
+
+def test_closing_the_generator_cancels_the_loop():
+    fetcher = FakeFetcher()
+    articles = fetcher.fetch(f"https://u.today/{i}" for i in range(100_000))
+    for _ in range(3):
+        next(articles)
+    articles.close()
+
+    assert fetcher.cancelled.wait(5)
+    # La file bornée limite ce qui a été téléchargé d'avance
+    assert fetcher.produced <= 3 + async_fetcher.RESULT_BUFFER + 1
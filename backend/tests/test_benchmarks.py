@@ -0,0 +1,40 @@
+# backend/tests/test_benchmarks.py
+"""
+Smoke test des benchmarks hors ligne sur un petit dataset synthétique : chaque
+benchmark du package processor tourne une fois (ceux de l'API, qui importent
+main.py et fastapi, sont exclus).
+
+Usage :
+    python -m pytest backend/tests
+"""
+import os
+import sys
+
+# Ajoute backend/ au path pour importer les packages benchmarks et processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks import run, synthetic
+from processor import h5_utilities
+
+ROWS = 200
+
+def test_synthetic_dataset_shape(tmp_path):
+    path = synthetic.ensure_dataset(str(tmp_path), ROWS)
+    rows = h5_utilities.getDatasetSlice(0, ROWS, ("content", "link", "date", "crypto", "note"), path)
+    assert all(len(values) == ROWS for values in rows.values())
+    assert len(set(rows["link"])) == ROWS
+
+def test_processor_benchmarks_run(tmp_path):
+    path = synthetic.ensure_dataset(str(tmp_path), ROWS)
+    results = []
+    run.bench_dataset(results, path, ROWS, repeat=1)
+    run.bench_text(results, path, repeat=1)
+
+    names = {r["name"] for r in results}
+    assert "read_h5_and_compute" not in names
+    assert names >= {
+        "getDataset", "appendArticleToDataset", "detect_cryptos", "remove_emojis",
+        "parse_date_with_context_cold", "parse_date_with_context_warm", "parse_dates_vectorized",
+    }
+    assert all(r["median_s"] >= 0 for r in results)
+    assert "main" not in sys.modules
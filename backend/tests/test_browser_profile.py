@@ -0,0 +1,65 @@
+# backend/tests/test_browser_profile.py
+"""
+Mesures du profil navigateur allégé : une page comptée par chargement, les
+requêtes du scroll ajoutées à la page courante sans fausser les moyennes.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import json
+import os
+import sys
+
+# Ajoute backend/ au path pour importer le package scraping
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scraping import browser_profile
+
+def network_event(method, **params):
+    return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+class FakeDriver:
+    """Driver minimal : buffer de logs de performance vidé à chaque lecture."""
+    def __init__(self):
+        self.logs = []
+        self.load_ms = 0
+
+    def load(self, load_ms, bytes_loaded, blocked=0):
+        self.load_ms = load_ms
+        self.logs.append(network_event("Network.loadingFinished", requestId="1", encodedDataLength=bytes_loaded))
+        for i in range(blocked):
+            self.logs.append(network_event("Network.loadingFailed", requestId=f"b{i}", type="Image",
+                                           blockedReason="inspector"))
+
+    def get_log(self, kind):
+        logs, self.logs = self.logs, []
+        return logs
+
+    def execute_script(self, script):
+        return self.load_ms
+
+def test_stats_are_per_page_load():
+    source = "test-per-page"
+    driver = FakeDriver()
+    driver.load(200, 100_000, blocked=2)
+    browser_profile.record_page_stats(source, driver, "listing")
+    driver.load(100, 50_000)
+    browser_profile.record_page_stats(source, driver, "article")
+    # Requêtes du scroll infini : ajoutées sans compter de page
+    driver.load(100, 30_000, blocked=1)
+    browser_profile.record_page_stats(source, driver, new_page=False)
+
+    stats = browser_profile.stats()[source]
+    assert stats["pages"] == 2
+    assert stats["bytes_loaded"] == 180_000
+    assert stats["requests_blocked"] == 3
+    assert stats["blocked_by_type"] == {"Image": 3}
+    assert stats["load_ms"] == 300
+    assert stats["avg_bytes_loaded_per_page"] == 90_000
+
+def test_empty_buffer_counts_page_without_bytes():
+    source = "test-empty"
+    browser_profile.record_page_stats(source, FakeDriver())
+    stats = browser_profile.stats()[source]
+    assert stats["pages"] == 1
+    assert stats["bytes_loaded"] == 0
@@ -0,0 +1,61 @@
+# backend/tests/test_crypto_registry.py
+"""
+Registre des cryptos : détection par mots entiers, alias multi-mots, ordre du
+registre, comptage des mentions et filtre des titres.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import os
+import sys
+
+import pytest
+
+# Ajoute backend/ au path pour importer le package processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor.crypto_registry import (
+    CRYPTO_DEFINITIONS, CryptoMatcher, count_mentions, detect_cryptos, mentions_crypto,
+)
+
+@pytest.mark.parametrize("text, expected", [
+    ("BTC and ETH rally", ["Bitcoin", "Ethereum"]),
+    ("Ripple wins; XRP jumps", ["XRP"]),
+    ("Binance Coin (BNB) hits a record", ["Binance Coin"]),
+    ("Circle's USD Coin supply grows", ["USD Coin"]),
+    ("Dogecoin, then bitcoin", ["Bitcoin", "Dogecoin"]),  # ordre du registre
+    ("Solana's SOL-USDT pair", ["Tether", "Solana"]),
+])
+def test_detect_cryptos(text, expected):
+    assert detect_cryptos(text) == expected
+
+@pytest.mark.parametrize("text", [
+    "Ethernet cables and adapters",  # 'eth' seulement en mot entier
+    "The solar industry",
+    "Tronic sound",
+    "",
+])
+def test_detect_cryptos_ignores_partial_words(text):
+    assert detect_cryptos(text) == []
+
+def test_count_mentions():
+    counts = count_mentions("Bitcoin, BTC and bitcoin again; ETH once")
+    assert counts == {"Bitcoin": 3, "Ethereum": 1}
+
+def test_mentions_crypto():
+    assert mentions_crypto("Why Cardano is moving")
+    assert not mentions_crypto("Fed holds rates")
+    assert not mentions_crypto(None)
+
+def test_longest_alias_wins():
+    matcher = CryptoMatcher([
+        {"name": "Coin", "aliases": ["coin"]},
+        {"name": "USD Coin", "aliases": ["usd coin"]},
+    ])
+    assert matcher.detect("usd coin") == ["USD Coin"]
+    assert matcher.detect("coin") == ["Coin"]
+
+def test_every_definition_is_detected_by_its_aliases():
+    for crypto in CRYPTO_DEFINITIONS:
+        for alias in crypto["aliases"]:
+            assert detect_cryptos(f"News about {alias.upper()} today") == [crypto["name"]]
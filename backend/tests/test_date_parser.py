@@ -0,0 +1,62 @@
+# backend/tests/test_date_parser.py
+"""
+parse_dates (vectorisé) doit donner exactement le résultat de
+parse_date_with_context, élément par élément, quel que soit le format.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+# Ajoute backend/ au path pour importer le package processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor.date_parser import parse_date_with_context, parse_dates
+
+CRYPTO_NEWS = "https://crypto.news/example"
+U_TODAY = "https://u.today/example"
+
+CASES = [
+    # ISO déjà normalisé
+    ("2025-06-10T14:59:00+02:00", None),
+    ("2025-06-10T14:59:00+00:00", U_TODAY),
+    # U.Today (jour/mois/année, UTC)
+    ("Mon, 9/06/2025 - 6:16", U_TODAY),
+    ("Tue, 31/12/2024 - 23:05", U_TODAY),
+    # crypto.news (12h, décalage GMT)
+    ("Jun 10, 2025 at 02:59 PM GMT+2", CRYPTO_NEWS),
+    ("May 30, 2025 at 12:08 AM GMT-5", CRYPTO_NEWS),
+    ("Jan 1, 2025 at 12:00 PM", CRYPTO_NEWS),
+    # Dates inexistantes : repli sur le parseur élément par élément
+    ("Mon, 31/02/2025 - 6:16", U_TODAY),
+    ("Feb 31, 2025 at 02:59 PM GMT+2", CRYPTO_NEWS),
+    # Formats inconnus ou illisibles
+    ("10/06/2025", None),
+    ("not a date", CRYPTO_NEWS),
+    ("", None),
+]
+
+def test_parse_dates_matches_scalar_parser():
+    dates = [d for d, _ in CASES]
+    sources = [s for _, s in CASES]
+    expected = [parse_date_with_context(d, s) for d, s in CASES]
+    assert list(parse_dates(dates, sources)) == expected
+
+@pytest.mark.parametrize("date, source", CASES)
+def test_parse_dates_single_value(date, source):
+    assert list(parse_dates([date], source)) == [parse_date_with_context(date, source)]
+
+def test_parse_dates_accepts_bytes():
+    assert list(parse_dates([b"Mon, 9/06/2025 - 6:16"], U_TODAY)) == ["2025-06-09T06:16:00+00:00"]
+
+def test_parse_dates_as_datetime_is_utc():
+    parsed = parse_dates(["Jun 10, 2025 at 02:59 PM GMT+2", "not a date"], CRYPTO_NEWS, as_datetime=True)
+    assert parsed[0] == pd.Timestamp("2025-06-10T12:59:00Z")
+    assert pd.isna(parsed[1])
+
+def test_parse_dates_empty():
+    assert len(parse_dates([], None)) == 0
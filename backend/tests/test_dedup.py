@@ -0,0 +1,86 @@
+# backend/tests/test_dedup.py
+"""
+Index des quasi-doublons : détection SimHash, réservation par check(),
+validation (commit) après écriture, abandon (release) et persistance.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import os
+import sys
+
+# Ajoute backend/ au path pour importer le package processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor import dedup
+from processor.dedup import NearDuplicateIndex, hamming, simhash
+
+ORIGINAL = (
+    "Spot Bitcoin ETFs recorded their largest daily inflows in two months on Monday, "
+    "as analysts said the move reflects renewed institutional demand after weeks of "
+    "consolidation across the crypto market."
+)
+REPUBLISHED = ORIGINAL.replace("Monday,", "Monday ,") + " 🚀"
+OTHER = (
+    "Large XRP holders moved more than 300 million coins over the past day, on-chain "
+    "data shows, days before a court decision that could affect the token's status."
+)
+
+def test_simhash_is_stable_and_close_for_republished_text():
+    assert simhash(ORIGINAL) == simhash(ORIGINAL)
+    assert hamming(simhash(ORIGINAL), simhash(REPUBLISHED)) <= dedup.MAX_DISTANCE
+    assert hamming(simhash(ORIGINAL), simhash(OTHER)) > dedup.MAX_DISTANCE
+    assert simhash("") is None
+
+def test_check_reserves_originals_and_finds_duplicates():
+    index = NearDuplicateIndex()
+    assert index.check(ORIGINAL, "a") is None
+    # La réservation suffit : un doublon du même batch est détecté avant l'écriture
+    assert index.check(REPUBLISHED, "b") == "a"
+    assert index.check(OTHER, "c") is None
+    # Un article ne se détecte jamais comme son propre doublon
+    assert index.check(ORIGINAL, "a") is None
+    assert not index.is_stored("a")
+
+def test_commit_and_release():
+    index = NearDuplicateIndex()
+    index.check(ORIGINAL, "a")
+    index.check(OTHER, "c")
+    index.commit("a")
+    index.release(["a", "c"])  # "a" écrit : la release ne le retire pas
+
+    assert index.is_stored("a")
+    assert not index.is_stored("c")
+    assert len(index) == 1
+    # "c" n'a pas été écrit : il peut être repris (et réservé) au cycle suivant
+    assert index.check(OTHER, "c") is None
+    assert index.check(REPUBLISHED, "b") == "a"
+    index.commit("b", duplicate_of="a")
+    assert index.duplicate_links() == {"b"}
+
+def test_save_persists_committed_entries_only(tmp_path):
+    path = str(tmp_path / "dataset.simhash.npz")
+    index = NearDuplicateIndex(path)
+    index.check(ORIGINAL, "a")
+    index.commit("a")
+    index.check(REPUBLISHED, "b")
+    index.commit("b", duplicate_of="a")
+    index.check(OTHER, "c")  # réservé, jamais écrit
+    index.save()
+
+    loaded = NearDuplicateIndex.load(path)
+    assert loaded.is_stored("a")
+    assert not loaded.is_stored("c")
+    assert loaded.duplicates == {"b": "a"}
+    assert loaded.check(REPUBLISHED, "d") == "a"
+    assert dedup.duplicate_links(str(tmp_path / "dataset")) == {"b"}
+
+def test_rebuild_from_dataset(make_dataset):
+    path = make_dataset([
+        {"content": ORIGINAL, "link": "a", "date": "", "crypto": ["Bitcoin"], "note": 0.5},
+        {"content": REPUBLISHED, "link": "b", "date": "", "crypto": ["Bitcoin"], "note": 0.5},
+        {"content": OTHER, "link": "c", "date": "", "crypto": ["XRP"], "note": 0.1},
+    ])
+    index = NearDuplicateIndex.rebuild(path)
+    assert index.duplicates == {"b": "a"}
+    assert index.is_stored("a") and index.is_stored("c")
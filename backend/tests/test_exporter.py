@@ -0,0 +1,120 @@
+# backend/tests/test_exporter.py
+"""
+Export en flux : filtres (dates, crypto, doublons, ligne de création),
+colonnes, découpage en tranches et encodeurs NDJSON / Arrow / Parquet.
+Les tests Arrow et Parquet sont ignorés si pyarrow n'est pas installé.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import io
+import json
+import os
+import sys
+
+import h5py
+import pytest
+
+# Ajoute backend/ au path pour importer le package processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor import dedup, exporter
+
+ARTICLES = [
+    {"content": "placeholder", "link": "placeholder", "date": "", "crypto": [], "note": 0.0},
+    {"content": "Bitcoin ETF inflows", "link": "https://crypto.news/a",
+     "date": "Jun 10, 2025 at 02:59 PM GMT+2", "crypto": ["Bitcoin"], "note": 0.8},
+    {"content": "XRP whales move coins", "link": "https://u.today/b",
+     "date": "Mon, 9/06/2025 - 6:16", "crypto": ["XRP"], "note": float("nan")},
+    {"content": "Bitcoin and Ethereum slide", "link": "https://crypto.news/c",
+     "date": "2025-06-12T09:00:00+00:00", "crypto": ["Bitcoin", "Ethereum"], "note": -0.5},
+    {"content": "Bitcoin ETF inflows (republished)", "link": "https://u.today/dup",
+     "date": "2025-06-10T13:00:00+00:00", "crypto": ["Bitcoin"], "note": 0.7},
+]
+
+@pytest.fixture
+def dataset(make_dataset):
+    path = make_dataset(ARTICLES)
+    with h5py.File(path + ".h5", "a") as f:
+        f.attrs["placeholderContent"] = True
+    index = dedup.NearDuplicateIndex(dedup.sidecar_path(path))
+    index.commit("https://u.today/dup", duplicate_of="https://crypto.news/a")
+    index.save()
+    return path
+
+def rows(path, **options):
+    chunks = list(exporter.iter_chunks(path, **options))
+    columns = options.get("columns", exporter.COLUMNS)
+    return [dict(zip(columns, values)) for chunk in chunks for values in zip(*(chunk[c] for c in columns))]
+
+def test_export_skips_placeholder_and_duplicates(dataset):
+    exported = rows(dataset)
+    assert [r["link"] for r in exported] == ["https://crypto.news/a", "https://u.today/b", "https://crypto.news/c"]
+    assert exported[0]["date"] == "2025-06-10T12:59:00+00:00"
+    assert exported[1]["note"] is None
+    assert exported[2]["crypto"] == ["Bitcoin", "Ethereum"]
+
+@pytest.mark.parametrize("options, expected", [
+    ({"date_from": "2025-06-10"}, ["https://crypto.news/a", "https://crypto.news/c"]),
+    ({"date_to": "2025-06-10"}, ["https://crypto.news/a", "https://u.today/b"]),
+    ({"date_from": "2025-06-10T13:00:00Z", "date_to": "2025-06-11"}, []),
+    ({"crypto": "eth"}, ["https://crypto.news/c"]),
+    ({"crypto": "Bitcoin", "date_to": "2025-06-11"}, ["https://crypto.news/a"]),
+])
+def test_export_filters(dataset, options, expected):
+    assert [r["link"] for r in rows(dataset, columns=("link",), **options)] == expected
+
+def test_export_columns_and_chunks(dataset):
+    chunks = list(exporter.iter_chunks(dataset, columns=("note", "link"), chunk_size=2))
+    assert all(set(chunk) == {"note", "link"} for chunk in chunks)
+    assert sum(len(chunk["link"]) for chunk in chunks) == 3
+
+@pytest.mark.parametrize("options", [
+    {"columns": ("link", "title")},
+    {"date_from": "not a date"},
+    {"crypto": "dogcoin"},
+])
+def test_invalid_options_fail_at_call(dataset, options):
+    with pytest.raises(ValueError):
+        exporter.iter_chunks(dataset, **options)
+
+def test_missing_dataset_fails_at_call(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        exporter.stream_export("ndjson", str(tmp_path / "missing"))
+
+def test_parse_columns():
+    assert exporter.parse_columns(None) == exporter.COLUMNS
+    assert exporter.parse_columns("link, date") == ("link", "date")
+    with pytest.raises(ValueError):
+        exporter.parse_columns("link,title")
+
+def test_ndjson_encoder(dataset):
+    body = b"".join(exporter.stream_export("ndjson", dataset, ("link", "note"), chunk_size=2))
+    lines = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+    assert lines == [
+        {"link": "https://crypto.news/a", "note": 0.8},
+        {"link": "https://u.today/b", "note": None},
+        {"link": "https://crypto.news/c", "note": -0.5},
+    ]
+
+def test_unknown_format_or_missing_pyarrow(dataset, monkeypatch):
+    with pytest.raises(ValueError):
+        exporter.stream_export("csv", dataset)
+    monkeypatch.setattr(exporter, "pa", None)
+    with pytest.raises(RuntimeError):
+        exporter.stream_export("parquet", dataset)
+
+def test_arrow_encoder(dataset):
+    pa = pytest.importorskip("pyarrow")
+    body = b"".join(exporter.stream_export("arrow", dataset, chunk_size=2))
+    table = pa.ipc.open_stream(body).read_all()
+    assert table.column("link").to_pylist() == ["https://crypto.news/a", "https://u.today/b", "https://crypto.news/c"]
+    assert table.schema.field("date").type == pa.timestamp("us", tz="UTC")
+    assert table.column("note").to_pylist()[1] is None
+
+def test_parquet_encoder(dataset):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+    body = b"".join(exporter.stream_export("parquet", dataset, ("link", "crypto"), chunk_size=2))
+    table = pq.read_table(io.BytesIO(body))
+    assert table.column("crypto").to_pylist() == [["Bitcoin"], ["XRP"], ["Bitcoin", "Ethereum"]]
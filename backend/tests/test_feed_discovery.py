@@ -0,0 +1,88 @@
+# backend/tests/test_feed_discovery.py
+"""
+État du flux : une URL n'est vue qu'une fois traitée, et les validateurs
+ETag / Last-Modified d'une réponse ne sont enregistrés que si toutes ses
+entrées l'ont été.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import json
+import os
+import sys
+
+# Ajoute backend/ au path pour importer le package scraping
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scraping.feed_discovery import FeedDiscovery
+
+FEED = "https://example.com/feed/"
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+<item><link>https://example.com/a</link><title>Bitcoin A</title><pubDate>Tue, 10 Jun 2025 12:00:00 GMT</pubDate></item>
+<item><link>https://example.com/b</link><title>Bitcoin B</title><pubDate>Tue, 10 Jun 2025 11:00:00 GMT</pubDate></item>
+</channel></rss>"""
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+class FakeSession:
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        if headers and headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, RSS, {"ETag": '"v1"'})
+
+    def close(self):
+        pass
+
+def make_discovery(tmp_path):
+    discovery = FeedDiscovery("test", feeds=[FEED], state_path=str(tmp_path / "feed_state_test.json"))
+    discovery.session = FakeSession()
+    return discovery
+
+def saved_state(tmp_path):
+    with open(tmp_path / "feed_state_test.json") as f:
+        return json.load(f)
+
+def test_entries_are_not_seen_until_marked(tmp_path):
+    discovery = make_discovery(tmp_path)
+    urls = [e["url"] for e in discovery.discover()]
+    assert urls == ["https://example.com/a", "https://example.com/b"]
+    discovery.save()
+    assert saved_state(tmp_path)["seen"] == []
+
+    # Rien n'a été traité : les deux entrées reviennent
+    again = make_discovery(tmp_path)
+    assert [e["url"] for e in again.discover()] == urls
+
+def test_validators_withheld_until_every_entry_handled(tmp_path):
+    discovery = make_discovery(tmp_path)
+    discovery.discover()
+    discovery.mark_seen("https://example.com/a")
+    discovery.save()
+    assert saved_state(tmp_path)["validators"] == {}
+
+    # Pas de requête conditionnelle : l'entrée restante est proposée à nouveau
+    again = make_discovery(tmp_path)
+    assert [e["url"] for e in again.discover()] == ["https://example.com/b"]
+    assert "If-None-Match" not in again.session.requests[0]
+    again.mark_seen("https://example.com/b")
+    again.save()
+    assert saved_state(tmp_path)["validators"][FEED]["etag"] == '"v1"'
+
+    # Tout a été traité : le cycle suivant reçoit un 304
+    last = make_discovery(tmp_path)
+    assert last.discover() == []
+    assert last.session.requests[0]["If-None-Match"] == '"v1"'
@@ -0,0 +1,70 @@
+# backend/tests/test_ingest_client.py
+"""
+IngestClient.status() rend un statut dégradé (jamais d'exception) quand le
+worker est absent, refuse la clé ou répond par une erreur.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import os
+import sys
+import threading
+from multiprocessing.connection import Listener
+
+import pytest
+
+# Ajoute backend/ au path pour importer ingest_client
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ingest_client import IngestClient
+
+@pytest.fixture
+def worker():
+    """Faux worker : une connexion, répond `reply` à la commande reçue."""
+    servers = []
+
+    def start(authkey, reply):
+        listener = Listener(("127.0.0.1", 0), authkey=authkey)
+        def serve():
+            try:
+                with listener.accept() as conn:
+                    conn.recv()
+                    conn.send(reply)
+            except Exception:
+                pass  # handshake refusé
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        servers.append((listener, thread))
+        return listener.address
+
+    yield start
+    for listener, thread in servers:
+        thread.join(timeout=5)
+        listener.close()
+
+def test_status_ok(worker):
+    address = worker(b"secret", {"running": True, "alive": True})
+    assert IngestClient(address, authkey="secret").status() == {"running": True, "alive": True}
+
+def test_status_unreachable():
+    with Listener(("127.0.0.1", 0)) as listener:
+        address = listener.address
+    status = IngestClient(address, authkey="secret").status()
+    assert status["reachable"] is False and status["running"] is False
+
+def test_status_wrong_authkey(worker):
+    address = worker(b"other", {"running": True})
+    status = IngestClient(address, authkey="secret").status()
+    assert status["reachable"] is False
+    assert "INGEST_AUTHKEY" in status["error"]
+
+def test_status_error_reply(worker):
+    address = worker(b"secret", {"error": "boom"})
+    status = IngestClient(address, authkey="secret").status()
+    assert status["reachable"] is False
+    assert "boom" in status["error"]
+
+def test_other_calls_raise_runtime_error(worker):
+    address = worker(b"other", {"running": True})
+    with pytest.raises(RuntimeError):
+        IngestClient(address, authkey="secret").start()
@@ -0,0 +1,99 @@
+# backend/tests/test_ingest_pipeline.py
+"""
+Pipeline d'ingestion par étages : ordre des étages, batchs, éléments écartés,
+backpressure, échecs (PipelineError) et exception de la source.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+# Ajoute backend/ au path pour importer le package scraping
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scraping.ingest_pipeline import Pipeline, PipelineError, Stage
+
+def make_pipeline(*stages):
+    return Pipeline("test", list(stages))
+
+def test_items_flow_through_every_stage():
+    written = []
+    lock = threading.Lock()
+    def write(batch):
+        with lock:
+            written.extend(batch)
+        return batch
+
+    pipeline = make_pipeline(
+        Stage("double", lambda x: x * 2, workers=3),
+        Stage("drop_odd_tens", lambda x: None if x % 20 == 10 else x, workers=2),
+        Stage("write", write, batch_size=8, batch_timeout=0.05),
+    )
+    stats = pipeline.run(range(100))
+
+    assert sorted(written) == [x * 2 for x in range(100) if (x * 2) % 20 != 10]
+    assert stats["fetch"]["processed"] == 100
+    assert stats["double"]["emitted"] == 100
+    assert stats["drop_odd_tens"]["emitted"] == 90
+    assert stats["write"]["processed"] == 90
+    assert all(s.get("failed", 0) == 0 for s in stats.values())
+
+def test_batches_respect_batch_size():
+    sizes = []
+    def write(batch):
+        sizes.append(len(batch))
+        return batch
+    make_pipeline(Stage("write", write, batch_size=4, batch_timeout=1)).run(range(10))
+    assert sum(sizes) == 10
+    assert max(sizes) <= 4
+
+def test_bounded_queue_applies_backpressure():
+    release = threading.Event()
+    def slow(x):
+        release.wait(5)
+        return x
+    stage = Stage("slow", slow, maxsize=2)
+    pipeline = make_pipeline(stage)
+
+    fetched = []
+    def source():
+        for i in range(10):
+            fetched.append(i)
+            yield i
+    # La source n'avance pas au-delà de la file bornée tant que l'étage est bloqué
+    runner = threading.Thread(target=pipeline.run, args=(source(),))
+    runner.start()
+    runner.join(0.3)
+    assert len(fetched) <= 2 + 1 + 1  # file pleine + élément en cours + élément bloqué dans put
+    release.set()
+    runner.join(5)
+    assert stage.processed == 10
+    assert stage.max_queue_depth <= 2
+
+def test_failed_items_raise_pipeline_error():
+    def flaky(x):
+        if x == 3:
+            raise ValueError("boom")
+        return x
+    pipeline = make_pipeline(Stage("flaky", flaky), Stage("write", lambda b: b, batch_size=4))
+    with pytest.raises(PipelineError) as err:
+        pipeline.run(range(6))
+    assert err.value.stats["flaky"]["failed"] == 1
+    assert err.value.stats["write"]["processed"] == 5
+    assert "flaky: 1" in str(err.value)
+
+def test_source_exception_stops_stages_cleanly():
+    seen = []
+    def source():
+        yield 1
+        yield 2
+        raise RuntimeError("scraper crashed")
+    pipeline = make_pipeline(Stage("collect", lambda x: seen.append(x) or x))
+    with pytest.raises(RuntimeError, match="scraper crashed"):
+        pipeline.run(source())
+    # Les éléments déjà lus sont traités avant l'arrêt des étages
+    assert sorted(seen) == [1, 2]
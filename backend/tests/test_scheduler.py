@@ -0,0 +1,111 @@
+# backend/tests/test_scheduler.py
+"""
+Ordonnanceur par source : workers indépendants, cadence adaptative,
+backoff exponentiel avec jitter après erreur, arrêt immédiat, état de santé.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import os
+import sys
+import threading
+
+import pytest
+
+# Ajoute backend/ au path pour importer le package scraping
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scraping.scheduler import AdaptiveCadence, SourceScheduler, SourceWorker
+
+def failing():
+    raise RuntimeError("site down")
+
+def test_run_once_success_and_failure():
+    worker = SourceWorker("ok", lambda: 3, adaptive=False)
+    worker.run_once()
+    assert worker.status == "ok"
+    assert worker.total_articles == 3 and worker.cycles == 1
+
+    worker = SourceWorker("down", failing, adaptive=False)
+    worker.run_once()
+    worker.run_once()
+    assert worker.status == "error"
+    assert worker.consecutive_failures == 2
+    assert worker.last_error == "RuntimeError: site down"
+    assert worker.cycles == 0
+
+def test_backoff_is_exponential_capped_and_jittered():
+    worker = SourceWorker("down", failing, interval=5, error_backoff=10, max_backoff=60,
+                          adaptive=False, jitter=0.5)
+    assert worker.next_delay() == 5
+    delays = []
+    for _ in range(5):
+        worker.run_once()
+        delays.append(worker.next_delay())
+    for delay, full in zip(delays, (10, 20, 40, 60, 60)):
+        assert full * 0.5 <= delay <= full
+
+    # Un succès remet la cadence normale
+    worker.task = lambda: 0
+    worker.run_once()
+    assert worker.next_delay() == 5
+
+def test_failing_source_does_not_block_others():
+    ran, failed = threading.Event(), threading.Event()
+    def down():
+        failed.set()
+        failing()
+    scheduler = SourceScheduler()
+    scheduler.register("down", down, interval=60, adaptive=False)
+    scheduler.register("ok", lambda: ran.set() or 1, interval=60, adaptive=False)
+    scheduler.start()
+    try:
+        assert ran.wait(5) and failed.wait(5)
+        assert scheduler.is_alive()
+    finally:
+        scheduler.stop()
+    for worker in scheduler.workers.values():
+        worker._thread.join(5)
+    assert not scheduler.is_alive()
+
+    health = scheduler.health()
+    assert health["down"]["consecutive_failures"] == 1
+    assert health["ok"]["total_articles"] == 1
+    assert health["ok"]["status"] == "stopped"
+    assert scheduler.last_run() is not None
+
+def test_register_rejects_duplicate_source():
+    scheduler = SourceScheduler()
+    scheduler.register("uToday", lambda: 0)
+    with pytest.raises(ValueError):
+        scheduler.register("uToday", lambda: 0)
+
+# ==== Cadence adaptative ====
+def test_cadence_tightens_during_bursts_and_relaxes_when_quiet():
+    cadence = AdaptiveCadence(min_interval=10, max_interval=600, initial=60, smoothing=0.5)
+    cadence.created_at = 0
+    cadence.observe(1, now=0)
+    # Rafale : un article toutes les 10 s
+    for t in range(10, 110, 10):
+        cadence.observe(1, now=t)
+    assert cadence.interval(now=100) == pytest.approx(10, abs=1)
+
+    # Source calme : le silence allonge la cadence, dans la limite de max_interval
+    assert cadence.interval(now=400) == pytest.approx(150)
+    assert cadence.interval(now=10_000) == 600
+
+def test_cadence_ignores_empty_cycles_and_divides_by_count():
+    cadence = AdaptiveCadence(min_interval=1, initial=30, smoothing=1.0)
+    cadence.observe(1, now=0)
+    cadence.observe(0, now=50)
+    assert cadence.last_arrival == 0
+    cadence.observe(5, now=100)  # 5 articles en 100 s
+    assert cadence.mean_interarrival == 20
+    assert cadence.interval(now=100) == 10
+
+def test_worker_uses_adaptive_cadence():
+    worker = SourceWorker("burst", lambda: 4, interval=30, min_interval=5)
+    worker.run_once()
+    health = worker.health()
+    assert health["adaptive"] is True
+    assert 5 <= health["interval"] <= 600
@@ -0,0 +1,82 @@
+# backend/tests/test_search_index.py
+"""
+Index de recherche : construction depuis le dataset (en arrière-plan quand le
+fichier n'existe pas), filtres crypto / dates, bornes de date invalides.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import os
+import sys
+
+import pytest
+
+# Ajoute backend/ au path pour importer le package processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor import search_index
+
+ARTICLES = [
+    {"content": "Bitcoin ETF approval sends BTC higher", "link": "https://crypto.news/a",
+     "date": "2025-06-10T14:59:00+02:00", "crypto": ["Bitcoin"], "note": 0.8},
+    {"content": "Ethereum ETF approval delayed again", "link": "https://crypto.news/b",
+     "date": "2025-06-12T09:00:00+00:00", "crypto": ["Ethereum"], "note": -0.4},
+    {"content": "XRP whales move coins ahead of ruling", "link": "https://u.today/c",
+     "date": "Mon, 9/06/2025 - 6:16", "crypto": ["XRP"], "note": 0.1},
+]
+
+@pytest.fixture
+def index(make_dataset):
+    path = make_dataset(ARTICLES)
+    index = search_index.SearchIndex(search_index.sidecar_path(path))
+    assert index.rebuild(path) == len(ARTICLES)
+    return index
+
+def links(found):
+    return [r["link"] for r in found["results"]]
+
+def test_search_ranks_and_filters(index):
+    assert sorted(links(index.search("etf approval"))) == ["https://crypto.news/a", "https://crypto.news/b"]
+    assert links(index.search("etf", crypto="btc")) == ["https://crypto.news/a"]
+    assert links(index.search("etf", date_from="2025-06-11")) == ["https://crypto.news/b"]
+    assert links(index.search("etf", date_to="2025-06-10")) == ["https://crypto.news/a"]
+    assert index.search("...")["total"] == 0
+
+def test_search_converts_source_dates_to_utc(index):
+    found = index.search("xrp")
+    assert found["results"][0]["date"] == "2025-06-09T06:16:00+00:00"
+
+@pytest.mark.parametrize("bounds", [{"date_from": "next week"}, {"date_to": "2025-13-45"}])
+def test_search_rejects_invalid_dates(index, bounds):
+    with pytest.raises(ValueError):
+        index.search("etf", **bounds)
+
+def test_add_articles_and_update_notes(index):
+    added = index.add_articles([
+        {"content": "Solana ETF filing", "url": "https://crypto.news/d", "date": None, "crypto": ["Solana"], "note": 0.3},
+        {"content": "duplicate", "url": "https://crypto.news/a", "date": None, "crypto": [], "note": 0.0},
+    ])
+    assert added == 1
+    index.update_notes(["https://crypto.news/d"], [float("nan")])
+    assert index.search("solana")["results"][0]["sentiment"] is None
+
+def test_get_index_builds_in_background(make_dataset, monkeypatch):
+    path = make_dataset(ARTICLES, name="background")
+    started = []
+    monkeypatch.setattr(search_index.SearchIndex, "rebuild_in_background",
+                        lambda self, dataset: (started.append(dataset), self.building.set()))
+
+    index = search_index.get_index(path)
+    try:
+        assert started == [path]
+        with pytest.raises(search_index.IndexBuilding):
+            index.search("etf")
+        # Le build tourne sans bloquer l'étage d'écriture
+        index.add_articles([{"content": "Cardano news", "url": "https://u.today/e", "crypto": []}])
+
+        index.rebuild(path)
+        index.building.clear()
+        assert index.search("etf")["total"] == 2
+        assert index.search("cardano")["total"] == 0  # absent du dataset reconstruit
+    finally:
+        search_index._indexes.pop(os.path.abspath(path), None)
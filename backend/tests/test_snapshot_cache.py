@@ -0,0 +1,79 @@
+# backend/tests/test_snapshot_cache.py
+"""
+Cache des métriques : snapshots immuables, recalcul partagé (single-flight),
+snapshot précédent conservé si le recalcul échoue.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import asyncio
+import dataclasses
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+# Ajoute backend/ au path pour importer snapshot_cache
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from snapshot_cache import Snapshot, SnapshotCache
+
+def test_refresh_publishes_new_snapshot():
+    cache = SnapshotCache(lambda: {"dataset_length": 3})
+    assert cache.current == Snapshot()
+
+    before = datetime.utcnow()
+    snapshot = cache.refresh().result(5)
+    assert snapshot is cache.current
+    assert snapshot.data == {"dataset_length": 3}
+    assert snapshot.version == 1
+    assert snapshot.updated_at >= before
+    assert cache.refresh().result(5).version == 2
+
+def test_snapshot_is_immutable():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        Snapshot().version = 1
+
+def test_concurrent_refreshes_share_one_compute():
+    release = threading.Event()
+    calls = []
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {"calls": len(calls)}
+
+    cache = SnapshotCache(compute)
+    futures = [cache.refresh() for _ in range(5)]
+    assert all(f is futures[0] for f in futures)
+    release.set()
+    assert futures[0].result(5).version == 1
+    assert len(calls) == 1
+
+def test_updated_at_is_compute_start():
+    def compute():
+        time.sleep(0.2)
+        return {}
+    cache = SnapshotCache(compute)
+    before = datetime.utcnow()
+    snapshot = cache.refresh().result(5)
+    assert (snapshot.updated_at - before).total_seconds() < 0.2
+
+def test_failed_refresh_keeps_previous_snapshot():
+    results = [{"ok": True}]
+    def compute():
+        if not results:
+            raise OSError("dataset locked")
+        return results.pop()
+
+    cache = SnapshotCache(compute)
+    first = cache.refresh().result(5)
+    assert cache.refresh().result(5) is first
+    assert cache.current is first
+
+def test_refresh_async():
+    cache = SnapshotCache(lambda: {"x": 1})
+    snapshot = asyncio.run(cache.refresh_async())
+    assert snapshot.data == {"x": 1}
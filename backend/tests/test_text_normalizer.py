@@ -0,0 +1,41 @@
+# backend/tests/test_text_normalizer.py
+"""
+Suppression des emojis : seuls les caractères affichés en emoji sont retirés,
+les symboles texte des articles restent.
+
+Usage :
+    python -m pytest backend/tests
+"""
+import os
+import sys
+
+import pytest
+
+# Ajoute backend/ au path pour importer le package processor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from processor.text_normalizer import normalize, strip_emojis
+
+@pytest.mark.parametrize("text", [
+    "BTC 🚀 to the moon",
+    "ETF approved ✅ today",
+    "Warning ⚠️ high volatility",
+    "Flag 🇺🇸 market",
+    "Love ❤️ crypto",
+])
+def test_strip_emojis_removes_emoji(text):
+    assert all(ord(c) < 0x2000 or c.isalnum() for c in strip_emojis(text))
+
+@pytest.mark.parametrize("text", [
+    "Checklist ✓ done",
+    "Press ⌘ K",
+    "Rating ★★★★",
+    "Price ↑ 5% → $110k",
+    "x ≤ y ≠ z ± 1",
+    "© 2025 crypto.news™",
+])
+def test_strip_emojis_keeps_text_symbols(text):
+    assert strip_emojis(text) == text
+
+def test_normalize_removes_emoji_and_spaces():
+    assert normalize("Bitcoin 🚀\n\nrallies ⚠️  again ✓") == "Bitcoin rallies again ✓"
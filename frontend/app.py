@@ -5,7 +5,6 @@ import numpy as np
 import pandas as pd
 import requests
 import logging
-import time
 
 # === Logging Configuration ===
 logging.basicConfig(
@@ -36,51 +35,52 @@ Under the hood:
 
 SUMMARY_URL  = "http://0.0.0.0:8080/sentiment_summary"
 ANALYSIS_URL = "http://0.0.0.0:8080/engage_analysis"
+STOP_URL     = "http://0.0.0.0:8080/stop_analysis"
+REFRESH_SECONDS = 10
 
 
 if "running" not in st.session_state:
     st.session_state["running"] = False
-if "last_update" not in st.session_state:
-    st.session_state["last_update"] = None
+
+def post_backend(url):
+    """Appel ponctuel de contrôle (démarrage / arrêt du scraping)"""
+    try:
+        resp = requests.post(url, timeout=30)
+        resp.raise_for_status()
+        return True
+    except Exception as e:
+        st.error(f"Error calling backend: {e}")
+        logger.error(f"Backend error: {e}")
+        return False
 
 col1, col2 = st.columns([1, 4])
 with col1:
     if st.button("🚀 Launch Analysis" if not st.session_state["running"] else "⏹️ Stop Analysis"):
-        st.session_state["running"] = not st.session_state["running"]
-        if st.session_state["running"]:
-            st.session_state["last_update"] = time.time()
+        # Le backend n'est piloté qu'au clic : les rafraîchissements se contentent de lire
+        if not st.session_state["running"]:
+            st.session_state["running"] = post_backend(ANALYSIS_URL)
+        else:
+            post_backend(STOP_URL)
+            st.session_state["running"] = False
 
 with col2:
     if st.session_state["running"]:
-        st.success("✅ Analysis is running - Data updates every 10 seconds")
+        st.success(f"✅ Analysis is running - Data updates every {REFRESH_SECONDS} seconds")
     else:
         st.info("ℹ️ Click 'Launch Analysis' to start real-time sentiment tracking")
-        
-        
-def fetch_data():
-    """Fetch data from backend"""
-    try:
-        if st.session_state["running"]:
-            resp = requests.post(ANALYSIS_URL, timeout=30)
-        else:
-            resp = requests.get(SUMMARY_URL, timeout=30)
-        resp.raise_for_status()
-        return resp.json()
-    except Exception as e:
-        st.error(f"Error calling backend: {e}")
-        logger.error(f"Backend error: {e}")
-        return {}
-
-# Fetch and display data
-data = fetch_data()
 
-# Display last update time if available
-if data.get("cache_update_time"):
-    st.caption(f"📅 Last data update: {data['cache_update_time']}")
 
-st.header("General Sentiment")
-st.markdown("---")
+# Partagé entre sessions : plusieurs onglets ouverts ne multiplient pas les appels au backend
+@st.cache_data(ttl=REFRESH_SECONDS / 2, show_spinner=False)
+def fetch_data():
+    """Fetch data from backend"""
+    resp = requests.get(SUMMARY_URL, timeout=30)
+    resp.raise_for_status()
+    return resp.json()
 
+# Les figures sont mises en cache sur les valeurs affichées : une jauge dont le
+# score (arrondi comme à l'affichage) et le statut n'ont pas changé n'est pas reconstruite
+@st.cache_resource(max_entries=512, show_spinner=False)
 def make_gauge(score: float, status: str, title: str):
     """Create a gauge chart for sentiment visualization"""
     normalized = (score + 1) * 50
@@ -124,24 +124,19 @@ def make_gauge(score: float, status: str, title: str):
     )
     return fig
 
-col1, col2, col3 = st.columns(3)
-for col, window in zip([col1, col2, col3], ["24h", "7d", "30d"]):
-    avg    = data.get(f"avg_{window}", 0.0)
-    status = data.get(f"status_{window}", "Neutral")
-    count  = data.get(f"count_{window}", 0)
-    col.plotly_chart(
-        make_gauge(avg, status, f"Last {window}"),
-        use_container_width=True,
-        key=f"glob-{window}-{st.session_state.get('last_update', 0)}"
-    )
+def gauge(col, stats, window, title, key):
+    avg    = round(stats.get(f"avg_{window}", 0.0), 2)
+    status = stats.get(f"status_{window}", "Neutral")
+    count  = stats.get(f"count_{window}", 0)
+    col.plotly_chart(make_gauge(avg, status, title), use_container_width=True, key=key)
     caption = "No data" if count == 0 else f"{count} articles"
     col.caption(caption)
 
-# === Daily Time Series ===
-if data.get("timeseries", {}).get("dates"):
+@st.cache_resource(max_entries=8, show_spinner=False)
+def make_timeseries(dates: tuple, sentiments: tuple):
     fig_ts = go.Figure(go.Scatter(
-        x=data["timeseries"]["dates"],
-        y=data["timeseries"]["sentiments"],
+        x=list(dates),
+        y=list(sentiments),
         mode="lines+markers",
         name="Sentiment"
     ))
@@ -154,57 +149,72 @@ if data.get("timeseries", {}).get("dates"):
         margin=dict(t=40, b=40),
         showlegend=False
     )
-    st.plotly_chart(fig_ts, use_container_width=True, key=f"timeseries-{st.session_state.get('last_update', 0)}")
-
-# Sentiment by Cryptocurrency Section
-st.markdown("## Sentiment by Cryptocurrency")
-st.markdown("---")
-
-if "per_crypto" in data:
-    windows = ["1h", "24h", "7d", "30d"]
-    for name, stats in data["per_crypto"].items():
-        # On affiche pas si tous les counts sont à zéro
-        non_zero = any(stats.get(f"count_{w}", 0) > 0 for w in windows)
-        if not non_zero:
-            continue
-        st.markdown(f"**{name}**")
-        cols = st.columns(4)
-        for col, w in zip(cols, windows):
-            avg    = stats.get(f"avg_{w}", 0.0)
-            status = stats.get(f"status_{w}", "Neutral")
-            count  = stats.get(f"count_{w}", 0)
-            col.plotly_chart(
-                make_gauge(avg, status, w),
-                use_container_width=True,
-                key=f"{name}-{w}-{st.session_state.get('last_update', 0)}"
-            )
-            caption = "No data" if count == 0 else f"{count} articles"
-            col.caption(caption)
-
-# Recent Articles DataFrame
-if data.get("recent_articles"):
-    st.markdown("## 100 Articles")
-    df100 = pd.DataFrame(data["recent_articles"])
-    st.dataframe(df100, use_container_width=True, key=f"articles-{st.session_state.get('last_update', 0)}")
-
-# Dataset info/taille
-st.markdown("---")
-dataset_count = data.get('dataset_length', 0)
-st.markdown(f"**Number of items in our dataset:** {dataset_count}")
-
-# Scraping Status
-if data.get("scraping_active") and data.get("scraping_thread_alive"):
-    st.success("🔄 Scraping is currently active")
-    if data.get("last_scraping_time"):
-        st.caption(f"Last scraping cycle: {data['last_scraping_time']}")
-elif data.get("scraping_active") and not data.get("scraping_thread_alive"):
-    st.warning("⚠️ Scraping thread has stopped - may have reached recent articles")
-elif st.session_state["running"]:
-    st.info("📊 Analysis mode active - using cached data")
-
-
-# Auto-refresh every 10 seconds when running
-if st.session_state["running"]:
-    time.sleep(10)
-    st.session_state["last_update"] = time.time()
-    st.rerun()
\ No newline at end of file
+    return fig_ts
+
+
+# Seule cette partie est ré-exécutée toutes les REFRESH_SECONDS (fragment), le
+# reste de la page (titre, description, boutons) n'est pas redessiné.
+# Les clés des composants sont stables pour que Streamlit les mette à jour sur place.
+@st.fragment(run_every=REFRESH_SECONDS if st.session_state["running"] else None)
+def dashboard():
+    try:
+        data = fetch_data()
+    except Exception as e:
+        st.error(f"Error calling backend: {e}")
+        logger.error(f"Backend error: {e}")
+        data = {}
+
+    # Display last update time if available
+    if data.get("cache_update_time"):
+        st.caption(f"📅 Last data update: {data['cache_update_time']}")
+
+    st.header("General Sentiment")
+    st.markdown("---")
+
+    col1, col2, col3 = st.columns(3)
+    for col, window in zip([col1, col2, col3], ["24h", "7d", "30d"]):
+        gauge(col, data, window, f"Last {window}", key=f"glob-{window}")
+
+    # === Daily Time Series ===
+    if data.get("timeseries", {}).get("dates"):
+        fig_ts = make_timeseries(tuple(data["timeseries"]["dates"]), tuple(data["timeseries"]["sentiments"]))
+        st.plotly_chart(fig_ts, use_container_width=True, key="timeseries")
+
+    # Sentiment by Cryptocurrency Section
+    st.markdown("## Sentiment by Cryptocurrency")
+    st.markdown("---")
+
+    if "per_crypto" in data:
+        windows = ["1h", "24h", "7d", "30d"]
+        for name, stats in data["per_crypto"].items():
+            # On affiche pas si tous les counts sont à zéro
+            non_zero = any(stats.get(f"count_{w}", 0) > 0 for w in windows)
+            if not non_zero:
+                continue
+            st.markdown(f"**{name}**")
+            cols = st.columns(4)
+            for col, w in zip(cols, windows):
+                gauge(col, stats, w, w, key=f"{name}-{w}")
+
+    # Recent Articles DataFrame
+    if data.get("recent_articles"):
+        st.markdown("## 100 Articles")
+        df100 = pd.DataFrame(data["recent_articles"])
+        st.dataframe(df100, use_container_width=True, key="articles")
+
+    # Dataset info/taille
+    st.markdown("---")
+    dataset_count = data.get('dataset_length', 0)
+    st.markdown(f"**Number of items in our dataset:** {dataset_count}")
+
+    # Scraping Status
+    if data.get("scraping_active") and data.get("scraping_thread_alive"):
+        st.success("🔄 Scraping is currently active")
+        if data.get("last_scraping_time"):
+            st.caption(f"Last scraping cycle: {data['last_scraping_time']}")
+    elif data.get("scraping_active") and not data.get("scraping_thread_alive"):
+        st.warning("⚠️ Scraping thread has stopped - may have reached recent articles")
+    elif st.session_state["running"]:
+        st.info("📊 Analysis mode active - using cached data")
+
+dashboard()